@@ -8,13 +8,18 @@ from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 
 from src.util.util import clean_df
-from src.ui.ui_components import main_metrics
-from src.db.db_records import get_records_plus_players_db
+from src.ui.ui_components import main_metrics, resumen_metrics
+from src.db.db_records import get_records_plus_players_db, load_lesiones_filtradas_db
 
 st.header(t("Resumen de :red[Lesiones] (1er Equipo)"), divider=True)
 
-records = get_records_plus_players_db(plantel="1FF")
-resumen = main_metrics(records)
+# KPIs desde resumen_lesiones; sin resumen para este alcance, desde todas las lesiones del plantel
+desde = resumen_metrics(plantel="1FF")
+if desde is not None:
+    resumen = load_lesiones_filtradas_db(plantel="1FF", fecha_inicio=desde)
+else:
+    records = get_records_plus_players_db(plantel="1FF")
+    resumen = main_metrics(records)
 
 st.subheader(t("Ultimas :red[lesiones]"))
 df_filtrado = clean_df(resumen)
@@ -0,0 +1,228 @@
+-- ==========================================================
+-- 💻 Esquema de la base local (SQLite)
+-- ==========================================================
+-- Equivalente al resultado de data/migrations/V001..V008 en MySQL.
+-- Si cambia una migración, hay que reflejarlo aquí.
+-- Las fechas se guardan como texto ISO ('YYYY-MM-DD HH:MM:SS') en hora local.
+
+-- ----------------------------------------------------------
+-- 1️⃣ Catálogos
+-- ----------------------------------------------------------
+CREATE TABLE segmentos_corporales (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE zonas_segmento (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL,
+  segmento_id INTEGER NOT NULL REFERENCES segmentos_corporales(id),
+  UNIQUE (nombre, segmento_id)
+);
+
+CREATE TABLE zonas_anatomicas (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL,
+  zona_id INTEGER NOT NULL REFERENCES zonas_segmento(id),
+  UNIQUE (nombre, zona_id)
+);
+
+CREATE TABLE mecanismos (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE tipo_lesion (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE tipo_especifico_lesion (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE mecanismo_tipo_lesion (
+  id INTEGER PRIMARY KEY,
+  mecanismo_id INTEGER NOT NULL REFERENCES mecanismos(id),
+  tipo_lesion_id INTEGER NOT NULL REFERENCES tipo_lesion(id),
+  tipo_especifico_id INTEGER NULL REFERENCES tipo_especifico_lesion(id)
+);
+CREATE INDEX idx_mtl_mecanismo ON mecanismo_tipo_lesion (mecanismo_id, tipo_lesion_id);
+
+CREATE TABLE tratamientos (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE lugares (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL UNIQUE
+);
+
+-- ----------------------------------------------------------
+-- 2️⃣ Planteles y jugadoras
+-- ----------------------------------------------------------
+CREATE TABLE plantel (
+  id INTEGER PRIMARY KEY,
+  nombre TEXT NOT NULL,
+  codigo TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE futbolistas (
+  identificacion TEXT NOT NULL PRIMARY KEY,
+  nombre TEXT NOT NULL,
+  apellido TEXT NULL,
+  competicion TEXT NULL,
+  fecha_nacimiento DATE NULL,
+  genero TEXT NULL
+);
+CREATE INDEX idx_futbolistas_competicion ON futbolistas (competicion);
+
+CREATE TABLE informacion_futbolistas (
+  identificacion TEXT NOT NULL PRIMARY KEY REFERENCES futbolistas(identificacion),
+  posicion TEXT NULL,
+  dorsal INTEGER NULL,
+  nacionalidad TEXT NULL,
+  altura REAL NULL,
+  peso REAL NULL,
+  foto_url TEXT NULL,
+  foto_url_drive TEXT NULL
+);
+
+-- ----------------------------------------------------------
+-- 3️⃣ Lesiones, evolución, secuencia y lápidas
+-- ----------------------------------------------------------
+CREATE TABLE lesiones (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  id_lesion TEXT NOT NULL,
+  id_jugadora TEXT NOT NULL,
+  posicion TEXT NULL,
+  fecha_lesion DATE NULL,
+  lugar_id INTEGER NULL,
+  segmento_id INTEGER NULL,
+  zona_cuerpo_id INTEGER NULL,
+  zona_especifica_id INTEGER NULL,
+  lateralidad TEXT NULL,
+  tipo_lesion_id INTEGER NULL,
+  tipo_especifico_id INTEGER NULL,
+  es_recidiva INTEGER NOT NULL DEFAULT 0,
+  tipo_recidiva TEXT NULL,
+  dias_baja_estimado INTEGER NULL,
+  impacto_dias_baja_estimado TEXT NULL,
+  mecanismo_id INTEGER NULL,
+  tipo_tratamiento TEXT NULL,
+  personal_reporta TEXT NULL,
+  fecha_alta_diagnostico DATE NULL,
+  fecha_alta_medica DATE NULL,
+  fecha_alta_deportiva DATE NULL,
+  fecha_observacion_activa DATE NULL,
+  fecha_observacion_inactiva DATE NULL,
+  estado_lesion TEXT NULL,
+  diagnostico TEXT NULL,
+  descripcion TEXT NULL,
+  evolucion TEXT NULL,
+  sesiones INTEGER NOT NULL DEFAULT 0,
+  fecha_hora_registro DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  usuario TEXT NULL,
+  updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  deleted_at DATETIME NULL
+);
+CREATE INDEX idx_lesiones_updated_at ON lesiones (updated_at);
+CREATE INDEX idx_lesiones_fecha_registro ON lesiones (fecha_hora_registro);
+CREATE INDEX idx_lesiones_id_lesion ON lesiones (id_lesion);
+CREATE INDEX idx_lesiones_jugadora_registro ON lesiones (id_jugadora, fecha_hora_registro);
+CREATE INDEX idx_lesiones_estado_fecha ON lesiones (estado_lesion, fecha_lesion);
+CREATE INDEX idx_lesiones_usuario_fecha ON lesiones (usuario, fecha_lesion);
+CREATE INDEX idx_lesiones_fecha_lesion ON lesiones (fecha_lesion);
+CREATE INDEX idx_lesiones_deleted_at ON lesiones (deleted_at);
+
+-- ON UPDATE CURRENT_TIMESTAMP de MySQL
+CREATE TRIGGER trg_lesiones_updated_at AFTER UPDATE ON lesiones
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+  UPDATE lesiones SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TABLE lesion_evolucion (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  id_lesion TEXT NOT NULL,
+  fecha_control DATE NULL,
+  tratamiento_aplicado TEXT NULL,
+  personal_seguimiento TEXT NULL,
+  observaciones TEXT NULL,
+  fecha_hora_registro DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  usuario TEXT NULL
+);
+CREATE INDEX idx_evolucion_lesion ON lesion_evolucion (id_lesion, fecha_hora_registro);
+
+CREATE TABLE lesiones_secuencia (
+  id_jugadora TEXT NOT NULL PRIMARY KEY,
+  ultimo INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE lesiones_eliminadas (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  id_lesion TEXT NOT NULL,
+  fecha_eliminacion DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX idx_eliminadas_fecha ON lesiones_eliminadas (fecha_eliminacion);
+
+-- Resumen por periodo para la página de inicio (src/db/db_summary.py)
+CREATE TABLE resumen_lesiones (
+  plantel TEXT NOT NULL,
+  alcance TEXT NOT NULL,
+  granularidad TEXT NOT NULL,
+  periodo DATE NOT NULL,
+  total INTEGER NOT NULL DEFAULT 0,
+  activas INTEGER NOT NULL DEFAULT 0,
+  suma_dias_baja REAL NOT NULL DEFAULT 0,
+  con_dias_baja INTEGER NOT NULL DEFAULT 0,
+  ultima_fecha DATE NULL,
+  updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  PRIMARY KEY (plantel, alcance, granularidad, periodo)
+);
+
+CREATE TABLE resumen_lesiones_zonas (
+  plantel TEXT NOT NULL,
+  alcance TEXT NOT NULL,
+  granularidad TEXT NOT NULL,
+  periodo DATE NOT NULL,
+  zona TEXT NOT NULL,
+  total INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (plantel, alcance, granularidad, periodo, zona)
+);
+
+-- ----------------------------------------------------------
+-- 4️⃣ Usuarios, roles y permisos
+-- ----------------------------------------------------------
+CREATE TABLE roles (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE permissions (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE role_permissions (
+  role_id INTEGER NOT NULL REFERENCES roles(id),
+  permission_id INTEGER NOT NULL REFERENCES permissions(id),
+  PRIMARY KEY (role_id, permission_id)
+);
+
+CREATE TABLE state_user (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  email TEXT NOT NULL UNIQUE,
+  password_hash TEXT NOT NULL,
+  name TEXT NULL,
+  lastname TEXT NULL,
+  role_id INTEGER NOT NULL REFERENCES roles(id),
+  state_id INTEGER NOT NULL REFERENCES state_user(id)
+);
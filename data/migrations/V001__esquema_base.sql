@@ -0,0 +1,180 @@
+-- ==========================================================
+-- 📘 Esquema base: catálogos, jugadoras, lesiones y usuarios
+-- ==========================================================
+-- Reconstruye las tablas tal como las usa la aplicación (db_records, db_catalogs,
+-- db_store, db_login). En una base existente no se ejecuta: se marca con
+--   python -m src.db.db_migrations baseline 4
+
+-- ----------------------------------------------------------
+-- 1️⃣ Catálogos anatómicos
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS segmentos_corporales (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(50) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS zonas_segmento (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(80) NOT NULL,
+  segmento_id INT NOT NULL,
+  UNIQUE KEY uq_zonas_segmento (nombre, segmento_id),
+  FOREIGN KEY (segmento_id) REFERENCES segmentos_corporales(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS zonas_anatomicas (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL,
+  zona_id INT NOT NULL,
+  UNIQUE KEY uq_zonas_anatomicas (nombre, zona_id),
+  FOREIGN KEY (zona_id) REFERENCES zonas_segmento(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- 2️⃣ Catálogos clínicos
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS mecanismos (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS tipo_lesion (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS tipo_especifico_lesion (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+-- Cascada mecanismo → tipo de lesión → tipo específico del formulario
+CREATE TABLE IF NOT EXISTS mecanismo_tipo_lesion (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  mecanismo_id INT NOT NULL,
+  tipo_lesion_id INT NOT NULL,
+  tipo_especifico_id INT NULL,
+  INDEX idx_mtl_mecanismo (mecanismo_id, tipo_lesion_id),
+  FOREIGN KEY (mecanismo_id) REFERENCES mecanismos(id) ON DELETE CASCADE,
+  FOREIGN KEY (tipo_lesion_id) REFERENCES tipo_lesion(id) ON DELETE CASCADE,
+  FOREIGN KEY (tipo_especifico_id) REFERENCES tipo_especifico_lesion(id) ON DELETE SET NULL
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS tratamientos (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS lugares (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(50) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- 3️⃣ Planteles y jugadoras
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS plantel (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL,
+  codigo VARCHAR(20) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS futbolistas (
+  identificacion VARCHAR(50) NOT NULL PRIMARY KEY,
+  nombre VARCHAR(100) NOT NULL,
+  apellido VARCHAR(100) NULL,
+  competicion VARCHAR(20) NULL,          -- plantel.codigo
+  fecha_nacimiento DATE NULL,
+  genero VARCHAR(10) NULL
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS informacion_futbolistas (
+  identificacion VARCHAR(50) NOT NULL PRIMARY KEY,
+  posicion VARCHAR(10) NULL,             -- código (POR, DEF, ...), ver MAP_POSICIONES
+  dorsal INT NULL,
+  nacionalidad VARCHAR(60) NULL,
+  altura DECIMAL(5,2) NULL,
+  peso DECIMAL(5,2) NULL,
+  foto_url VARCHAR(500) NULL,
+  foto_url_drive VARCHAR(500) NULL,
+  FOREIGN KEY (identificacion) REFERENCES futbolistas(identificacion)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- 4️⃣ Lesiones
+-- ----------------------------------------------------------
+-- id_lesion es el identificador de negocio (generar_id_lesion); 'evolucion' es el
+-- array JSON de sesiones que V003 normaliza en lesion_evolucion.
+CREATE TABLE IF NOT EXISTS lesiones (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  id_lesion VARCHAR(50) NOT NULL,
+  id_jugadora VARCHAR(50) NOT NULL,
+  posicion VARCHAR(20) NULL,
+  fecha_lesion DATE NULL,
+  lugar_id INT NULL,
+  segmento_id INT NULL,
+  zona_cuerpo_id INT NULL,
+  zona_especifica_id INT NULL,
+  lateralidad VARCHAR(20) NULL,
+  tipo_lesion_id INT NULL,
+  tipo_especifico_id INT NULL,
+  es_recidiva TINYINT(1) NOT NULL DEFAULT 0,
+  tipo_recidiva VARCHAR(30) NULL,
+  dias_baja_estimado INT NULL,
+  impacto_dias_baja_estimado VARCHAR(30) NULL,
+  mecanismo_id INT NULL,
+  tipo_tratamiento JSON NULL,
+  personal_reporta VARCHAR(150) NULL,
+  fecha_alta_diagnostico DATE NULL,
+  fecha_alta_medica DATE NULL,
+  fecha_alta_deportiva DATE NULL,
+  fecha_observacion_activa DATE NULL,
+  fecha_observacion_inactiva DATE NULL,
+  estado_lesion VARCHAR(20) NULL,
+  diagnostico TEXT NULL,
+  descripcion TEXT NULL,
+  evolucion LONGTEXT NULL,
+  fecha_hora_registro DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  usuario VARCHAR(100) NULL,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- 5️⃣ Usuarios, roles y permisos (db_login)
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS roles (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(50) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS permissions (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(50) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS role_permissions (
+  role_id INT NOT NULL,
+  permission_id INT NOT NULL,
+  PRIMARY KEY (role_id, permission_id),
+  FOREIGN KEY (role_id) REFERENCES roles(id) ON DELETE CASCADE,
+  FOREIGN KEY (permission_id) REFERENCES permissions(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS state_user (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(30) NOT NULL UNIQUE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS users (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  email VARCHAR(150) NOT NULL UNIQUE,
+  password_hash VARCHAR(255) NOT NULL,
+  name VARCHAR(100) NULL,
+  lastname VARCHAR(100) NULL,
+  role_id INT NOT NULL,
+  state_id INT NOT NULL,
+  FOREIGN KEY (role_id) REFERENCES roles(id),
+  FOREIGN KEY (state_id) REFERENCES state_user(id)
+) ENGINE=InnoDB;
@@ -0,0 +1,19 @@
+-- ==========================================================
+-- 🔄 Sincronización incremental del store de lesiones
+-- ==========================================================
+
+-- ----------------------------------------------------------
+-- Lápidas de lesiones eliminadas (las escribe delete_lesiones)
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS lesiones_eliminadas (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  id_lesion VARCHAR(50) NOT NULL,
+  fecha_eliminacion TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_eliminadas_fecha (fecha_eliminacion)
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- Índices para la consulta delta (updated_at / fecha_hora_registro)
+-- ----------------------------------------------------------
+CREATE INDEX idx_lesiones_updated_at ON lesiones (updated_at);
+CREATE INDEX idx_lesiones_fecha_registro ON lesiones (fecha_hora_registro);
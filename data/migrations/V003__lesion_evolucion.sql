@@ -0,0 +1,58 @@
+-- ==========================================================
+-- 🩺 Evolución normalizada de lesiones (una fila por sesión)
+-- ==========================================================
+
+-- ----------------------------------------------------------
+-- Sesiones de seguimiento (solo inserciones)
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS lesion_evolucion (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  id_lesion VARCHAR(50) NOT NULL,
+  fecha_control DATE NULL,
+  tratamiento_aplicado JSON NULL,
+  personal_seguimiento VARCHAR(150) NULL,
+  observaciones TEXT NULL,
+  fecha_hora_registro DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  usuario VARCHAR(100) NULL,
+  INDEX idx_evolucion_lesion (id_lesion, fecha_hora_registro)
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- Contador de sesiones mantenido en lesiones
+-- (la columna 'evolucion' queda como legado y deja de escribirse)
+-- ----------------------------------------------------------
+ALTER TABLE lesiones
+  ADD COLUMN sesiones INT NOT NULL DEFAULT 0,
+  MODIFY evolucion LONGTEXT NULL;
+
+-- ----------------------------------------------------------
+-- Migración de los arrays JSON existentes (MySQL 8.0.4+)
+-- Solo lesiones sin sesiones copiadas: al reanudar la migración no se duplican
+-- ----------------------------------------------------------
+INSERT INTO lesion_evolucion
+  (id_lesion, fecha_control, tratamiento_aplicado, personal_seguimiento,
+   observaciones, fecha_hora_registro, usuario)
+SELECT
+  l.id_lesion,
+  jt.fecha_control,
+  jt.tratamiento_aplicado,
+  jt.personal_seguimiento,
+  jt.observaciones,
+  COALESCE(jt.fecha_hora_registro, l.fecha_hora_registro),
+  jt.usuario
+FROM lesiones l,
+JSON_TABLE(l.evolucion, '$[*]' COLUMNS (
+  fecha_control DATE PATH '$.fecha_control' NULL ON ERROR,
+  tratamiento_aplicado JSON PATH '$.tratamiento_aplicado',
+  personal_seguimiento VARCHAR(150) PATH '$.personal_seguimiento',
+  observaciones TEXT PATH '$.observaciones',
+  fecha_hora_registro DATETIME PATH '$.fecha_hora_registro' NULL ON ERROR,
+  usuario VARCHAR(100) PATH '$.usuario'
+)) jt
+WHERE JSON_VALID(l.evolucion)
+  AND NOT EXISTS (SELECT 1 FROM lesion_evolucion e WHERE e.id_lesion = l.id_lesion);
+
+UPDATE lesiones l
+SET l.sesiones = (
+  SELECT COUNT(*) FROM lesion_evolucion e WHERE e.id_lesion = l.id_lesion
+);
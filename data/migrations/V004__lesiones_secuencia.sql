@@ -0,0 +1,22 @@
+-- ==========================================================
+-- 🔢 Secuencia de IDs de lesión por jugadora
+-- ==========================================================
+
+-- ----------------------------------------------------------
+-- Último número asignado (sufijo "-N" de id_lesion) por jugadora.
+-- Lo incrementa reservar_numero_lesion dentro de la transacción del INSERT.
+-- ----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS lesiones_secuencia (
+  id_jugadora VARCHAR(50) NOT NULL PRIMARY KEY,
+  ultimo INT UNSIGNED NOT NULL DEFAULT 0
+) ENGINE=InnoDB;
+
+-- ----------------------------------------------------------
+-- Inicialización a partir de los IDs existentes
+-- ----------------------------------------------------------
+INSERT INTO lesiones_secuencia (id_jugadora, ultimo)
+SELECT id_jugadora, MAX(CAST(SUBSTRING_INDEX(id_lesion, '-', -1) AS UNSIGNED))
+FROM lesiones
+WHERE id_lesion REGEXP '-[0-9]+$'
+GROUP BY id_jugadora
+ON DUPLICATE KEY UPDATE ultimo = GREATEST(ultimo, VALUES(ultimo));
@@ -0,0 +1,36 @@
+-- ==========================================================
+-- 🚀 Índices para los patrones de consulta de la aplicación
+-- ==========================================================
+-- Cada índice corresponde a una entrada de CONSULTAS_EXPLAIN en src/db/db_migrations.py;
+-- `python -m src.db.db_migrations explain` comprueba que MySQL los usa.
+
+-- ----------------------------------------------------------
+-- UPDATE / DELETE por id de negocio y join con lesion_evolucion.
+-- No es UNIQUE: bases antiguas pueden tener ids repetidos de antes de la secuencia (V004).
+-- ----------------------------------------------------------
+CREATE INDEX idx_lesiones_id_lesion ON lesiones (id_lesion);
+
+-- ----------------------------------------------------------
+-- Historial de una jugadora ordenado por registro (sin filesort)
+-- ----------------------------------------------------------
+CREATE INDEX idx_lesiones_jugadora_registro ON lesiones (id_jugadora, fecha_hora_registro);
+
+-- ----------------------------------------------------------
+-- Lesiones activas / en observación en un rango de fechas
+-- ----------------------------------------------------------
+CREATE INDEX idx_lesiones_estado_fecha ON lesiones (estado_lesion, fecha_lesion);
+
+-- ----------------------------------------------------------
+-- Registros del rol developer (build_lesiones_where) por fecha de lesión
+-- ----------------------------------------------------------
+CREATE INDEX idx_lesiones_usuario_fecha ON lesiones (usuario, fecha_lesion);
+
+-- ----------------------------------------------------------
+-- Rango de fechas de los filtros y MIN/MAX de load_opciones_filtro_lesiones_db
+-- ----------------------------------------------------------
+CREATE INDEX idx_lesiones_fecha_lesion ON lesiones (fecha_lesion);
+
+-- ----------------------------------------------------------
+-- Filtro por plantel (f.competicion) antes del join con lesiones
+-- ----------------------------------------------------------
+CREATE INDEX idx_futbolistas_competicion ON futbolistas (competicion);
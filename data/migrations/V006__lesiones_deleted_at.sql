@@ -0,0 +1,11 @@
+-- ==========================================================
+-- 🗑️ Borrado lógico de lesiones
+-- ==========================================================
+-- delete_lesiones(soft=True) marca deleted_at y la purga en segundo plano borra
+-- las filas después. Las lecturas filtran 'l.deleted_at IS NULL' (regla de alcance
+-- en src/db/db_scope.py); la purga recorre el índice por deleted_at.
+
+ALTER TABLE lesiones
+  ADD COLUMN deleted_at DATETIME NULL DEFAULT NULL;
+
+CREATE INDEX idx_lesiones_deleted_at ON lesiones (deleted_at);
@@ -0,0 +1,26 @@
+-- ==========================================================
+-- 📈 Resumen de lesiones por periodo (inicio)
+-- ==========================================================
+-- Una fila por (plantel, alcance, granularidad, periodo): la página de inicio lee
+-- unas decenas de filas en lugar de todo el histórico.
+-- - alcance: RowScope.clave (ver src/db/db_scope.py), un alcance por rol.
+-- - granularidad: 'semana' (periodo = lunes ISO) o 'mes' (periodo = día 1).
+-- - promedio de días de baja = suma_dias_baja / con_dias_baja.
+-- - zonas: JSON {zona_cuerpo: lesiones} del periodo.
+-- save_lesion y delete_lesiones recalculan los periodos afectados en su transacción;
+-- `python -m src.db.db_summary rebuild` lo reconstruye entero.
+
+CREATE TABLE IF NOT EXISTS resumen_lesiones (
+  plantel VARCHAR(20) NOT NULL,
+  alcance VARCHAR(20) NOT NULL,
+  granularidad VARCHAR(10) NOT NULL,
+  periodo DATE NOT NULL,
+  total INT NOT NULL DEFAULT 0,
+  activas INT NOT NULL DEFAULT 0,
+  suma_dias_baja DOUBLE NOT NULL DEFAULT 0,
+  con_dias_baja INT NOT NULL DEFAULT 0,
+  zonas TEXT NULL,
+  ultima_fecha DATE NULL,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (plantel, alcance, granularidad, periodo)
+) ENGINE=InnoDB;
@@ -0,0 +1,20 @@
+-- ==========================================================
+-- 📈 Resumen de lesiones: conteo por zona en tabla propia
+-- ==========================================================
+-- save_lesion y delete_lesiones aplican deltas al resumen con upserts
+-- (total = total + ...), sin releer las lesiones del periodo. El JSON 'zonas'
+-- de V007 no se puede incrementar así: cada zona pasa a ser una fila.
+-- Tras migrar: `python -m src.db.db_summary rebuild`.
+
+CREATE TABLE IF NOT EXISTS resumen_lesiones_zonas (
+  plantel VARCHAR(20) NOT NULL,
+  alcance VARCHAR(20) NOT NULL,
+  granularidad VARCHAR(10) NOT NULL,
+  periodo DATE NOT NULL,
+  zona VARCHAR(100) NOT NULL,
+  total INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (plantel, alcance, granularidad, periodo, zona)
+) ENGINE=InnoDB;
+
+ALTER TABLE resumen_lesiones
+  DROP COLUMN zonas;
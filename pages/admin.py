@@ -4,7 +4,7 @@ import src.app_config.config as config
 config.init_config()
 
 from src.ui.ui_components import selection_header
-from src.db.db_records import delete_lesiones
+from src.db.db_delete import delete_lesiones
 
 if st.session_state["auth"]["rol"].lower() not in ["admin", "developer"]:
     st.switch_page("app.py")
@@ -55,17 +55,21 @@ def dialog_eliminar():
             st.rerun()
     with col3:
         if st.button(t(":material/delete: Eliminar"), type="primary"):
-            exito, mensaje = delete_lesiones(ids_seleccionados)
+            exito, mensaje, por_bloque = delete_lesiones(ids_seleccionados)
 
             if exito:
-                # Marcar para recarga
+                # El mensaje se muestra tras la recarga (st.rerun reinicia las variables)
                 st.session_state["reload_flag"] = True
+                st.session_state["resultado_eliminacion"] = (mensaje, por_bloque)
             else:
                 st.error(mensaje)
             st.rerun()
 
-if st.session_state.get("reload_flag") and exito:     
+if st.session_state.get("reload_flag") and "resultado_eliminacion" in st.session_state:
+    mensaje, por_bloque = st.session_state.pop("resultado_eliminacion")
     st.success(mensaje)
+    if len(por_bloque) > 1:
+        st.caption(t("Registros por bloque:") + " " + ", ".join(str(n) for n in por_bloque))
     st.session_state["reload_flag"] = False
 
 col1, col2, col3, _, _ = st.columns([1.6, 1.8, 2, 1, 1])
@@ -81,7 +85,7 @@ with col2:
 if st.session_state["auth"]["rol"].lower() in ["developer"]:
     with col3:
             # Convertir a JSON (texto legible, sin índices)
-            json_data = records.to_json(orient="records", force_ascii=False, indent=2)
+            json_data = records.to_json(orient="records", force_ascii=False, indent=2, date_format="iso")
             json_bytes = json_data.encode("utf-8")
 
             # Botón de descarga
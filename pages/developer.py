@@ -5,6 +5,16 @@ config.init_config()
 from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 from src.db.db_login import load_all_users_from_db
+import pandas as pd
+
+from src.db.db_cache import invalidate_tables, registered_tables, cache_stats, result_cache
+from src.db.db_connection import get_pool_stats, get_pool_history
+from src.db.db_metrics import (query_summary, queries_dataframe, clear_queries, latency_percentiles,
+                               slowest_queries, configure_slow_query_log, slow_query_threshold_ms,
+                               slow_query_log_path)
+
+# Loaders cuya tasa de aciertos de caché se muestra en el panel
+LOADERS_PANEL = ["_fetch_catalog_bundle", "load_jugadoras_db", "load_competiciones_db", "_fetch_role_permissions", "fetch_all"]
 
 if st.session_state["auth"]["rol"].lower() != "developer":
     st.switch_page("app.py")
@@ -22,4 +32,67 @@ with simulador:
 with bd:
     if st.button(":material/update: Recargar datos"):
         st.cache_data.clear()
+        result_cache.clear()
+        st.rerun()
+
+    tablas = st.multiselect("Invalidar solo las cachés que dependen de:", registered_tables())
+    if st.button(":material/cached: Invalidar tablas", disabled=not tablas):
+        invalidados = invalidate_tables(*tablas)
+        st.success(f"Se invalidaron {invalidados} loader(s) para: {', '.join(tablas)}")
+
+    st.divider()
+    panel_en_vivo = st.toggle("Actualizar el panel cada 5 s", value=False)
+
+    @st.fragment(run_every="5s" if panel_en_vivo else None)
+    def panel_rendimiento():
+        st.subheader("Rendimiento de la capa de datos")
+        st.caption("Últimas ejecuciones de este proceso, agrupadas por la función que lanzó la consulta.")
+
+        pool = get_pool_stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Conexiones en uso", f'{pool.get("in_use", 0)} / {pool.get("size", 0)}')
+        col2.metric("Máximo en uso", pool.get("max_in_use", 0))
+        col3.metric("Espera media (ms)", f'{pool.get("wait_avg", 0) * 1000:.2f}')
+        col4.metric("Pool agotado", pool.get("exhausted", 0))
+
+        st.markdown("**Latencia por consulta**")
+        st.dataframe(latency_percentiles(), hide_index=True)
+
+        st.markdown("**Ejecuciones más lentas**")
+        st.dataframe(slowest_queries(20), hide_index=True)
+
+        st.markdown("**Aciertos de caché**")
+        stats = cache_stats()
+        filas_cache = [{"loader": nombre, **stats.get(nombre, {"llamadas": 0, "fallos": 0, "aciertos": 0,
+                                                                "tasa_aciertos": None})}
+                       for nombre in LOADERS_PANEL]
+        st.dataframe(pd.DataFrame(filas_cache), hide_index=True,
+                     column_config={"tasa_aciertos": st.column_config.ProgressColumn(
+                         "tasa_aciertos", format="percent", min_value=0, max_value=1)})
+
+        st.markdown("**Ocupación del pool**")
+        historial = get_pool_history()
+        if historial:
+            ocupacion = pd.DataFrame(historial, columns=["instante", "en_uso"])
+            ocupacion["instante"] = pd.to_datetime(ocupacion["instante"], unit="s")
+            # Máximo por segundo: los préstamos cortos no desaparecen al agrupar
+            ocupacion = ocupacion.set_index("instante").resample("1s").max().ffill()
+            st.line_chart(ocupacion, y="en_uso")
+        else:
+            st.caption("Sin préstamos de conexiones todavía.")
+
+        with st.expander("Resumen y ejecuciones recientes"):
+            st.dataframe(query_summary(), hide_index=True)
+            st.dataframe(queries_dataframe(limit=200), hide_index=True)
+
+    panel_rendimiento()
+
+    umbral = st.number_input("Umbral de consulta lenta (ms)", min_value=1, step=50,
+                             value=int(slow_query_threshold_ms()))
+    if umbral != slow_query_threshold_ms():
+        configure_slow_query_log(umbral_ms=umbral)
+    st.caption(f"Las consultas más lentas que el umbral se escriben en `{slow_query_log_path()}` (archivo rotativo).")
+
+    if st.button(":material/delete_sweep: Vaciar métricas"):
+        clear_queries()
         st.rerun()
@@ -4,9 +4,9 @@ from src.i18n.i18n import t
 import src.app_config.config as config
 config.init_config()
 
-from src.ui.ui_components import data_filters_advanced
+from src.ui.ui_components import data_filters_advanced, filter_params
 from src.reports.ui_grupal import groupal_metrics
-from src.db.db_records import get_records_plus_players_db
+from src.db.db_aggregates import load_agregados_grupales_db
 from src.util.util import clean_df
 
 st.header(t("Análisis :red[grupal]"), divider=True)
@@ -20,7 +20,10 @@ if df_filtrado.empty:
     st.info("No se encontraron registros de lesiones. Por favor, añade datos para continuar.")
     st.stop()
 
-groupal_metrics(df_filtrado)
+# Agregados calculados en SQL con los mismos filtros
+agregados = load_agregados_grupales_db(*filter_params(competicion, posicion, tipo_lesion), *fechas)
+
+groupal_metrics(agregados)
 
 graficos, tablas = st.tabs([t("Graficos"), t("Registros")])
 
@@ -36,7 +39,7 @@ with graficos:
         #st.subheader("1. Distribución por Tipo de Lesión")
         
         # KPI 1: Lesiones por Tipo (Gráfico Circular)
-        conteo_tipo = df_filtrado['tipo_lesion'].value_counts().reset_index()
+        conteo_tipo = agregados["tipo_lesion"][["valor", "total"]]
         conteo_tipo.columns = ['Tipo de Lesión', 'Total']
         
         fig_tipo = px.pie(
@@ -51,7 +54,7 @@ with graficos:
 
         #st.subheader("3. Lesiones por Lugar de Ocurrencia")
         # KPI 3: Lesiones por Lugar (Gráfico de Barras)
-        conteo_lugar = df_filtrado['lugar'].value_counts().reset_index()
+        conteo_lugar = agregados["lugar"][["valor", "total"]]
         conteo_lugar.columns = ['Lugar', 'Total']
 
         fig_lugar = px.bar(
@@ -69,7 +72,7 @@ with graficos:
         #st.subheader("2. Concentración por Zona del Cuerpo")
 
         # KPI 2: Lesiones por Zona del Cuerpo (Gráfico de Barras Horizontales)
-        conteo_zona = df_filtrado['zona_cuerpo'].value_counts().reset_index()
+        conteo_zona = agregados["zona_cuerpo"][["valor", "total"]]
         conteo_zona.columns = ['Zona del Cuerpo', 'Total']
 
         fig_zona = px.bar(
@@ -86,7 +89,7 @@ with graficos:
 
         #st.subheader("4. Tiempo de Baja por Tipo de Lesión")
         # KPI 4: Tiempo Promedio de Baja por Tipo de Lesión (Gráfico de Barras)
-        df_tiempo = df_filtrado.groupby('tipo_lesion')['dias_baja_estimado'].mean().reset_index()
+        df_tiempo = agregados["tipo_lesion"][["valor", "promedio_dias"]].dropna()
         df_tiempo.columns = ['Tipo de Lesión', 'Promedio Días de Baja']
 
         fig_tiempo = px.bar(
@@ -100,7 +103,5 @@ with graficos:
         st.plotly_chart(fig_tiempo)
 
 with tablas:
-    records = get_records_plus_players_db()
-    records_clean = clean_df(records)
-    records_filtrados = records_clean[records_clean["id_lesion"].isin(df_filtrado["id_lesion"])]
+    records_filtrados = clean_df(df_filtrado)
     st.dataframe(records_filtrados)
\ No newline at end of file
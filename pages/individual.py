@@ -10,7 +10,7 @@ from src.reports.ui_individual import (grafico_zonas_lesionadas, grafico_tipo_me
 
 st.header(t("Análisis :red[individual]"), divider=True)
 
-jugadora_seleccionada, posicion, records = selection_header(modo=2)
+jugadora_seleccionada, posicion, records, perfil = selection_header(modo=2, con_perfil=True)
 
 st.divider()
 
@@ -25,23 +25,23 @@ tab1, tab2 = st.tabs([t("Graficos"), t("Registros")])
 with tab1:
     col1, col2 = st.columns([1,1])
     with col1:
-        fig = grafico_evolucion_lesiones(records)
+        fig = grafico_evolucion_lesiones(perfil)
         if fig: st.plotly_chart(fig)
 
-        fig = grafico_tipo_mecanismo(records)
+        fig = grafico_tipo_mecanismo(perfil)
         if fig: st.plotly_chart(fig)
 
-        fig = grafico_dias_baja(records)
+        fig = grafico_dias_baja(perfil)
         if fig: st.plotly_chart(fig)
 
     with col2:
-        fig = grafico_zonas_lesionadas(records)
+        fig = grafico_zonas_lesionadas(perfil)
         if fig: st.plotly_chart(fig)
 
-        fig = grafico_tratamientos(records)
+        fig = grafico_tratamientos(perfil)
         if fig: st.plotly_chart(fig)
 
-        fig = grafico_recidivas(records)
+        fig = grafico_recidivas(perfil)
         if fig: st.plotly_chart(fig)
 
 with tab2:
@@ -0,0 +1,127 @@
+"""
+Compara la construcción del DataFrame de lesiones con cursor de diccionarios
+(pd.DataFrame(lista de dicts)) frente a cursor de tuplas (frame_from_cursor).
+
+    python -m scripts.bench_fetch_dataframe            # datos sintéticos, 100k filas
+    python -m scripts.bench_fetch_dataframe --filas 250000
+    python -m scripts.bench_fetch_dataframe --db       # contra MySQL (.streamlit/secrets.toml)
+"""
+import argparse
+import datetime
+import random
+import statistics
+import time
+import tracemalloc
+
+import pandas as pd
+
+from src.db.db_utils import frame_from_cursor
+from src.db.db_store import LESIONES_BASE_QUERY
+
+COLUMNAS = [
+    "id", "id_lesion", "id_jugadora", "nombre", "apellido", "plantel", "posicion", "posicion_lesion",
+    "fecha_lesion", "lugar_id", "lugar", "segmento_id", "segmento", "zona_cuerpo_id", "zona_cuerpo",
+    "zona_especifica_id", "zona_especifica", "lateralidad", "tipo_lesion", "tipo_especifico",
+    "es_recidiva", "tipo_recidiva", "dias_baja_estimado", "impacto_dias_baja_estimado", "mecanismo_id",
+    "mecanismo", "tipo_tratamiento", "personal_reporta", "fecha_alta_diagnostico", "fecha_alta_deportiva",
+    "fecha_alta_medica", "fecha_observacion_activa", "fecha_observacion_inactiva", "estado_lesion",
+    "diagnostico", "descripcion", "sesiones", "fecha_hora_registro", "usuario",
+]
+
+class _CursorSintetico:
+    """Imita el resultado de mysql-connector: tuplas o un dict por fila (dictionary=True)."""
+
+    def __init__(self, rows, dictionary=False):
+        self._rows = rows
+        self._dictionary = dictionary
+        self.description = [(c,) for c in COLUMNAS]
+
+    def fetchall(self):
+        if self._dictionary:
+            return [dict(zip(COLUMNAS, row)) for row in self._rows]
+        return list(self._rows)
+
+def _filas_sinteticas(n: int) -> list[tuple]:
+    rnd = random.Random(42)
+    base = datetime.date(2022, 1, 1)
+    lugares = ["ENTRENAMIENTO", "PARTIDO", "GIMNASIO", "OTRO"]
+    zonas = ["RODILLA", "TOBILLO", "MUSLO", "CADERA", "PIE", "ESPALDA"]
+    tipos = ["MUSCULAR", "LIGAMENTOSA", "ÓSEA", "TENDINOSA"]
+    filas = []
+    for i in range(n):
+        fecha = base + datetime.timedelta(days=rnd.randrange(1200))
+        filas.append((
+            i + 1, f"AB{fecha:%Y%m%d}-{i % 9 + 1}", f"J{rnd.randrange(300):04d}", "Ana", "Pérez",
+            rnd.choice(["1FF", "2FF", "U19"]), rnd.choice(["POR", "DEF", "MC", "DEL"]), "DEF",
+            fecha, rnd.randrange(1, 5), rnd.choice(lugares), rnd.randrange(1, 6), "MIEMBRO INFERIOR",
+            rnd.randrange(1, 7), rnd.choice(zonas), rnd.randrange(1, 40), "ISQUIOTIBIALES",
+            rnd.choice(["DERECHA", "IZQUIERDA", None]), rnd.choice(tipos), "DISTENSIÓN",
+            rnd.randrange(2), None, rnd.randrange(60), rnd.choice(["LEVE", "MODERADA", "GRAVE"]),
+            rnd.randrange(1, 10), "SOBRECARGA", '["FISIOTERAPIA"]', "MÉDICO", fecha, None, None,
+            None, None, rnd.choice(["ACTIVO", "INACTIVO", "OBSERVACION"]), "Diagnóstico", "Descripción",
+            rnd.randrange(8), datetime.datetime.combine(fecha, datetime.time(10, 0)), "admin",
+        ))
+    return filas
+
+def _medir(func, repeticiones: int) -> tuple[float, float]:
+    """Mediana de tiempo (s) y pico de memoria (MB) de `func`."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        func()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(tiempos), pico / 1024 ** 2
+
+def _bench_sintetico(n: int, repeticiones: int) -> dict:
+    filas = _filas_sinteticas(n)
+    return {
+        "dict + pd.DataFrame(rows)": _medir(lambda: pd.DataFrame(_CursorSintetico(filas, True).fetchall()), repeticiones),
+        "tuplas + frame_from_cursor": _medir(lambda: frame_from_cursor(_CursorSintetico(filas)), repeticiones),
+    }
+
+def _bench_db(n: int, repeticiones: int) -> dict:
+    from src.db.db_connection import db_connection
+
+    query = f"{LESIONES_BASE_QUERY} LIMIT {int(n)};"
+
+    def con_diccionarios():
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            df = pd.DataFrame(cursor.fetchall())
+            cursor.close()
+        return df
+
+    def con_tuplas():
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            df = frame_from_cursor(cursor)
+            cursor.close()
+        return df
+
+    return {
+        "dict + pd.DataFrame(rows)": _medir(con_diccionarios, repeticiones),
+        "tuplas + frame_from_cursor": _medir(con_tuplas, repeticiones),
+    }
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--db", action="store_true", help="Medir contra la tabla 'lesiones' real.")
+    args = parser.parse_args(argv)
+
+    resultados = (_bench_db if args.db else _bench_sintetico)(args.filas, args.repeticiones)
+
+    print(f"{args.filas} filas · {len(COLUMNAS)} columnas · mediana de {args.repeticiones} repeticiones")
+    for nombre, (segundos, pico_mb) in resultados.items():
+        print(f"  {nombre:<28} {segundos * 1000:8.1f} ms   pico {pico_mb:7.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -203,8 +203,8 @@ def validate_access(password, user):
         st.error("Credenciales incorrectas")
         return
 
-    permisos = [p.strip() for p in user.get("permissions", "").split(",")]
-    if auth_config.APP_NAME not in permisos:
+    # frozenset cacheado por rol (load_user_from_db)
+    if auth_config.APP_NAME not in user.get("permissions", frozenset()):
         st.error("No tienes permiso para acceder a esta app")
         return
 
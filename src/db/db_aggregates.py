@@ -0,0 +1,106 @@
+import pandas as pd
+import streamlit as st
+
+from src.db.db_connection import get_connection
+from src.db.db_records import build_lesiones_where
+
+# Joins mínimos para los filtros de build_lesiones_where (l, f, i, t) y las dimensiones agregadas
+_AGG_FROM = """
+FROM lesiones l
+LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
+LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
+LEFT JOIN tipo_lesion t ON l.tipo_lesion_id = t.id
+LEFT JOIN lugares lu ON l.lugar_id = lu.id
+LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
+"""
+
+# Dimensiones de los gráficos del análisis grupal → expresión SQL
+DIMENSIONES_GRUPALES = {
+    "tipo_lesion": "t.nombre",
+    "lugar": "lu.nombre",
+    "zona_cuerpo": "z.nombre",
+}
+
+def _kpis_vacios() -> dict:
+    return {"total": 0, "activas": 0, "promedio_dias": None, "recidivas": 0}
+
+def load_agregados_grupales_db(plantel: str = None, posicion: str = None, tipo_lesion: str = None,
+                               fecha_inicio=None, fecha_fin=None) -> dict:
+    """
+    Calcula en MySQL los agregados del análisis grupal con los mismos filtros que
+    load_lesiones_filtradas_db. Usa una conexión y dos consultas:
+
+    1. KPIs: total, activas, promedio de dias_baja_estimado y recidivas.
+    2. Conteos por tipo_lesion, lugar y zona_cuerpo (un GROUP BY por dimensión unidos
+       con UNION ALL), con el promedio de días de baja de cada grupo.
+
+    Retorna:
+        dict: {"kpis": dict, "tipo_lesion": DataFrame, "lugar": DataFrame, "zona_cuerpo": DataFrame}
+              Cada DataFrame tiene columnas [valor, total, promedio_dias], ordenado por total desc.
+    """
+    vacio = pd.DataFrame(columns=["valor", "total", "promedio_dias"])
+    agregados = {"kpis": _kpis_vacios(), **{dim: vacio.copy() for dim in DIMENSIONES_GRUPALES}}
+
+    conn = get_connection(readonly=True)
+    if not conn:
+        st.error(":material/warning: No se pudo conectar a la base de datos.")
+        return agregados
+
+    cursor = None
+    try:
+        where, params = build_lesiones_where(plantel, posicion, tipo_lesion, fecha_inicio, fecha_fin)
+        cursor = conn.cursor(dictionary=True)
+
+        # --- 1. KPIs ---
+        cursor.execute(f"""
+        SELECT
+            COUNT(*) AS total,
+            COALESCE(SUM(l.estado_lesion = 'ACTIVO'), 0) AS activas,
+            AVG(l.dias_baja_estimado) AS promedio_dias,
+            COALESCE(SUM(l.es_recidiva = 1), 0) AS recidivas
+        {_AGG_FROM}
+        {where};
+        """, tuple(params))
+        kpis = cursor.fetchone() or _kpis_vacios()
+        agregados["kpis"] = {
+            "total": int(kpis["total"]),
+            "activas": int(kpis["activas"]),
+            "promedio_dias": float(kpis["promedio_dias"]) if kpis["promedio_dias"] is not None else None,
+            "recidivas": int(kpis["recidivas"]),
+        }
+
+        if agregados["kpis"]["total"] == 0:
+            return agregados
+
+        # --- 2. Conteos por dimensión ---
+        selects, params_union = [], []
+        for dimension, expresion in DIMENSIONES_GRUPALES.items():
+            selects.append(f"""
+            SELECT '{dimension}' AS dimension, {expresion} AS valor,
+                   COUNT(*) AS total, AVG(l.dias_baja_estimado) AS promedio_dias
+            {_AGG_FROM}
+            {where} AND {expresion} IS NOT NULL
+            GROUP BY {expresion}
+            """)
+            params_union.extend(params)
+
+        cursor.execute(" UNION ALL ".join(selects) + ";", tuple(params_union))
+        conteos = pd.DataFrame(cursor.fetchall(), columns=["dimension", "valor", "total", "promedio_dias"])
+        conteos["total"] = conteos["total"].astype(int)
+        conteos["promedio_dias"] = pd.to_numeric(conteos["promedio_dias"], errors="coerce").astype(float)
+
+        for dimension in DIMENSIONES_GRUPALES:
+            df_dim = conteos[conteos["dimension"] == dimension].drop(columns="dimension")
+            agregados[dimension] = (
+                df_dim.sort_values(["total", "valor"], ascending=[False, True]).reset_index(drop=True)
+            )
+
+        return agregados
+
+    except Exception as e:
+        st.error(f":material/warning: Error al calcular agregados grupales: {e}")
+        return agregados
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
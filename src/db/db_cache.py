@@ -0,0 +1,274 @@
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+import streamlit as st
+
+from src.db.db_metrics import approx_bytes
+
+# tabla → funciones cacheadas (st.cache_data / st.cache_resource) que dependen de ella
+_CACHED_LOADERS = defaultdict(list)
+
+# tabla → callbacks adicionales (p. ej. el store de lesiones)
+_HOOKS = defaultdict(list)
+
+# nombre del loader → {"llamadas": n, "fallos": n} (fallo = se ejecutó la función, no había entrada en caché)
+_STATS = defaultdict(lambda: {"llamadas": 0, "fallos": 0})
+
+_lock = threading.Lock()
+
+DEFAULT_RESULT_CACHE_ENTRIES = 256
+DEFAULT_RESULT_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_RESULT_CACHE_TTL = 300  # segundos
+
+_RE_TABLAS_LECTURA = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_RE_TABLA_ESCRITURA = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?", re.IGNORECASE
+)
+
+def _register(func, tables) -> None:
+    with _lock:
+        for table in tables:
+            if func not in _CACHED_LOADERS[table]:
+                _CACHED_LOADERS[table].append(func)
+
+def count_cache_event(nombre: str, campo: str) -> None:
+    """Suma uno al contador `campo` ('llamadas', 'fallos', 'expulsiones'...) de `nombre` en cache_stats()."""
+    with _lock:
+        _STATS[nombre][campo] = _STATS[nombre].get(campo, 0) + 1
+
+def _instrumentar(func, cache_decorator):
+    """
+    Aplica `cache_decorator` contando llamadas y fallos de caché: la función interna solo
+    se ejecuta cuando no hay entrada, así que fallos/llamadas es la tasa de fallos.
+    El envoltorio conserva `.clear()` del objeto cacheado.
+    """
+    nombre = func.__name__
+
+    @functools.wraps(func)
+    def _sin_cache(*args, **kwargs):
+        count_cache_event(nombre, "fallos")
+        return func(*args, **kwargs)
+
+    cached = cache_decorator(_sin_cache)
+
+    @functools.wraps(func)
+    def loader(*args, **kwargs):
+        count_cache_event(nombre, "llamadas")
+        return cached(*args, **kwargs)
+
+    loader.clear = cached.clear
+    return loader
+
+def cached_loader(tables, **cache_kwargs):
+    """
+    Igual que @st.cache_data(**cache_kwargs), pero registra las tablas de las que depende
+    el loader para que invalidate_tables() pueda vaciar solo sus entradas.
+
+        @cached_loader(["futbolistas", "informacion_futbolistas"], ttl=3600)
+        def load_jugadoras_db(): ...
+    """
+    def decorator(func):
+        cached = _instrumentar(func, st.cache_data(**cache_kwargs))
+        _register(cached, tables)
+        return cached
+    return decorator
+
+def cached_resource_loader(tables, **cache_kwargs):
+    """Variante de cached_loader para @st.cache_resource (objetos compartidos e inmutables)."""
+    def decorator(func):
+        cached = _instrumentar(func, st.cache_resource(**cache_kwargs))
+        _register(cached, tables)
+        return cached
+    return decorator
+
+def on_invalidate(tables):
+    """Registra un callback `fn(tabla)` que se ejecuta al invalidar cualquiera de las tablas."""
+    def decorator(func):
+        with _lock:
+            for table in tables:
+                _HOOKS[table].append(func)
+        return func
+    return decorator
+
+def invalidate_tables(*tables: str) -> int:
+    """
+    Vacía las cachés que dependen de las tablas indicadas y ejecuta sus callbacks.
+    Se llama después de cada escritura confirmada (commit).
+
+    Retorna:
+        int: número de loaders vaciados.
+    """
+    with _lock:
+        loaders = {id(f): f for table in tables for f in _CACHED_LOADERS.get(table, [])}
+        hooks = [(table, hook) for table in tables for hook in _HOOKS.get(table, [])]
+
+    for func in loaders.values():
+        func.clear()
+
+    for table, hook in hooks:
+        try:
+            hook(table)
+        except Exception as e:
+            print(f"Error al invalidar caché de {table}: {e}")
+
+    result_cache.invalidate(*tables)
+    return len(loaders)
+
+def registered_tables() -> list[str]:
+    """Tablas con al menos un loader o callback registrado."""
+    with _lock:
+        return sorted(set(_CACHED_LOADERS) | set(_HOOKS))
+
+def cache_stats() -> dict:
+    """
+    Llamadas, fallos y tasa de aciertos por loader registrado con cached_loader/cached_resource_loader
+    (contadores del proceso desde el arranque o desde reset_cache_stats).
+    """
+    with _lock:
+        stats = {nombre: dict(valores) for nombre, valores in _STATS.items()}
+
+    for valores in stats.values():
+        llamadas = valores["llamadas"]
+        valores["aciertos"] = max(llamadas - valores["fallos"], 0)
+        valores["tasa_aciertos"] = valores["aciertos"] / llamadas if llamadas else None
+    return stats
+
+def reset_cache_stats() -> None:
+    with _lock:
+        _STATS.clear()
+
+# ==========================================================
+# 🗃️ Caché de resultados de consultas sueltas (fetch_all)
+# ==========================================================
+
+def normalize_sql(query: str) -> str:
+    """SQL sin espacios repetidos ni ';' final: dos escrituras de la misma consulta comparten entrada."""
+    return " ".join(query.split()).rstrip(";").strip()
+
+def tables_read(query: str) -> set[str]:
+    """Tablas que aparecen tras FROM/JOIN (en minúsculas)."""
+    return {t.lower() for t in _RE_TABLAS_LECTURA.findall(query)}
+
+def table_written(query: str) -> str | None:
+    """Tabla destino de un INSERT/REPLACE/UPDATE/DELETE, o None."""
+    match = _RE_TABLA_ESCRITURA.match(query)
+    return match.group(1).lower() if match else None
+
+class ResultCache:
+    """
+    Caché LRU de resultados (listas de dicts) por SQL normalizado + parámetros, con:
+    - TTL por entrada,
+    - límite de entradas y de bytes aproximados (se expulsan las menos usadas),
+    - índice tabla → claves para vaciar solo lo afectado por una escritura,
+    - generación por tabla: una consulta que empezó antes de invalidar la tabla no guarda
+      su resultado (ver generation / put).
+
+    Las filas se copian al guardar y al devolver: quien las recibe puede modificarlas.
+    Llamadas, fallos, expulsiones y resultados descartados se cuentan en cache_stats() bajo `nombre`.
+    """
+
+    def __init__(self, nombre: str, max_entries: int = DEFAULT_RESULT_CACHE_ENTRIES,
+                 max_bytes: int = DEFAULT_RESULT_CACHE_BYTES, ttl: float = DEFAULT_RESULT_CACHE_TTL):
+        self.nombre = nombre
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # clave → (expira, bytes, tablas, filas)
+        self._por_tabla = defaultdict(set)
+        self._bytes = 0
+        self._generaciones = defaultdict(int)  # tabla → invalidaciones
+        self._limpiezas = 0  # clear()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query: str, params=None) -> tuple:
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+        return normalize_sql(query), repr(params or ())
+
+    def _quitar(self, clave) -> None:
+        _, tamaño, tablas, _ = self._entradas.pop(clave)
+        self._bytes -= tamaño
+        for tabla in tablas:
+            self._por_tabla[tabla].discard(clave)
+            if not self._por_tabla[tabla]:
+                del self._por_tabla[tabla]
+
+    def get(self, clave):
+        """Filas cacheadas o None si no hay entrada vigente."""
+        count_cache_event(self.nombre, "llamadas")
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] <= time.monotonic():
+                self._quitar(clave)
+                entrada = None
+            if entrada is None:
+                count_cache_event(self.nombre, "fallos")
+                return None
+            self._entradas.move_to_end(clave)
+            filas = entrada[3]
+        return [dict(fila) for fila in filas]
+
+    def _generacion(self, tablas) -> tuple:
+        return self._limpiezas, tuple(self._generaciones.get(tabla, 0) for tabla in sorted(tablas))
+
+    def generation(self, tablas: set[str]) -> tuple:
+        """Marca de las tablas a leer; se toma antes de ejecutar la consulta y se pasa a put()."""
+        with self._lock:
+            return self._generacion(tablas)
+
+    def put(self, clave, filas: list, tablas: set[str], ttl: float = None, generacion: tuple = None) -> None:
+        """
+        Guarda el resultado. Si se indica `generacion` (de generation()) y alguna de las tablas
+        se invalidó desde entonces, el resultado puede ser anterior a la escritura y se descarta.
+        """
+        tamaño = approx_bytes(filas)
+        if tamaño > self.max_bytes:
+            return
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        copia = [dict(fila) for fila in filas]
+
+        with self._lock:
+            if generacion is not None and generacion != self._generacion(tablas):
+                count_cache_event(self.nombre, "descartadas")
+                return
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = (expira, tamaño, frozenset(tablas), copia)
+            self._bytes += tamaño
+            for tabla in tablas:
+                self._por_tabla[tabla].add(clave)
+
+            while self._entradas and (len(self._entradas) > self.max_entries or self._bytes > self.max_bytes):
+                self._quitar(next(iter(self._entradas)))
+                count_cache_event(self.nombre, "expulsiones")
+
+    def invalidate(self, *tablas: str) -> int:
+        """Elimina las entradas que leen alguna de las tablas. Retorna cuántas se eliminaron."""
+        with self._lock:
+            for tabla in tablas:
+                self._generaciones[tabla.lower()] += 1
+            claves = {c for tabla in tablas for c in self._por_tabla.get(tabla.lower(), ())}
+            for clave in claves:
+                self._quitar(clave)
+        return len(claves)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._limpiezas += 1
+            self._entradas.clear()
+            self._por_tabla.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entradas": len(self._entradas), "bytes": self._bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes, "ttl": self.ttl}
+
+# Única instancia del proceso: invalidate_tables() también la vacía
+result_cache = ResultCache("fetch_all")
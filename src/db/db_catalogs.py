@@ -1,15 +1,35 @@
+import hashlib
+import json
 import pandas as pd
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
 from src.db.db_connection import get_connection
+from src.db.db_utils import frame_from_cursor
 import streamlit as st
+from src.db.db_cache import cached_loader, cached_resource_loader
 
-@st.cache_data(ttl=3600)  # cachea por 1 hora (ajústalo según tu frecuencia de actualización)
+# Catálogos que usa el formulario de registro de lesiones
+CATALOGOS_FORMULARIO = (
+    "segmentos_corporales",
+    "zonas_segmento",
+    "zonas_anatomicas",
+    "mecanismos",
+    "tipo_lesion",
+    "tipo_especifico_lesion",
+    "mecanismo_tipo_lesion",
+    "tratamientos",
+    "lugares",
+)
+
+@cached_loader(CATALOGOS_FORMULARIO, ttl=3600)  # cachea por 1 hora; se invalida al escribir en los catálogos
 def load_catalog_list_db(table_name, as_df=False):
     """
     Carga un catálogo desde la base de datos y lo cachea.
     - table_name: nombre de la tabla a leer.
     - as_df: True para devolver DataFrame, False para lista de dicts.
     """
-    conn = get_connection()
+    conn = get_connection(readonly=True)
     if not conn:
         st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
         return pd.DataFrame() if as_df else []
@@ -17,10 +37,9 @@ def load_catalog_list_db(table_name, as_df=False):
     try:
         query = f"SELECT * FROM {table_name} ORDER BY id;"
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute(query)
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows)
+        df = frame_from_cursor(cursor)
         cursor.close()
 
         if as_df:
@@ -32,3 +51,166 @@ def load_catalog_list_db(table_name, as_df=False):
         return pd.DataFrame() if as_df else []
     finally:
         conn.close()
+
+@dataclass(frozen=True)
+class CatalogBundle:
+    """
+    Conjunto inmutable de catálogos cargados en una sola consulta.
+    - version: checksum del contenido (cambia si cambia cualquier catálogo).
+    - df(nombre): copia del catálogo como DataFrame (el original nunca se expone).
+    """
+    version: str
+    _tables: Mapping[str, pd.DataFrame] = field(repr=False)
+
+    def df(self, name: str) -> pd.DataFrame:
+        return self._tables[name].copy()
+
+    def names(self) -> tuple[str, ...]:
+        return tuple(self._tables.keys())
+
+@cached_resource_loader(CATALOGOS_FORMULARIO, ttl=3600)  # inmutable: se comparte la misma instancia entre sesiones
+def _fetch_catalog_bundle(tables: tuple[str, ...]) -> CatalogBundle:
+    """Ejecuta un lote 'SELECT * ...; SELECT * ...;' y lee cada resultado con nextset()."""
+    conn = get_connection(readonly=True)
+    if not conn:
+        raise ConnectionError("No se pudo establecer conexión con la base de datos.")
+
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(" ".join(f"SELECT * FROM {table} ORDER BY id;" for table in tables))
+
+            frames, checksum = {}, hashlib.sha256()
+            for table in tables:
+                rows = cursor.fetchall()
+                frames[table] = pd.DataFrame(rows, columns=list(cursor.column_names))
+                checksum.update(table.encode())
+                checksum.update(json.dumps(rows, default=str).encode())
+                cursor.nextset()
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+    return CatalogBundle(version=checksum.hexdigest()[:16], _tables=MappingProxyType(frames))
+
+def load_catalog_bundle_db(tables: tuple[str, ...] = CATALOGOS_FORMULARIO) -> CatalogBundle | None:
+    """
+    Carga todos los catálogos indicados en una conexión y un único round trip.
+    Retorna None (y muestra el error) si no se pudieron cargar.
+    """
+    try:
+        return _fetch_catalog_bundle(tuple(tables))
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar catálogos: {e}")
+        return None
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """
+    Índices precalculados para los selectores en cascada del formulario de lesiones.
+    Se construye una vez por versión del CatalogBundle; cada paso de la cascada es
+    una búsqueda en diccionario que devuelve una tupla de nombres ya ordenada.
+
+    - segmento → zonas → estructuras anatómicas
+    - mecanismo → tipo de lesión → tipo específico
+    """
+    version: str
+    _nombres: Mapping[str, tuple[str, ...]] = field(repr=False)
+    _ids: Mapping[str, Mapping[str, int]] = field(repr=False)
+    _zonas: Mapping[str, tuple[str, ...]] = field(repr=False)
+    _estructuras: Mapping[str, tuple[str, ...]] = field(repr=False)
+    _tipos: Mapping[str, tuple[str, ...]] = field(repr=False)
+    _subtipos: Mapping[tuple[str, str], tuple[str, ...]] = field(repr=False)
+
+    def nombres(self, catalogo: str) -> list[str]:
+        """Nombres del catálogo en su orden original (lista nueva, se puede modificar)."""
+        return list(self._nombres.get(catalogo, ()))
+
+    def id_de(self, catalogo: str, nombre: str) -> int | None:
+        return self._ids.get(catalogo, {}).get(nombre)
+
+    def zonas(self, segmento: str) -> tuple[str, ...]:
+        return self._zonas.get(segmento, ())
+
+    def estructuras(self, zona: str) -> tuple[str, ...]:
+        return self._estructuras.get(zona, ())
+
+    def tipos(self, mecanismo: str) -> tuple[str, ...]:
+        return self._tipos.get(mecanismo, ())
+
+    def subtipos(self, mecanismo: str, tipo_lesion: str) -> tuple[str, ...]:
+        return self._subtipos.get((mecanismo, tipo_lesion), ())
+
+def _agrupar(pares, orden: dict) -> MappingProxyType:
+    """Agrupa pares (clave, nombre) en tuplas sin duplicados ordenadas según `orden` (id)."""
+    grupos = {}
+    for clave, nombre in pares:
+        grupo = grupos.setdefault(clave, [])
+        if nombre not in grupo:
+            grupo.append(nombre)
+    return MappingProxyType({
+        clave: tuple(sorted(nombres, key=lambda n: orden.get(n, 0))) for clave, nombres in grupos.items()
+    })
+
+@st.cache_resource(max_entries=4)
+def _build_catalog_index(version: str, _bundle: CatalogBundle) -> CatalogIndex:
+    """Construye el índice de cascadas (solo se ejecuta cuando cambia la versión)."""
+    frames = {name: _bundle.df(name) for name in CATALOGOS_FORMULARIO}
+
+    nombres = {name: tuple(df["nombre"].tolist()) for name, df in frames.items() if "nombre" in df.columns}
+    ids = {
+        name: MappingProxyType(dict(zip(df["nombre"], df["id"].astype(int).tolist())))
+        for name, df in frames.items() if "nombre" in df.columns
+    }
+    por_id = {
+        name: dict(zip(df["id"].astype(int).tolist(), df["nombre"]))
+        for name, df in frames.items() if "nombre" in df.columns
+    }
+
+    # --- Segmento → zonas ---
+    segmentos = por_id["segmentos_corporales"]
+    zonas = frames["zonas_segmento"]
+    orden_zonas = dict(zip(zonas["nombre"], zonas["id"]))
+    idx_zonas = _agrupar(
+        ((segmentos.get(seg_id), nombre) for seg_id, nombre in zip(zonas["segmento_id"], zonas["nombre"])),
+        orden_zonas,
+    )
+
+    # --- Zona → estructuras (la zona se identifica por nombre, como en el formulario) ---
+    zonas_por_id = por_id["zonas_segmento"]
+    estructuras = frames["zonas_anatomicas"]
+    orden_estructuras = dict(zip(estructuras["nombre"], estructuras["id"]))
+    idx_estructuras = _agrupar(
+        ((zonas_por_id.get(zona_id), nombre) for zona_id, nombre in zip(estructuras["zona_id"], estructuras["nombre"])),
+        orden_estructuras,
+    )
+
+    # --- Mecanismo → tipo de lesión → tipo específico ---
+    mecanismos, tipos, subtipos = por_id["mecanismos"], por_id["tipo_lesion"], por_id["tipo_especifico_lesion"]
+    pares_tipos, pares_subtipos = [], []
+    for rel in frames["mecanismo_tipo_lesion"].itertuples(index=False):
+        mecanismo = mecanismos.get(rel.mecanismo_id)
+        tipo = tipos.get(rel.tipo_lesion_id)
+        if mecanismo is None or tipo is None:
+            continue
+        pares_tipos.append((mecanismo, tipo))
+        if pd.notna(rel.tipo_especifico_id) and int(rel.tipo_especifico_id) in subtipos:
+            pares_subtipos.append(((mecanismo, tipo), subtipos[int(rel.tipo_especifico_id)]))
+
+    idx_tipos = _agrupar(pares_tipos, ids["tipo_lesion"])
+    idx_subtipos = _agrupar(pares_subtipos, ids["tipo_especifico_lesion"])
+
+    return CatalogIndex(
+        version=version,
+        _nombres=MappingProxyType(nombres),
+        _ids=MappingProxyType(ids),
+        _zonas=idx_zonas,
+        _estructuras=idx_estructuras,
+        _tipos=idx_tipos,
+        _subtipos=idx_subtipos,
+    )
+
+def get_catalog_index(bundle: CatalogBundle) -> CatalogIndex:
+    """Índice de cascadas para la versión del bundle indicado."""
+    return _build_catalog_index(bundle.version, bundle)
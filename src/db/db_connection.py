@@ -1,32 +1,328 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import mysql.connector
 from mysql.connector import pooling
 
-@st.cache_resource
-def init_connection():
-    """Inicializa un pool de conexiones MySQL usando st.secrets."""
-    db_config = st.secrets["connections"]["mysql"]
+from src.db.db_metrics import InstrumentedCursor
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_TIMEOUT = 10  # segundos de espera máxima por una conexión libre
+DEFAULT_REPLICA_PIN_SECONDS = 10  # lecturas en el primario tras una escritura (read-your-writes)
+DEFAULT_POOL_HISTORY = 2000  # muestras (instante, conexiones en uso) para el panel de desarrollo
+
+# Clave de st.session_state: hasta cuándo (time.monotonic) las lecturas readonly de la sesión van al primario
+_PIN_KEY = "_db_primary_pin_hasta"
+
+class PoolTimeoutError(Exception):
+    """No se liberó ninguna conexión del pool dentro del tiempo de espera."""
+
+class PooledConnection:
+    """
+    Conexión prestada por ConnectionPool.
+    Delega todo en la conexión de mysql-connector; `close()` la devuelve al pool
+    (una sola vez) y libera su hueco en el semáforo.
+    Los cursores se instrumentan (ver src/db/db_metrics.py).
+    """
+
+    def __init__(self, cnx, pool: "ConnectionPool", wait_time: float):
+        self._cnx = cnx
+        self._pool = pool
+        self._closed = False
+        self.wait_time = wait_time
+        self._espera_pendiente = wait_time
+
+    def _tomar_espera(self) -> float:
+        # La espera por el pool se imputa a la primera consulta del préstamo
+        espera, self._espera_pendiente = self._espera_pendiente, 0.0
+        return espera
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._cnx.cursor(*args, **kwargs), self)
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def commit(self) -> None:
+        self._cnx.commit()
+        if not self._pool.readonly:
+            pin_primary(self._pool.pin_seconds)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._cnx.close()
+        finally:
+            self._pool._release()
+
+class ConnectionPool:
+    """
+    Pool de conexiones MySQL con:
+    - espera acotada cuando todas las conexiones están en uso (en lugar de fallar),
+    - pre-ping para reconectar conexiones caducadas antes de entregarlas,
+    - contadores de espera, agotamiento y conexiones en uso.
+    """
+
+    def __init__(self, pool: pooling.MySQLConnectionPool, size: int, timeout: float,
+                 readonly: bool = False, pin_seconds: float = DEFAULT_REPLICA_PIN_SECONDS):
+        self._pool = pool
+        self.size = size
+        self.timeout = timeout
+        self.readonly = readonly
+        self.pin_seconds = pin_seconds
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "in_use": 0,
+            "max_in_use": 0,
+            "exhausted": 0,
+            "timeouts": 0,
+            "reconnects": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+        }
+        # Una muestra en cada préstamo y devolución: la ocupación del pool es escalonada entre muestras
+        self._historial = deque(maxlen=DEFAULT_POOL_HISTORY)
+
+    def acquire(self, timeout: float = None) -> PooledConnection:
+        """
+        Obtiene una conexión esperando como máximo `timeout` segundos.
+        Lanza PoolTimeoutError si no se libera ninguna a tiempo.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        inicio = time.perf_counter()
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["exhausted"] += 1
+            if not self._slots.acquire(timeout=timeout):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise PoolTimeoutError(
+                    f"Pool agotado: ninguna conexión libre tras {timeout:.1f}s ({self.size} en uso)."
+                )
+
+        espera = time.perf_counter() - inicio
+        try:
+            cnx = self._pool.get_connection()
+            # Pre-ping: reconectar si el servidor cerró la conexión (wait_timeout, reinicio...)
+            if not cnx.is_connected():
+                cnx.reconnect(attempts=2, delay=0.2)
+                with self._lock:
+                    self._stats["reconnects"] += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats["acquired"] += 1
+            self._stats["in_use"] += 1
+            self._stats["max_in_use"] = max(self._stats["max_in_use"], self._stats["in_use"])
+            self._stats["wait_total"] += espera
+            self._stats["wait_max"] = max(self._stats["wait_max"], espera)
+            self._historial.append((time.time(), self._stats["in_use"]))
+
+        return PooledConnection(cnx, self, espera)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._stats["in_use"] -= 1
+            self._historial.append((time.time(), self._stats["in_use"]))
+        self._slots.release()
+
+    def stats(self) -> dict:
+        """Copia de los contadores del pool (tiempos en segundos)."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["size"] = self.size
+        stats["readonly"] = self.readonly
+        stats["wait_avg"] = stats["wait_total"] / stats["acquired"] if stats["acquired"] else 0.0
+        return stats
+
+    def history(self) -> list[tuple[float, int]]:
+        """Muestras (time.time(), conexiones en uso) de los últimos préstamos y devoluciones."""
+        with self._lock:
+            return list(self._historial)
+
+def _build_pool(db_config, pool_name: str, readonly: bool = False, base_config=None) -> ConnectionPool:
+    """Crea un ConnectionPool a partir de una sección de st.secrets["connections"]."""
+    base_config = base_config or {}
+
+    def opcion(clave, defecto=None):
+        return db_config.get(clave, base_config.get(clave, defecto))
+
+    # mysql-connector admite como máximo 32 conexiones por pool
+    pool_size = min(int(opcion("pool_size", DEFAULT_POOL_SIZE)), pooling.CNX_POOL_MAXSIZE)
+    pool_timeout = float(opcion("pool_timeout", DEFAULT_POOL_TIMEOUT))
+    pin_seconds = float(opcion("replica_pin_seconds", DEFAULT_REPLICA_PIN_SECONDS))
 
     pool = pooling.MySQLConnectionPool(
-        pool_name="main_pool",
-        pool_size=5,
+        pool_name=pool_name,
+        pool_size=pool_size,
         pool_reset_session=True,
-        host=db_config["host"],
-        user=db_config["username"],
-        password=db_config["password"],
-        database=db_config["database"],
-        port=db_config["port"],
+        host=opcion("host"),
+        user=opcion("username"),
+        password=opcion("password"),
+        database=opcion("database"),
+        port=opcion("port"),
         auth_plugin="mysql_native_password"
     )
-    return pool
+    return ConnectionPool(pool, pool_size, pool_timeout, readonly=readonly, pin_seconds=pin_seconds)
+
+@st.cache_resource
+def init_connection() -> ConnectionPool:
+    """
+    Inicializa un pool de conexiones MySQL usando st.secrets.
+    Tamaño y espera máxima configurables en [connections.mysql]: pool_size, pool_timeout.
+    """
+    return _build_pool(st.secrets["connections"]["mysql"], "main_pool")
+
+@st.cache_resource
+def init_replica_connection() -> ConnectionPool | None:
+    """
+    Pool de la réplica de solo lectura, si existe [connections.mysql_replica] en st.secrets.
+    Las claves que no se indiquen (database, username, password, port...) se toman de [connections.mysql].
+    Retorna None si no hay réplica configurada.
+    """
+    connections = st.secrets.get("connections", {})
+    if "mysql_replica" not in connections:
+        return None
+    return _build_pool(connections["mysql_replica"], "replica_pool", readonly=True,
+                       base_config=connections["mysql"])
+
+def get_backend() -> str:
+    """
+    Motor de base de datos: "mysql" (por defecto) o "sqlite" (base local, ver src/db/db_local.py).
+    Se elige con la variable de entorno DB_BACKEND o con [connections.local] backend en st.secrets.
+    """
+    backend = os.environ.get("DB_BACKEND")
+    if not backend:
+        try:
+            backend = st.secrets.get("connections", {}).get("local", {}).get("backend")
+        except FileNotFoundError:
+            backend = None
+    return (backend or "mysql").lower()
+
+def _primary_pool() -> ConnectionPool:
+    if get_backend() == "sqlite":
+        # Import diferido: db_local importa ConnectionPool de este módulo
+        from src.db.db_local import init_local_connection
+        return init_local_connection()
+    return init_connection()
+
+def _sesion_actual():
+    """st.session_state de la sesión que ejecuta el código, o None fuera de un script (hilos de fondo, CLI)."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state
 
-def get_connection():
-    """Obtiene una conexión activa desde el pool."""
-    pool = init_connection()
+def pin_primary(seconds: float = DEFAULT_REPLICA_PIN_SECONDS) -> None:
+    """
+    Envía las lecturas readonly de la sesión que escribió al primario durante `seconds`
+    (se llama al confirmar una escritura). Es por sesión: las demás siguen en la réplica, y su
+    rerun tras la escritura es el que vuelve a llenar las cachés invalidadas desde el primario.
+    Fuera de una sesión (purga en segundo plano, importación) no fija nada.
+    """
+    sesion = _sesion_actual()
+    if sesion is None:
+        return
+    sesion[_PIN_KEY] = max(sesion.get(_PIN_KEY, 0.0), time.monotonic() + seconds)
+
+def is_primary_pinned() -> bool:
+    sesion = _sesion_actual()
+    return sesion is not None and time.monotonic() < sesion.get(_PIN_KEY, 0.0)
+
+def _acquire(timeout: float = None, readonly: bool = False) -> PooledConnection:
+    """
+    Enruta la petición: lecturas readonly a la réplica (si hay y no está fijado el primario),
+    todo lo demás al primario. Si la réplica no responde se usa el primario.
+    """
+    if readonly and not is_primary_pinned() and get_backend() == "mysql":
+        try:
+            # Crear el pool abre conexiones: falla igual que acquire si la réplica no responde
+            replica = init_replica_connection()
+            if replica is not None:
+                return replica.acquire(timeout)
+        except (PoolTimeoutError, mysql.connector.Error) as e:
+            print(f"Réplica no disponible, se usa el primario: {e}")
+    return _primary_pool().acquire(timeout)
+
+def get_connection(timeout: float = None, readonly: bool = False):
+    """
+    Obtiene una conexión activa desde el pool (esperando si está agotado).
+    readonly=True la toma de la réplica si está configurada (solo para consultas SELECT).
+    Retorna None si no se pudo obtener; quien la recibe debe llamar a close().
+    """
     try:
-        connection = pool.get_connection()
-        if connection.is_connected():
-            return connection
+        return _acquire(timeout, readonly)
+    except PoolTimeoutError as e:
+        st.error(f":material/warning: {e}")
+        return None
     except mysql.connector.Error as e:
         st.error(f":material/warning: Error al conectar con MySQL: {e}")
         return None
+    except FileNotFoundError as e:
+        # Base local (DB_BACKEND=sqlite) sin crear
+        st.error(f":material/warning: {e}")
+        return None
+
+@contextmanager
+def db_connection(timeout: float = None, readonly: bool = False):
+    """
+    Context manager que siempre devuelve la conexión al pool:
+
+        with db_connection() as conn:
+            ...
+
+    readonly=True enruta a la réplica (ver get_connection).
+    Lanza PoolTimeoutError o mysql.connector.Error si no hay conexión disponible.
+    """
+    conn = _acquire(timeout, readonly)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+@contextmanager
+def db_cursor(dictionary: bool = False, timeout: float = None, readonly: bool = False):
+    """
+    Context manager que entrega (conexión, cursor) y cierra ambos al salir,
+    también cuando ocurre una excepción. El commit/rollback queda a cargo de quien lo usa.
+    """
+    with db_connection(timeout, readonly) as conn:
+        cursor = conn.cursor(dictionary=dictionary)
+        try:
+            yield conn, cursor
+        finally:
+            cursor.close()
+
+def get_pool_stats(readonly: bool = False) -> dict:
+    """
+    Contadores del pool principal (ver ConnectionPool.stats).
+    readonly=True devuelve los de la réplica ({} si no hay réplica configurada).
+    """
+    if readonly:
+        replica = init_replica_connection() if get_backend() == "mysql" else None
+        return replica.stats() if replica is not None else {}
+    return _primary_pool().stats()
+
+def get_pool_history(readonly: bool = False) -> list[tuple[float, int]]:
+    """Ocupación del pool en el tiempo (ver ConnectionPool.history); readonly=True para la réplica."""
+    if readonly:
+        replica = init_replica_connection() if get_backend() == "mysql" else None
+        return replica.history() if replica is not None else []
+    return _primary_pool().history()
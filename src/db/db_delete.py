@@ -0,0 +1,149 @@
+import threading
+
+import streamlit as st
+
+from src.db.db_connection import db_cursor
+from src.db.db_cache import invalidate_tables
+from src.db.db_summary import TABLAS_RESUMEN, summary_rows, apply_summary_delta
+
+DEFAULT_DELETE_CHUNK_SIZE = 500
+
+# Purga en segundo plano: un solo hilo a la vez; `pendiente` indica que hubo
+# borrados lógicos nuevos mientras el hilo trabajaba.
+_purga = {"hilo": None, "pendiente": threading.Event()}
+_purga_lock = threading.Lock()
+
+def _bloques(ids: list, chunk_size: int):
+    for inicio in range(0, len(ids), chunk_size):
+        yield ids[inicio:inicio + chunk_size]
+
+def _borrar_bloque(cursor, bloque: list) -> int:
+    """Borra físicamente un bloque de lesiones y sus sesiones de evolución. Retorna las lesiones borradas."""
+    placeholders = ", ".join(["%s"] * len(bloque))
+    cursor.execute(f"DELETE FROM lesion_evolucion WHERE id_lesion IN ({placeholders})", tuple(bloque))
+    cursor.execute(f"DELETE FROM lesiones WHERE id_lesion IN ({placeholders})", tuple(bloque))
+    return cursor.rowcount
+
+def delete_lesiones(ids: list[str], soft: bool = True,
+                    chunk_size: int = DEFAULT_DELETE_CHUNK_SIZE) -> tuple[bool, str, list[int]]:
+    """
+    Elimina lesiones por id_lesion en bloques de `chunk_size` ids. Cada bloque es una
+    transacción corta (borrado, lápidas y resumen): los bloqueos de fila se liberan en cada
+    commit en lugar de mantenerse durante toda la selección.
+
+    - soft=True: marca `deleted_at` (las lecturas dejan de verlas al instante) y programa
+      la purga física en segundo plano.
+    - soft=False: borra las filas y sus sesiones de evolución en el momento.
+
+    En ambos casos se escriben lápidas en 'lesiones_eliminadas' para el store de lesiones
+    y se restan del resumen de la página de inicio (resumen_lesiones).
+    Si un bloque falla se deshace solo ese bloque; los anteriores quedan confirmados
+    y el mensaje lo indica.
+
+    Retorna:
+        (bool, str, list[int]): (éxito, mensaje, filas afectadas por bloque confirmado)
+    """
+    ids = list(dict.fromkeys(i for i in ids if i))
+    if not ids:
+        return False, "No se proporcionaron IDs de lesiones.", []
+
+    por_bloque = []
+    try:
+        with db_cursor() as (conn, cursor):
+            for bloque in _bloques(ids, chunk_size):
+                try:
+                    # Lesiones a restar del resumen (antes de borrar: luego las filas no existen)
+                    antes = summary_rows(cursor, bloque)
+                    if soft:
+                        placeholders = ", ".join(["%s"] * len(bloque))
+                        cursor.execute(
+                            f"UPDATE lesiones SET deleted_at = CURRENT_TIMESTAMP "
+                            f"WHERE id_lesion IN ({placeholders}) AND deleted_at IS NULL",
+                            tuple(bloque),
+                        )
+                        afectadas = cursor.rowcount
+                    else:
+                        afectadas = _borrar_bloque(cursor, bloque)
+
+                    # Lápidas para que el store de lesiones retire las filas en su próxima sincronización
+                    cursor.executemany(
+                        "INSERT INTO lesiones_eliminadas (id_lesion) VALUES (%s)",
+                        [(id_lesion,) for id_lesion in bloque]
+                    )
+                    apply_summary_delta(cursor, restar=antes)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                por_bloque.append(afectadas)
+
+        total = sum(por_bloque)
+        detalle = f" en {len(por_bloque)} bloque(s)" if len(por_bloque) > 1 else ""
+        return True, f"Se eliminaron {total} registro(s) correctamente{detalle}.", por_bloque
+
+    except Exception as e:
+        confirmadas = f" ({sum(por_bloque)} ya eliminada(s) en {len(por_bloque)} bloque(s))" if por_bloque else ""
+        print(f"Error al eliminar lesiones: {e}")
+        st.error(f":material/warning: Error al eliminar lesiones{confirmadas}: {e}")
+        return False, f":material/warning: Error al eliminar lesiones{confirmadas}: {e}", por_bloque
+
+    finally:
+        # Los bloques confirmados ya son visibles aunque uno posterior haya fallado
+        if por_bloque:
+            invalidate_tables("lesiones", "lesiones_eliminadas", *TABLAS_RESUMEN,
+                              *([] if soft else ["lesion_evolucion"]))
+            if soft:
+                schedule_purge()
+
+def purge_deleted_lesiones(chunk_size: int = DEFAULT_DELETE_CHUNK_SIZE) -> int:
+    """
+    Borra físicamente las lesiones marcadas con `deleted_at` (y sus sesiones de evolución).
+    Cada bloque es una transacción corta, así que no bloquea la tabla durante toda la purga.
+
+    Retorna:
+        int: lesiones borradas.
+    """
+    total = 0
+    with db_cursor() as (conn, cursor):
+        while True:
+            cursor.execute(
+                "SELECT id_lesion FROM lesiones WHERE deleted_at IS NOT NULL ORDER BY deleted_at LIMIT %s",
+                (chunk_size,),
+            )
+            bloque = [row[0] for row in cursor.fetchall()]
+            if not bloque:
+                break
+            try:
+                total += _borrar_bloque(cursor, bloque)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    if total:
+        invalidate_tables("lesiones", "lesion_evolucion")
+    return total
+
+def _purgar_en_segundo_plano() -> None:
+    while _purga["pendiente"].is_set():
+        _purga["pendiente"].clear()
+        try:
+            purge_deleted_lesiones()
+        except Exception as e:
+            # Las filas siguen marcadas: la próxima purga las recoge
+            print(f"Error al purgar lesiones eliminadas: {e}")
+            break
+
+    with _purga_lock:
+        _purga["hilo"] = None
+        relanzar = _purga["pendiente"].is_set()
+    if relanzar:
+        schedule_purge()
+
+def schedule_purge() -> None:
+    """Programa la purga física en un hilo de fondo (si ya hay uno en marcha, lo reutiliza)."""
+    _purga["pendiente"].set()
+    with _purga_lock:
+        if _purga["hilo"] is not None:
+            return
+        _purga["hilo"] = threading.Thread(target=_purgar_en_segundo_plano, name="purga_lesiones", daemon=True)
+        _purga["hilo"].start()
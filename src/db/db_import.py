@@ -0,0 +1,288 @@
+"""
+Importación masiva de lesiones (histórico de temporadas anteriores).
+
+Uso desde la línea de comandos (lee [connections.mysql] de .streamlit/secrets.toml):
+
+    python -m src.db.db_import lesiones.jsonl --chunk 1000 --usuario admin
+"""
+import argparse
+import datetime
+import json
+import sys
+import time
+from collections import defaultdict
+from itertools import islice
+
+from src.db.db_connection import db_cursor
+from src.db.db_cache import invalidate_tables
+from src.db.db_catalogs import load_catalog_bundle_db, get_catalog_index, CatalogIndex
+from src.db.db_records import COLUMNAS_VALIDAS_LESION, reservar_numero_lesion
+from src.db.db_store import reset_lesiones_stores
+from src.db.db_summary import rebuild_summary_db
+from src.util.util import generar_id_lesion, iter_jsonl_records
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Campo con nombre de catálogo → (catálogo, columna id en lesiones)
+CAMPOS_CATALOGO = {
+    "lugar": ("lugares", "lugar_id"),
+    "segmento": ("segmentos_corporales", "segmento_id"),
+    "zona_cuerpo": ("zonas_segmento", "zona_cuerpo_id"),
+    "zona_especifica": ("zonas_anatomicas", "zona_especifica_id"),
+    "tipo_lesion": ("tipo_lesion", "tipo_lesion_id"),
+    "tipo_especifico": ("tipo_especifico_lesion", "tipo_especifico_id"),
+    "mecanismo": ("mecanismos", "mecanismo_id"),
+}
+
+CAMPOS_OBLIGATORIOS = ("id_jugadora", "fecha_lesion")
+
+# Campos que se aceptan aunque no sean columnas de 'lesiones'
+CAMPOS_AUXILIARES = {"nombre", "evolucion", "sesiones"}
+
+def preparar_fila(record: dict, indice: CatalogIndex, estricto: bool = False,
+                  usuario: str | None = None) -> tuple[dict, list[dict]]:
+    """
+    Valida un registro y lo convierte en (fila para 'lesiones', sesiones de evolución).
+
+    - Resuelve nombres de catálogo ("lugar": "ENTRENAMIENTO") a su id con el CatalogIndex.
+    - Descarta columnas que no están en COLUMNAS_VALIDAS_LESION (o falla si estricto=True).
+    - Serializa tipo_tratamiento y separa 'evolucion' (lista o JSON) en sesiones.
+
+    Lanza ValueError con el motivo si el registro no es válido.
+    """
+    fila = {}
+    desconocidas = []
+
+    for campo, valor in record.items():
+        if campo in CAMPOS_CATALOGO:
+            if valor in (None, ""):
+                continue
+            catalogo, columna_id = CAMPOS_CATALOGO[campo]
+            id_catalogo = indice.id_de(catalogo, valor)
+            if id_catalogo is None:
+                raise ValueError(f"'{valor}' no existe en el catálogo {catalogo}")
+            fila.setdefault(columna_id, id_catalogo)
+        elif campo in COLUMNAS_VALIDAS_LESION or campo in CAMPOS_AUXILIARES:
+            fila[campo] = valor
+        else:
+            desconocidas.append(campo)
+
+    if estricto and desconocidas:
+        raise ValueError(f"Columnas no válidas: {', '.join(sorted(desconocidas))}")
+
+    faltantes = [c for c in CAMPOS_OBLIGATORIOS if not fila.get(c)]
+    if faltantes:
+        raise ValueError(f"Faltan campos obligatorios: {', '.join(faltantes)}")
+
+    if isinstance(fila.get("tipo_tratamiento"), (list, dict)):
+        fila["tipo_tratamiento"] = json.dumps(fila["tipo_tratamiento"], ensure_ascii=False)
+
+    evolucion = fila.pop("evolucion", None) or []
+    if isinstance(evolucion, str):
+        try:
+            evolucion = json.loads(evolucion)
+        except json.JSONDecodeError:
+            raise ValueError("El campo 'evolucion' no es un JSON válido")
+    if not isinstance(evolucion, list):
+        raise ValueError("El campo 'evolucion' debe ser una lista de sesiones")
+    fila.pop("sesiones", None)
+
+    if usuario and not fila.get("usuario"):
+        fila["usuario"] = usuario
+    if not fila.get("fecha_hora_registro"):
+        fila["fecha_hora_registro"] = datetime.datetime.now().isoformat()
+
+    return fila, evolucion
+
+def _asignar_ids(cursor, filas: list[tuple[dict, list]], nombres: dict) -> None:
+    """Reserva un bloque de la secuencia por jugadora (un upsert por jugadora, no por fila)."""
+    pendientes = defaultdict(list)
+    for fila, _ in filas:
+        if not fila.get("id_lesion"):
+            pendientes[fila["id_jugadora"]].append(fila)
+
+    for id_jugadora, filas_jugadora in pendientes.items():
+        ultimo = reservar_numero_lesion(cursor, id_jugadora, len(filas_jugadora))
+        primero = ultimo - len(filas_jugadora) + 1
+        for numero, fila in enumerate(filas_jugadora, start=primero):
+            nombre = fila.get("nombre") or nombres.get(id_jugadora) or str(id_jugadora)
+            fecha = str(fila["fecha_lesion"])[:10].replace("-", "")
+            fila["id_lesion"] = generar_id_lesion(nombre, id_jugadora, fecha=fecha, numero=numero)
+            fila["_id_generado"] = True
+
+def _insertar_bloque(cursor, filas: list[tuple[dict, list]], nombres: dict) -> None:
+    """
+    Inserta un bloque de filas con executemany (mysql-connector lo reescribe como un
+    INSERT multi-fila). Las filas se agrupan por conjunto de columnas para no pisar
+    los DEFAULT de la tabla con NULL.
+    """
+    _asignar_ids(cursor, filas, nombres)
+
+    grupos = defaultdict(list)
+    for fila, evolucion in filas:
+        fila = {k: v for k, v in fila.items() if k in COLUMNAS_VALIDAS_LESION}
+        fila["sesiones"] = len(evolucion)
+        grupos[tuple(sorted(fila))].append(fila)
+
+    for columnas, filas_grupo in grupos.items():
+        # updated_at explícito: el store de la app recoge las filas aunque la fecha de registro sea antigua
+        query = f"""
+        INSERT INTO lesiones ({', '.join(columnas)}, updated_at)
+        VALUES ({', '.join(['%s'] * len(columnas))}, CURRENT_TIMESTAMP)
+        """
+        cursor.executemany(query, [tuple(f[c] for c in columnas) for f in filas_grupo])
+
+    sesiones = [
+        (
+            fila["id_lesion"],
+            sesion.get("fecha_control"),
+            json.dumps(sesion.get("tratamiento_aplicado"), ensure_ascii=False)
+            if isinstance(sesion.get("tratamiento_aplicado"), (list, dict)) else sesion.get("tratamiento_aplicado"),
+            sesion.get("personal_seguimiento"),
+            sesion.get("observaciones"),
+            sesion.get("fecha_hora_registro") or fila["fecha_hora_registro"],
+            sesion.get("usuario"),
+        )
+        for fila, evolucion in filas for sesion in evolucion if isinstance(sesion, dict)
+    ]
+    if sesiones:
+        cursor.executemany("""
+        INSERT INTO lesion_evolucion
+            (id_lesion, fecha_control, tratamiento_aplicado, personal_seguimiento,
+             observaciones, fecha_hora_registro, usuario)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, sesiones)
+
+def _nombres_jugadoras(cursor) -> dict:
+    cursor.execute("SELECT identificacion, nombre, apellido FROM futbolistas;")
+    return {
+        identificacion: f"{nombre or ''} {apellido or ''}".strip()
+        for identificacion, nombre, apellido in cursor.fetchall()
+    }
+
+def import_lesiones(records, chunk_size: int = DEFAULT_CHUNK_SIZE, estricto: bool = False,
+                    usuario: str | None = None, on_progress=None) -> dict:
+    """
+    Importa un iterable de registros de lesión (dicts) en bloques transaccionales.
+
+    Cada registro puede traer ids de catálogo (lugar_id, ...) o nombres (lugar, ...),
+    'id_lesion' (si falta se genera con la secuencia por jugadora) y 'evolucion'
+    (lista de sesiones, que se guardan en lesion_evolucion).
+
+    Cada bloque se confirma con un commit. Si un bloque falla, se deshace y se reintenta
+    fila por fila para aislar los registros con error sin perder el resto.
+
+    Parámetros:
+        records (Iterable[dict] | Iterable[tuple[int, dict]]): registros; si son tuplas,
+            el primer elemento se usa como número de fila en los errores (p. ej. línea del JSONL).
+        chunk_size (int): filas por transacción.
+        estricto (bool): rechazar registros con columnas desconocidas.
+        usuario (str): valor de 'usuario' para los registros que no lo traen.
+        on_progress (callable): on_progress(procesadas, insertadas, errores) tras cada bloque.
+
+    Retorna:
+        dict: {"procesadas", "insertadas", "errores": [(fila, mensaje)], "avisos": [mensaje], "segundos"}
+        "avisos" recoge los problemas posteriores a la carga que no afectan a las filas
+        insertadas (p. ej. el resumen de la página de inicio quedó sin reconstruir).
+    """
+    bundle = load_catalog_bundle_db()
+    if bundle is None:
+        raise RuntimeError("No se pudieron cargar los catálogos.")
+    indice = get_catalog_index(bundle)
+
+    resultado = {"procesadas": 0, "insertadas": 0, "errores": [], "avisos": [], "segundos": 0.0}
+    inicio = time.perf_counter()
+
+    def numerar(iterable):
+        for n, item in enumerate(iterable, start=1):
+            yield item if isinstance(item, tuple) else (n, item)
+
+    with db_cursor() as (conn, cursor):
+        nombres = _nombres_jugadoras(cursor)
+        conn.commit()
+
+        registros = numerar(records)
+        while True:
+            bloque = list(islice(registros, chunk_size))
+            if not bloque:
+                break
+
+            preparadas = []
+            for n, record in bloque:
+                try:
+                    preparadas.append((n, preparar_fila(record, indice, estricto, usuario)))
+                except (ValueError, TypeError, AttributeError) as e:
+                    resultado["errores"].append((n, str(e)))
+
+            if preparadas:
+                try:
+                    _insertar_bloque(cursor, [fila for _, fila in preparadas], nombres)
+                    conn.commit()
+                    resultado["insertadas"] += len(preparadas)
+                except Exception:
+                    conn.rollback()
+                    # Reintento fila por fila; el rollback también deshizo la secuencia,
+                    # así que los ids generados se vuelven a reservar
+                    for n, (fila, evolucion) in preparadas:
+                        if fila.pop("_id_generado", False):
+                            fila.pop("id_lesion", None)
+                        try:
+                            _insertar_bloque(cursor, [(fila, evolucion)], nombres)
+                            conn.commit()
+                            resultado["insertadas"] += 1
+                        except Exception as e:
+                            conn.rollback()
+                            resultado["errores"].append((n, str(e)))
+
+            resultado["procesadas"] += len(bloque)
+            if on_progress:
+                on_progress(resultado["procesadas"], resultado["insertadas"], len(resultado["errores"]))
+
+    resultado["segundos"] = time.perf_counter() - inicio
+
+    if resultado["insertadas"]:
+        # Resumen de la página de inicio: tras una carga masiva es más barato reconstruirlo
+        try:
+            rebuild_summary_db()
+        except Exception as e:
+            resultado["avisos"].append(
+                f"No se pudo reconstruir resumen_lesiones ({e}); queda desactualizado hasta "
+                "ejecutar `python -m src.db.db_summary rebuild`."
+            )
+        invalidate_tables("lesiones", "lesiones_secuencia", "lesion_evolucion")
+        # Carga completa en la próxima lectura de este proceso (todos los alcances)
+        reset_lesiones_stores()
+
+    return resultado
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importación masiva de lesiones desde un archivo JSONL.")
+    parser.add_argument("archivo", help="Ruta del archivo JSONL (un registro de lesión por línea).")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK_SIZE, help="Filas por transacción.")
+    parser.add_argument("--estricto", action="store_true", help="Rechazar registros con columnas desconocidas.")
+    parser.add_argument("--usuario", default=None, help="Usuario para los registros que no lo indican.")
+    args = parser.parse_args(argv)
+
+    errores_lectura = []
+
+    registros = iter_jsonl_records(args.archivo, on_error=lambda n, mensaje: errores_lectura.append((n, mensaje)))
+
+    def progreso(procesadas, insertadas, errores):
+        print(f"\r{procesadas} procesadas · {insertadas} insertadas · {errores} errores", end="", flush=True)
+
+    resultado = import_lesiones(registros, args.chunk, args.estricto, args.usuario, progreso)
+    print()
+
+    errores = sorted(errores_lectura + resultado["errores"])
+    for n, mensaje in errores:
+        print(f"Línea {n}: {mensaje}", file=sys.stderr)
+    for aviso in resultado["avisos"]:
+        print(f"Aviso: {aviso}", file=sys.stderr)
+
+    velocidad = resultado["insertadas"] / resultado["segundos"] if resultado["segundos"] else 0
+    print(f"Insertadas {resultado['insertadas']} lesiones en {resultado['segundos']:.1f}s "
+          f"({velocidad:.0f} filas/s), {len(errores)} con error.")
+    return 1 if errores else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
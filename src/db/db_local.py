@@ -0,0 +1,499 @@
+"""
+Base de datos local (SQLite) para desarrollo y pruebas de rendimiento sin MySQL.
+
+Se activa con DB_BACKEND=sqlite (variable de entorno) o en .streamlit/secrets.toml:
+
+    [connections.local]
+    backend = "sqlite"
+    path = "data/local/lesiones.db"
+
+Los módulos de src/db no cambian: get_connection()/db_cursor() entregan una conexión
+SQLite con la misma interfaz que mysql-connector (placeholders %s, cursor(dictionary=True),
+lastrowid, nextset...) y las pocas construcciones propias de MySQL se traducen al vuelo.
+
+Crear la base con los catálogos de data/catalogos y un conjunto de datos generado:
+
+    python -m src.db.db_local crear data/local/lesiones.db --jugadoras 25 --lesiones 5000 --semilla 42
+"""
+import argparse
+import datetime
+import functools
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+import bcrypt
+import numpy as np
+import streamlit as st
+
+from src.db.db_connection import ConnectionPool, DEFAULT_POOL_SIZE, DEFAULT_POOL_TIMEOUT
+from src.db.db_summary import rebuild_summary
+from src.util.io_files import load_catalog_list
+from src.util.util import generar_id_lesion
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_LOCAL_PATH = BASE_DIR / "data" / "local" / "lesiones.db"
+ESQUEMA_LOCAL = BASE_DIR / "data" / "local" / "esquema_sqlite.sql"
+
+# Catálogos de la base que se cargan desde data/catalogos/<tabla>.json (en orden de dependencias)
+CATALOGOS_SEMILLA = (
+    "segmentos_corporales", "zonas_segmento", "zonas_anatomicas", "mecanismos", "tipo_lesion",
+    "tipo_especifico_lesion", "mecanismo_tipo_lesion", "tratamientos", "lugares", "plantel",
+)
+
+LOCAL_PASSWORD = "local"
+
+# ==========================================================
+# 🔁 Traducción de SQL MySQL → SQLite
+# ==========================================================
+
+_AHORA_LOCAL = "datetime('now', 'localtime')"
+
+_TRADUCCIONES = (
+    (re.compile(r"%\((\w+)\)s"), r":\1"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), _AHORA_LOCAL),
+    (re.compile(r"\bCURRENT_TIMESTAMP\b", re.IGNORECASE), _AHORA_LOCAL),
+    (re.compile(r"\bON DUPLICATE KEY UPDATE\b", re.IGNORECASE), "ON CONFLICT DO UPDATE SET"),
+    # Dentro del upsert: VALUES(col) es la fila propuesta; GREATEST es el MAX escalar
+    (re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE), r"excluded.\1"),
+    (re.compile(r"\bGREATEST\(", re.IGNORECASE), "MAX("),
+    # SQLite no tiene bloqueos de fila (un solo escritor a la vez)
+    (re.compile(r"\s+FOR UPDATE(\s+OF\s+\w+)?\b", re.IGNORECASE), ""),
+    # SQLite < 3.44 no admite ORDER BY dentro del agregado
+    (re.compile(r"GROUP_CONCAT\((.+?)\s+ORDER BY\s+.+?\s+SEPARATOR\s+('[^']*')\)", re.IGNORECASE | re.DOTALL),
+     r"GROUP_CONCAT(\1, \2)"),
+)
+
+@functools.lru_cache(maxsize=512)
+def traducir_sql(sql: str) -> str:
+    """Traduce una sentencia escrita para mysql-connector al dialecto de SQLite."""
+    for patron, reemplazo in _TRADUCCIONES:
+        sql = patron.sub(reemplazo, sql)
+    return sql
+
+def _dividir(sql: str) -> list[str]:
+    """Separa un lote 'SELECT ...; SELECT ...;' (las sentencias de la app no llevan ';' en literales)."""
+    return [s.strip() for s in sql.split(";") if s.strip()]
+
+# ==========================================================
+# 🕒 Tipos: fechas como texto ISO, tipos de numpy como nativos
+# ==========================================================
+
+sqlite3.register_adapter(datetime.datetime, lambda v: v.isoformat(" "))
+sqlite3.register_adapter(datetime.date, lambda v: v.isoformat())
+for _tipo in (np.int64, np.int32, np.int16, np.int8):
+    sqlite3.register_adapter(_tipo, int)
+sqlite3.register_adapter(np.float64, float)
+sqlite3.register_adapter(np.float32, float)
+sqlite3.register_adapter(np.bool_, bool)
+
+_ISO_FECHA = re.compile(r"\d{4}-\d{2}-\d{2}")
+_ISO_FECHA_HORA = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d{1,6})?")
+
+def _parametro(valor):
+    # isoformat() con 'T' (fecha_hora_registro) se guarda como MySQL: con espacio
+    if isinstance(valor, str) and len(valor) >= 19 and valor[10:11] == "T" and _ISO_FECHA_HORA.fullmatch(valor):
+        return valor.replace("T", " ", 1)
+    return valor
+
+def _parametros(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return {k: _parametro(v) for k, v in params.items()}
+    return tuple(_parametro(v) for v in params)
+
+def _valor(valor):
+    """Devuelve DATE/DATETIME como date/datetime, igual que mysql-connector."""
+    if isinstance(valor, str) and len(valor) in (10, 19, 26) and valor[4:5] == "-":
+        try:
+            if len(valor) == 10 and _ISO_FECHA.fullmatch(valor):
+                return datetime.date.fromisoformat(valor)
+            if _ISO_FECHA_HORA.fullmatch(valor):
+                return datetime.datetime.fromisoformat(valor)
+        except ValueError:
+            pass
+    return valor
+
+# ==========================================================
+# 🔌 Conexión y cursor compatibles con mysql-connector
+# ==========================================================
+
+class SqliteCursor:
+    """Cursor con la interfaz que usa la app de mysql-connector (tuplas o dicts)."""
+
+    def __init__(self, conexion: "SqliteConnection", dictionary: bool = False):
+        self._conexion = conexion
+        self._cursor = conexion._cnx.cursor()
+        self._dictionary = dictionary
+        self._resultados = []
+        self._posicion = 0
+        self.rowcount = -1
+        self._lastrowid = None
+
+    # --- ejecución ---
+    def execute(self, sql: str, params=None) -> None:
+        sentencias = _dividir(sql)
+        self._resultados, self._posicion = [], 0
+        self._conexion._last_insert_id = None
+
+        for sentencia in sentencias:
+            self._cursor.execute(traducir_sql(sentencia), _parametros(params) if len(sentencias) == 1 else ())
+            filas = self._cursor.fetchall() if self._cursor.description else None
+            self._resultados.append((self._cursor.description, filas))
+
+        self.rowcount = self._cursor.rowcount
+        # LAST_INSERT_ID(expr) fija el valor que devuelve lastrowid, como en MySQL
+        self._lastrowid = self._conexion._last_insert_id
+        if self._lastrowid is None:
+            self._lastrowid = self._cursor.lastrowid
+
+    def executemany(self, sql: str, seq_params) -> None:
+        self._resultados, self._posicion = [], 0
+        self._cursor.executemany(traducir_sql(sql), [_parametros(p) for p in seq_params])
+        self.rowcount = self._cursor.rowcount
+        self._lastrowid = self._cursor.lastrowid
+
+    # --- resultados ---
+    def _actual(self):
+        if self._posicion < len(self._resultados):
+            return self._resultados[self._posicion]
+        return None, None
+
+    @property
+    def description(self):
+        return self._actual()[0]
+
+    @property
+    def column_names(self) -> tuple:
+        description = self.description
+        return tuple(d[0] for d in description) if description else ()
+
+    @property
+    def with_rows(self) -> bool:
+        return self.description is not None
+
+    @property
+    def lastrowid(self):
+        return self._lastrowid
+
+    def _convertir(self, fila):
+        fila = tuple(_valor(v) for v in fila)
+        if self._dictionary:
+            return dict(zip(self.column_names, fila))
+        return fila
+
+    def fetchall(self) -> list:
+        descripcion, filas = self._actual()
+        if filas is None:
+            return []
+        resto = filas
+        self._resultados[self._posicion] = (descripcion, [])
+        return [self._convertir(f) for f in resto]
+
+    def fetchone(self):
+        descripcion, filas = self._actual()
+        if not filas:
+            return None
+        self._resultados[self._posicion] = (descripcion, filas[1:])
+        return self._convertir(filas[0])
+
+    def fetchmany(self, size: int = 1) -> list:
+        descripcion, filas = self._actual()
+        if not filas:
+            return []
+        self._resultados[self._posicion] = (descripcion, filas[size:])
+        return [self._convertir(f) for f in filas[:size]]
+
+    def nextset(self):
+        self._posicion += 1
+        return True if self._posicion < len(self._resultados) else None
+
+    def close(self) -> None:
+        self._cursor.close()
+
+class SqliteConnection:
+    """Conexión SQLite con los métodos de MySQLConnection que usa la app."""
+
+    def __init__(self, path: str):
+        self._cnx = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._cnx.execute("PRAGMA foreign_keys = ON")
+        self._cnx.execute("PRAGMA busy_timeout = 30000")
+        self._last_insert_id = None
+        self._cnx.create_function("LAST_INSERT_ID", 1, self._set_last_insert_id)
+
+    def _set_last_insert_id(self, valor):
+        self._last_insert_id = valor
+        return valor
+
+    def cursor(self, dictionary: bool = False, **kwargs) -> SqliteCursor:
+        return SqliteCursor(self, dictionary=dictionary)
+
+    def commit(self) -> None:
+        self._cnx.commit()
+
+    def rollback(self) -> None:
+        self._cnx.rollback()
+
+    def close(self) -> None:
+        self._cnx.close()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def reconnect(self, attempts: int = 1, delay: float = 0) -> None:
+        pass
+
+class LocalPool:
+    """Sustituto de MySQLConnectionPool: una conexión SQLite nueva por préstamo (abrirla es barato)."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+
+    def get_connection(self) -> SqliteConnection:
+        if not Path(self.path).exists():
+            raise FileNotFoundError(
+                f"No existe la base local {self.path}. Créala con: python -m src.db.db_local crear {self.path}"
+            )
+        return SqliteConnection(self.path)
+
+def local_config() -> dict:
+    """Sección [connections.local] de st.secrets ({} si no hay secrets.toml)."""
+    try:
+        return dict(st.secrets.get("connections", {}).get("local", {}))
+    except FileNotFoundError:
+        return {}
+
+@st.cache_resource
+def init_local_connection() -> ConnectionPool:
+    """Pool de la base local. Ruta: DB_PATH, [connections.local] path o data/local/lesiones.db."""
+    config = local_config()
+    path = os.environ.get("DB_PATH") or config.get("path") or DEFAULT_LOCAL_PATH
+    size = int(config.get("pool_size", DEFAULT_POOL_SIZE))
+    timeout = float(config.get("pool_timeout", DEFAULT_POOL_TIMEOUT))
+    return ConnectionPool(LocalPool(path), size, timeout)
+
+# ==========================================================
+# 🌱 Creación y semilla de la base local
+# ==========================================================
+
+_NOMBRES = ("LUCÍA", "MARTA", "PAULA", "ANDREA", "SARA", "LAURA", "CLARA", "NEREA", "IRENE", "ALBA",
+            "CARLA", "JULIA", "AITANA", "MARÍA", "ELENA", "NOA", "OLGA", "ROCÍO", "TERESA", "VERA")
+_APELLIDOS = ("GARCÍA", "MARTÍNEZ", "LÓPEZ", "SÁNCHEZ", "PÉREZ", "GÓMEZ", "RUIZ", "DÍAZ", "MORENO", "MUÑOZ",
+              "ÁLVAREZ", "ROMERO", "NAVARRO", "TORRES", "DOMÍNGUEZ", "VÁZQUEZ", "RAMOS", "GIL", "SERRANO", "MOLINA")
+_POSICIONES = ("POR", "DEF", "DEF", "DEF", "MC", "MC", "MC", "DEL", "DEL")
+_PERSONAL = ("DR. SERRANO", "FISIO LÓPEZ", "FISIO RAMOS", "READAPTADOR GIL")
+
+def _sembrar_catalogos(cnx: sqlite3.Connection) -> dict:
+    catalogos = {}
+    for tabla in CATALOGOS_SEMILLA:
+        df = load_catalog_list(tabla, as_df=True)
+        columnas = list(df.columns)
+        cnx.executemany(
+            f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join(['?'] * len(columnas))})",
+            [tuple(None if v != v else v for v in fila) for fila in df.itertuples(index=False)],
+        )
+        catalogos[tabla] = df
+    return catalogos
+
+def _sembrar_usuarios(cnx: sqlite3.Connection, app_name: str) -> None:
+    roles = ("admin", "developer", "staff")
+    cnx.executemany("INSERT INTO roles (id, name) VALUES (?, ?)", list(enumerate(roles, 1)))
+    cnx.execute("INSERT INTO permissions (id, name) VALUES (1, ?)", (app_name,))
+    cnx.executemany("INSERT INTO role_permissions (role_id, permission_id) VALUES (?, 1)", [(i,) for i in range(1, 4)])
+    cnx.executemany("INSERT INTO state_user (id, name) VALUES (?, ?)", [(1, "ACTIVO"), (2, "INACTIVO")])
+
+    password_hash = bcrypt.hashpw(LOCAL_PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+    cnx.executemany(
+        "INSERT INTO users (email, password_hash, name, lastname, role_id, state_id) VALUES (?, ?, ?, ?, ?, 1)",
+        [(f"{rol}@local", password_hash, rol.capitalize(), "Local", i) for i, rol in enumerate(roles, 1)],
+    )
+
+def _generar_jugadoras(rng: random.Random, planteles: list[str], por_plantel: int) -> list[tuple]:
+    jugadoras = []
+    for plantel in planteles:
+        for dorsal in range(1, por_plantel + 1):
+            identificacion = f"{plantel}{dorsal:03d}"
+            nacimiento = datetime.date(rng.randint(1992, 2008), rng.randint(1, 12), rng.randint(1, 28))
+            jugadoras.append((
+                identificacion, rng.choice(_NOMBRES), f"{rng.choice(_APELLIDOS)} {rng.choice(_APELLIDOS)}",
+                plantel, nacimiento, "F", rng.choice(_POSICIONES), dorsal,
+                round(rng.uniform(1.55, 1.85), 2), round(rng.uniform(52, 75), 1),
+            ))
+    return jugadoras
+
+def _generar_lesiones(rng: random.Random, catalogos: dict, jugadoras: list[tuple], total: int,
+                      hasta: datetime.date, proporcion_developer: float = 0.02):
+    """Genera lesiones coherentes con las cascadas de catálogos, su evolución y la secuencia por jugadora."""
+    zonas = catalogos["zonas_segmento"]
+    estructuras = catalogos["zonas_anatomicas"]
+    relaciones = list(catalogos["mecanismo_tipo_lesion"].itertuples(index=False))
+    tratamientos = catalogos["tratamientos"]["nombre"].tolist()
+    lugares = catalogos["lugares"]["id"].tolist()
+    # Solo las gravedades por días de baja (la de recidiva es clínica)
+    gravedades = [g for g in load_catalog_list("gravedad", as_df=True).to_dict("records") if g["dias_min"] == g["dias_min"]]
+    lateralidades = load_catalog_list("lateralidades")
+    recidivas = load_catalog_list("tipos_recidiva")
+
+    estructuras_por_zona = estructuras.groupby("zona_id")["id"].apply(list).to_dict()
+    segmento_de_zona = dict(zip(zonas["id"].tolist(), zonas["segmento_id"].tolist()))
+    zona_ids = list(segmento_de_zona)
+
+    secuencia, lesiones, evolucion = {}, [], []
+    desde = hasta - datetime.timedelta(days=3 * 365)
+    for _ in range(total):
+        identificacion, nombre, apellido, _plantel, _, _, posicion = rng.choice(jugadoras)[:7]
+        fecha = desde + datetime.timedelta(days=rng.randint(0, (hasta - desde).days))
+        registro = datetime.datetime.combine(fecha, datetime.time(rng.randint(8, 20), rng.randint(0, 59)))
+
+        zona_id = rng.choice(zona_ids)
+        relacion = rng.choice(relaciones)
+        gravedad = rng.choice(gravedades)
+        dias_max = int(gravedad["dias_max"]) if gravedad["dias_max"] == gravedad["dias_max"] else 120
+        dias = rng.randint(int(gravedad["dias_min"]), dias_max)
+        alta = fecha + datetime.timedelta(days=dias)
+        estado = "ACTIVO" if alta > hasta else rng.choice(("INACTIVO", "INACTIVO", "INACTIVO", "OBSERVACION"))
+        es_recidiva = rng.random() < 0.12
+
+        secuencia[identificacion] = secuencia.get(identificacion, 0) + 1
+        id_lesion = generar_id_lesion(f"{nombre} {apellido}", identificacion,
+                                      fecha=fecha.strftime("%Y%m%d"), numero=secuencia[identificacion])
+        sesiones = rng.randint(0, 5)
+        for n in range(sesiones):
+            control = min(fecha + datetime.timedelta(days=2 * (n + 1)), hasta)
+            evolucion.append((
+                id_lesion, control, json.dumps(rng.sample(tratamientos, 2), ensure_ascii=False),
+                rng.choice(_PERSONAL), "Control de evolución",
+                datetime.datetime.combine(control, datetime.time(10, 0)), "staff",
+            ))
+
+        lesiones.append((
+            id_lesion, identificacion, posicion, fecha, rng.choice(lugares), segmento_de_zona[zona_id], zona_id,
+            rng.choice(estructuras_por_zona.get(zona_id, [None])), rng.choice(lateralidades),
+            int(relacion.tipo_lesion_id), None if relacion.tipo_especifico_id != relacion.tipo_especifico_id
+            else int(relacion.tipo_especifico_id), int(es_recidiva),
+            rng.choice(recidivas) if es_recidiva else None, dias, gravedad["nombre"], int(relacion.mecanismo_id),
+            json.dumps(rng.sample(tratamientos, rng.randint(1, 3)), ensure_ascii=False), rng.choice(_PERSONAL),
+            alta, alta if estado != "ACTIVO" else None, alta if estado == "INACTIVO" else None,
+            estado, None, sesiones, registro, registro,
+            "developer" if rng.random() < proporcion_developer else "staff",
+        ))
+    return lesiones, evolucion, secuencia
+
+def crear_base_local(path=DEFAULT_LOCAL_PATH, jugadoras: int = 25, lesiones: int = 5000, semilla: int = 42,
+                     hasta: datetime.date = datetime.date(2025, 6, 30), app_name: str = None,
+                     forzar: bool = False) -> dict:
+    """
+    Crea la base SQLite con el esquema de data/local/esquema_sqlite.sql, los catálogos de
+    data/catalogos y un conjunto de datos generado (reproducible con la misma semilla).
+
+    Parámetros:
+        jugadoras (int): jugadoras por plantel.
+        lesiones (int): lesiones en total (repartidas entre las últimas 3 temporadas hasta `hasta`).
+        app_name (str): permiso de acceso de los usuarios (por defecto st.secrets["auth"]["app_name"]).
+        forzar (bool): sobrescribir la base si ya existe.
+
+    Retorna:
+        dict: filas insertadas por tabla.
+    """
+    path = Path(path)
+    if path.exists():
+        if not forzar:
+            raise FileExistsError(f"{path} ya existe (usa forzar=True / --forzar para recrearla).")
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if app_name is None:
+        try:
+            app_name = st.secrets["auth"]["app_name"]
+        except (FileNotFoundError, KeyError):
+            app_name = "DuxLesiones"
+
+    rng = random.Random(semilla)
+    cnx = sqlite3.connect(path)
+    try:
+        cnx.execute("PRAGMA journal_mode = WAL")
+        cnx.executescript(ESQUEMA_LOCAL.read_text(encoding="utf-8"))
+
+        catalogos = _sembrar_catalogos(cnx)
+        _sembrar_usuarios(cnx, app_name)
+
+        planteles = catalogos["plantel"]["codigo"].tolist()
+        filas_jugadoras = _generar_jugadoras(rng, planteles, jugadoras)
+        cnx.executemany(
+            "INSERT INTO futbolistas (identificacion, nombre, apellido, competicion, fecha_nacimiento, genero) "
+            "VALUES (?, ?, ?, ?, ?, ?)", [f[:6] for f in filas_jugadoras])
+        cnx.executemany(
+            "INSERT INTO informacion_futbolistas (identificacion, posicion, dorsal, nacionalidad, altura, peso) "
+            "VALUES (?, ?, ?, 'ESPAÑA', ?, ?)", [(f[0],) + f[6:] for f in filas_jugadoras])
+
+        filas_lesiones, filas_evolucion, secuencia = _generar_lesiones(rng, catalogos, filas_jugadoras, lesiones, hasta)
+        cnx.executemany("""
+            INSERT INTO lesiones (
+                id_lesion, id_jugadora, posicion, fecha_lesion, lugar_id, segmento_id, zona_cuerpo_id,
+                zona_especifica_id, lateralidad, tipo_lesion_id, tipo_especifico_id, es_recidiva, tipo_recidiva,
+                dias_baja_estimado, impacto_dias_baja_estimado, mecanismo_id, tipo_tratamiento, personal_reporta,
+                fecha_alta_diagnostico, fecha_alta_medica, fecha_alta_deportiva, estado_lesion, diagnostico,
+                sesiones, fecha_hora_registro, updated_at, usuario
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, filas_lesiones)
+        cnx.executemany("""
+            INSERT INTO lesion_evolucion (id_lesion, fecha_control, tratamiento_aplicado, personal_seguimiento,
+                                          observaciones, fecha_hora_registro, usuario)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, filas_evolucion)
+        cnx.executemany("INSERT INTO lesiones_secuencia (id_jugadora, ultimo) VALUES (?, ?)", list(secuencia.items()))
+        cnx.commit()
+
+        # Resumen de la página de inicio, con el mismo cálculo que save_lesion/delete_lesiones
+        conexion = SqliteConnection(str(path))
+        try:
+            rebuild_summary(conexion.cursor())
+            conexion.commit()
+        finally:
+            conexion.close()
+        cnx.execute("ANALYZE")
+    finally:
+        cnx.close()
+
+    return {
+        "futbolistas": len(filas_jugadoras),
+        "lesiones": len(filas_lesiones),
+        "lesion_evolucion": len(filas_evolucion),
+        **{tabla: len(df) for tabla, df in catalogos.items()},
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Base de datos local (SQLite) con datos generados.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    crear = sub.add_parser("crear", help="Crea la base con catálogos y un conjunto de datos generado.")
+    crear.add_argument("path", nargs="?", default=str(DEFAULT_LOCAL_PATH))
+    crear.add_argument("--jugadoras", type=int, default=25, help="Jugadoras por plantel.")
+    crear.add_argument("--lesiones", type=int, default=5000, help="Lesiones en total.")
+    crear.add_argument("--semilla", type=int, default=42)
+    crear.add_argument("--hasta", type=datetime.date.fromisoformat, default=datetime.date(2025, 6, 30),
+                       help="Última fecha de lesión (YYYY-MM-DD).")
+    crear.add_argument("--app-name", default=None, help="Permiso de acceso de los usuarios generados.")
+    crear.add_argument("--forzar", action="store_true", help="Sobrescribir la base si existe.")
+    args = parser.parse_args(argv)
+
+    try:
+        filas = crear_base_local(args.path, args.jugadoras, args.lesiones, args.semilla, args.hasta,
+                                 args.app_name, args.forzar)
+    except FileExistsError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"Base local creada en {args.path}:")
+    for tabla, n in filas.items():
+        print(f"  {tabla:<24} {n}")
+    print(f"Usuarios: admin@local, developer@local, staff@local (contraseña '{LOCAL_PASSWORD}').")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
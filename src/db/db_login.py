@@ -1,59 +1,154 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
 import pandas as pd
 import streamlit as st
+from src.db.db_cache import cached_resource_loader
 from src.db.db_connection import get_connection
+from src.db.db_utils import frame_from_cursor
+
+# Tablas de las que dependen los permisos por rol (invalidate_tables recarga RolePermissions)
+TABLAS_PERMISOS = ("roles", "permissions", "role_permissions", "state_user")
+
+@dataclass(frozen=True)
+class RolePermissions:
+    """
+    Roles, estados de usuario y permisos por rol, cargados una vez y compartidos entre sesiones.
+    - version: checksum del contenido (cambia si cambia cualquiera de las tablas).
+    - permissions(role_id): frozenset con los nombres de permiso del rol.
+    """
+    version: str
+    _roles: Mapping[int, str] = field(repr=False)
+    _estados: Mapping[int, str] = field(repr=False)
+    _permisos: Mapping[int, frozenset[str]] = field(repr=False)
+
+    def role_name(self, role_id: int) -> str | None:
+        return self._roles.get(role_id)
+
+    def state_name(self, state_id: int) -> str | None:
+        return self._estados.get(state_id)
+
+    def permissions(self, role_id: int) -> frozenset[str]:
+        return self._permisos.get(role_id, frozenset())
+
+@cached_resource_loader(TABLAS_PERMISOS, ttl=3600)  # inmutable: se comparte la misma instancia entre sesiones
+def _fetch_role_permissions() -> RolePermissions:
+    """Lee roles, estados y role_permissions en una conexión (tablas pequeñas)."""
+    conn = get_connection(readonly=True)
+    if not conn:
+        raise ConnectionError("No se pudo establecer conexión con la base de datos.")
+
+    consultas = (
+        "SELECT id, name FROM roles ORDER BY id;",
+        "SELECT id, name FROM state_user ORDER BY id;",
+        """
+        SELECT rp.role_id, p.name
+        FROM role_permissions rp
+        INNER JOIN permissions p ON rp.permission_id = p.id
+        ORDER BY rp.role_id, p.name;
+        """,
+    )
+    try:
+        cursor = conn.cursor()
+        try:
+            resultados, checksum = [], hashlib.sha256()
+            for consulta in consultas:
+                cursor.execute(consulta)
+                filas = cursor.fetchall()
+                resultados.append(filas)
+                checksum.update(json.dumps(filas, default=str).encode())
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+    roles, estados, pares = resultados
+    permisos = {}
+    for role_id, nombre in pares:
+        permisos.setdefault(role_id, set()).add(nombre)
+
+    return RolePermissions(
+        version=checksum.hexdigest()[:16],
+        _roles=MappingProxyType(dict(roles)),
+        _estados=MappingProxyType(dict(estados)),
+        _permisos=MappingProxyType({r: frozenset(p) for r, p in permisos.items()}),
+    )
+
+def load_role_permissions_db() -> RolePermissions | None:
+    """
+    Permisos por rol cacheados (ver RolePermissions).
+    Retorna None (y muestra el error) si no se pudieron cargar.
+    """
+    try:
+        return _fetch_role_permissions()
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar roles y permisos: {e}")
+        return None
 
 def load_user_from_db(email: str):
     """
     Obtiene un usuario desde la base de datos según su email.
+    Solo lee su fila de 'users' (email es UNIQUE); rol, estado y permisos salen de
+    load_role_permissions_db(). 'permissions' es un frozenset con los nombres de permiso.
     Retorna un dict con los datos del usuario o None si no existe.
     """
+    permisos = load_role_permissions_db()
+    if permisos is None:
+        return None
+
     conn = get_connection()
     if not conn:
         st.error(":material/warning: No se pudo conectar a la base de datos.")
         return None
 
+    cursor = None
     try:
         cursor = conn.cursor(dictionary=True)
-        query = """
-        SELECT 
-            u.id,
-            u.email,
-            u.password_hash,
-            u.name,
-            u.lastname,
-            r.name AS role_name,
-            s.name AS state_name,
-            GROUP_CONCAT(p.name ORDER BY p.name SEPARATOR ', ') AS permissions
-        FROM users u
-        INNER JOIN roles r ON u.role_id = r.id
-        INNER JOIN role_permissions rp ON r.id = rp.role_id
-        INNER JOIN permissions p ON rp.permission_id = p.id
-        INNER JOIN state_user s ON u.state_id = s.id
-        WHERE u.email = %s
-        GROUP BY 
-            u.id, u.email, u.password_hash, u.name, u.lastname, r.name, s.name;
-        """
-        cursor.execute(query, (email,))
+        cursor.execute("""
+        SELECT id, email, password_hash, name, lastname, role_id, state_id
+        FROM users
+        WHERE email = %s;
+        """, (email,))
         user = cursor.fetchone()
-        return user
-
     except Exception as e:
         st.error(f":material/warning: Error al obtener usuario: {e}")
         return None
     finally:
+        if cursor:
+            cursor.close()
         if conn:
             conn.close()
 
+    if not user:
+        return None
+
+    # Rol o estado creados después de cargar la caché: se recarga una vez
+    if (permisos.role_name(user["role_id"]) is None
+            or permisos.state_name(user["state_id"]) is None):
+        _fetch_role_permissions.clear()
+        permisos = load_role_permissions_db()
+        if permisos is None or permisos.role_name(user["role_id"]) is None:
+            return None
+
+    user["role_name"] = permisos.role_name(user["role_id"])
+    user["state_name"] = permisos.state_name(user["state_id"])
+    user["permissions"] = permisos.permissions(user["role_id"])
+    return user
+
 def load_all_users_from_db():
     """
     Obtiene todos los usuarios desde la base de datos con sus roles, estados y permisos.
     Retorna un DataFrame con la información o None si ocurre un error.
     """
-    conn = get_connection()
+    conn = get_connection(readonly=True)
     if not conn:
         st.error(":material/warning: No se pudo conectar a la base de datos.")
         return None
 
+    cursor = None
     try:
         query = """
         SELECT 
@@ -76,12 +171,11 @@ def load_all_users_from_db():
             u.name, u.lastname;
         """
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute(query)
-        rows = cursor.fetchall()
 
-        # Convertir resultados a DataFrame
-        df = pd.DataFrame(rows)
+        # Convertir resultados a DataFrame (cursor de tuplas, sin un dict por fila)
+        df = frame_from_cursor(cursor)
 
         return df
 
@@ -0,0 +1,304 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+
+DEFAULT_BUFFER_SIZE = 2000  # ejecuciones que se conservan en memoria (las más antiguas se descartan)
+MAX_SQL_CHARS = 300
+MAX_PARAMS_CHARS = 200
+DEFAULT_SLOW_QUERY_MS = 500
+DEFAULT_SLOW_QUERY_LOG = "logs/slow_queries.log"
+SLOW_QUERY_LOG_MAX_BYTES = 1_000_000
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Módulos que envuelven cursor.execute: el nombre de la consulta es la primera función fuera de ellos
+_MODULOS_INTERNOS = {__name__, "src.db.db_connection", "src.db.db_utils", "contextlib"}
+
+_buffer = deque(maxlen=DEFAULT_BUFFER_SIZE)
+_lock = threading.Lock()
+_estado = {"activo": os.environ.get("DB_METRICS", "1") != "0"}
+
+# Consultas lentas: umbral en ms y archivo rotativo (DB_SLOW_QUERY_MS / DB_SLOW_QUERY_LOG)
+_lentas = {
+    "umbral_ms": float(os.environ.get("DB_SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS)),
+    "ruta": os.environ.get("DB_SLOW_QUERY_LOG", DEFAULT_SLOW_QUERY_LOG),
+    "logger": None,
+}
+_lentas_lock = threading.Lock()
+
+@dataclass
+class QueryRecord:
+    """Una ejecución de consulta. Se guarda al ejecutar y se completa al leer sus filas."""
+    nombre: str
+    sql: str
+    params: str
+    inicio: float                 # time.time() al ejecutar
+    duracion: float = 0.0         # segundos: execute + fetch*
+    filas: int = 0                # filas devueltas (o afectadas si no devuelve filas)
+    bytes: int = 0                # tamaño aproximado del resultado
+    espera_pool: float = 0.0      # espera por la conexión (solo en la primera consulta de cada préstamo)
+    error: str | None = None
+
+def is_enabled() -> bool:
+    return _estado["activo"]
+
+def set_enabled(activo: bool) -> None:
+    """Activa o desactiva el registro (también con la variable de entorno DB_METRICS=0)."""
+    _estado["activo"] = bool(activo)
+
+def set_buffer_size(size: int) -> None:
+    """Cambia la capacidad del buffer conservando las ejecuciones más recientes."""
+    global _buffer
+    with _lock:
+        _buffer = deque(_buffer, maxlen=max(1, int(size)))
+
+def slow_query_threshold_ms() -> float:
+    return _lentas["umbral_ms"]
+
+def slow_query_log_path() -> str:
+    return _lentas["ruta"]
+
+def configure_slow_query_log(umbral_ms: float = None, ruta: str = None) -> None:
+    """Cambia el umbral (ms) y/o el archivo del log de consultas lentas."""
+    with _lentas_lock:
+        if umbral_ms is not None:
+            _lentas["umbral_ms"] = float(umbral_ms)
+        if ruta is not None and ruta != _lentas["ruta"]:
+            _lentas["ruta"] = ruta
+            if _lentas["logger"] is not None:
+                for handler in list(_lentas["logger"].handlers):
+                    _lentas["logger"].removeHandler(handler)
+                    handler.close()
+                _lentas["logger"] = None
+
+def _slow_logger() -> logging.Logger:
+    # El archivo se abre la primera vez que hay una consulta lenta
+    with _lentas_lock:
+        if _lentas["logger"] is None:
+            ruta = _lentas["ruta"]
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+            logger = logging.getLogger("dux.slow_queries")
+            logger.setLevel(logging.WARNING)
+            logger.propagate = False
+            handler = RotatingFileHandler(ruta, maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+                                          backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            _lentas["logger"] = logger
+        return _lentas["logger"]
+
+def _registrar_si_lenta(record: QueryRecord) -> None:
+    duracion_ms = record.duracion * 1000
+    if duracion_ms < _lentas["umbral_ms"]:
+        return
+    try:
+        _slow_logger().warning(
+            "%s %.1fms filas=%d espera_pool=%.1fms%s | %s | params=%s",
+            record.nombre, duracion_ms, record.filas, record.espera_pool * 1000,
+            f" error={record.error}" if record.error else "", record.sql, record.params or "-",
+        )
+    except OSError as e:
+        print(f"No se pudo escribir el log de consultas lentas: {e}")
+
+def _nombre_consulta() -> str:
+    """
+    Función que lanzó la consulta (p. ej. 'load_jugadoras_db' o 'LesionesStore.sync'),
+    saltando los envoltorios de src/db.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__") not in _MODULOS_INTERNOS:
+            # co_qualname (Python 3.11+) incluye la clase en los métodos
+            return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+        frame = frame.f_back
+    return "desconocida"
+
+def _recortar(texto, limite: int) -> str:
+    texto = " ".join(str(texto).split())
+    return texto if len(texto) <= limite else texto[:limite - 3] + "..."
+
+def approx_bytes(filas: list) -> int:
+    """Tamaño estimado a partir de la primera fila (evita recorrer todo el resultado)."""
+    if not filas:
+        return 0
+    muestra = filas[0]
+    valores = muestra.values() if isinstance(muestra, dict) else muestra
+    try:
+        por_fila = sum(sys.getsizeof(v) for v in valores)
+    except TypeError:
+        por_fila = sys.getsizeof(muestra)
+    return por_fila * len(filas)
+
+def _registrar(record: QueryRecord) -> None:
+    with _lock:
+        _buffer.append(record)
+
+class InstrumentedCursor:
+    """
+    Envuelve un cursor y registra cada execute/executemany en el buffer de métricas.
+    Las filas, bytes y el tiempo de fetchall/fetchone/fetchmany se suman a la última ejecución.
+    Todo lo demás (description, rowcount, nextset, lastrowid...) se delega en el cursor real.
+    """
+
+    def __init__(self, cursor, conexion):
+        self._cursor = cursor
+        self._conexion = conexion
+        self._actual = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _finalizar(self) -> None:
+        # La ejecución anterior ya no suma más tiempo de lectura: se comprueba si fue lenta
+        if self._actual is not None:
+            _registrar_si_lenta(self._actual)
+            self._actual = None
+
+    def _ejecutar(self, metodo, sql, params, muchos: bool = False):
+        self._finalizar()
+        if not is_enabled():
+            return metodo(sql, params) if params is not None else metodo(sql)
+
+        record = QueryRecord(
+            nombre=_nombre_consulta(),
+            sql=_recortar(sql, MAX_SQL_CHARS),
+            params=_recortar(f"{len(params)} filas" if muchos else params, MAX_PARAMS_CHARS) if params else "",
+            inicio=time.time(),
+            espera_pool=self._conexion._tomar_espera(),
+        )
+        t0 = time.perf_counter()
+        try:
+            return metodo(sql, params) if params is not None else metodo(sql)
+        except Exception as e:
+            record.error = _recortar(e, MAX_PARAMS_CHARS)
+            raise
+        finally:
+            record.duracion = time.perf_counter() - t0
+            if muchos or not getattr(self._cursor, "with_rows", True):
+                record.filas = max(getattr(self._cursor, "rowcount", 0) or 0, 0)
+            self._actual = record
+            _registrar(record)
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        if args or kwargs:
+            return self._cursor.execute(sql, params, *args, **kwargs)
+        return self._ejecutar(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_params):
+        seq_params = list(seq_params)
+        return self._ejecutar(self._cursor.executemany, sql, seq_params, muchos=True)
+
+    def _leer(self, metodo, *args):
+        t0 = time.perf_counter()
+        resultado = metodo(*args)
+        record = self._actual
+        if record is not None:
+            record.duracion += time.perf_counter() - t0
+            if isinstance(resultado, list):
+                record.filas += len(resultado)
+                record.bytes += approx_bytes(resultado)
+            elif resultado is not None:
+                record.filas += 1
+                record.bytes += approx_bytes([resultado])
+        return resultado
+
+    def fetchall(self):
+        return self._leer(self._cursor.fetchall)
+
+    def fetchone(self):
+        return self._leer(self._cursor.fetchone)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._leer(lambda: self._cursor.fetchmany(*args, **kwargs))
+
+    def close(self):
+        self._finalizar()
+        return self._cursor.close()
+
+# ==========================================================
+# 📊 Consultas sobre el buffer
+# ==========================================================
+
+def recent_queries(limit: int = None, nombre: str = None) -> list[QueryRecord]:
+    """Ejecuciones registradas, de la más reciente a la más antigua."""
+    with _lock:
+        registros = list(_buffer)
+    registros.reverse()
+    if nombre:
+        registros = [r for r in registros if r.nombre == nombre]
+    return registros[:limit] if limit else registros
+
+def queries_dataframe(limit: int = None) -> pd.DataFrame:
+    """Ejecuciones recientes como DataFrame (una fila por consulta, 'inicio' como datetime)."""
+    registros = recent_queries(limit)
+    df = pd.DataFrame([asdict(r) for r in registros], columns=list(QueryRecord.__dataclass_fields__))
+    df["inicio"] = pd.to_datetime(df["inicio"], unit="s")
+    return df
+
+def query_summary() -> pd.DataFrame:
+    """
+    Agregado por nombre de consulta, ordenado por tiempo total (la que más pesa en cada rerun primero):
+    ejecuciones, errores, tiempo total/medio/máximo (ms), filas y bytes medios y espera de pool media (ms).
+    """
+    df = queries_dataframe()
+    if df.empty:
+        return pd.DataFrame(columns=["nombre", "ejecuciones", "errores", "total_ms", "media_ms",
+                                     "max_ms", "filas_media", "bytes_media", "espera_pool_ms"])
+
+    df["con_error"] = df["error"].notna()
+    resumen = df.groupby("nombre").agg(
+        ejecuciones=("duracion", "size"),
+        errores=("con_error", "sum"),
+        total_ms=("duracion", "sum"),
+        media_ms=("duracion", "mean"),
+        max_ms=("duracion", "max"),
+        filas_media=("filas", "mean"),
+        bytes_media=("bytes", "mean"),
+        espera_pool_ms=("espera_pool", "mean"),
+    ).reset_index()
+
+    for columna in ("total_ms", "media_ms", "max_ms", "espera_pool_ms"):
+        resumen[columna] = (resumen[columna] * 1000).round(2)
+    resumen["filas_media"] = resumen["filas_media"].round(1)
+    resumen["bytes_media"] = resumen["bytes_media"].round(0).astype("int64")
+    return resumen.sort_values("total_ms", ascending=False, ignore_index=True)
+
+def latency_percentiles() -> pd.DataFrame:
+    """p50/p95/p99 y máximo (ms) por nombre de consulta, de mayor a menor p95."""
+    df = queries_dataframe()
+    columnas = ["nombre", "ejecuciones", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    if df.empty:
+        return pd.DataFrame(columns=columnas)
+
+    df["ms"] = df["duracion"] * 1000
+    agrupado = df.groupby("nombre")["ms"]
+    resumen = pd.DataFrame({
+        "ejecuciones": agrupado.size(),
+        "p50_ms": agrupado.quantile(0.50),
+        "p95_ms": agrupado.quantile(0.95),
+        "p99_ms": agrupado.quantile(0.99),
+        "max_ms": agrupado.max(),
+    }).round(2).reset_index()
+    return resumen[columnas].sort_values("p95_ms", ascending=False, ignore_index=True)
+
+def slowest_queries(limit: int = 20) -> pd.DataFrame:
+    """Ejecuciones más lentas que siguen en el buffer, con su SQL y parámetros."""
+    df = queries_dataframe()
+    if df.empty:
+        return df
+    df["duracion_ms"] = (df["duracion"] * 1000).round(2)
+    df = df.nlargest(limit, "duracion")
+    return df[["inicio", "nombre", "duracion_ms", "filas", "params", "sql", "error"]].reset_index(drop=True)
+
+def clear_queries() -> None:
+    with _lock:
+        _buffer.clear()
@@ -0,0 +1,333 @@
+"""
+Migraciones versionadas del esquema (data/migrations/V###__nombre.sql).
+
+Uso desde la línea de comandos (lee [connections.mysql] de .streamlit/secrets.toml):
+
+    python -m src.db.db_migrations status      # versiones aplicadas y pendientes
+    python -m src.db.db_migrations migrate     # aplica las pendientes en orden
+    python -m src.db.db_migrations baseline 4  # marca 1..4 como aplicadas sin ejecutarlas
+    python -m src.db.db_migrations explain     # comprueba que las consultas principales usan sus índices
+"""
+import argparse
+import hashlib
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import mysql.connector
+
+from src.db.db_connection import db_cursor
+from src.db.db_store import LESIONES_BASE_QUERY
+
+MIGRACIONES_DIR = Path(__file__).resolve().parents[2] / "data" / "migrations"
+
+_PATRON_ARCHIVO = re.compile(r"^V(\d+)__(\w+)\.sql$")
+
+# Errores de "ya existe" / "ya no existe" que se ignoran (tabla, columna, índice): permiten
+# reanudar una migración que se cortó a medias o aplicarla sobre una base donde parte del
+# DDL se ejecutó a mano. MySQL no admite CREATE INDEX IF NOT EXISTS ni DROP COLUMN IF EXISTS.
+# Las sentencias de datos (INSERT ... SELECT) deben ser idempotentes por sí mismas.
+ERRORES_YA_EXISTE = {
+    1050: "la tabla ya existe",
+    1060: "la columna ya existe",
+    1061: "el índice ya existe",
+    1091: "la columna o el índice ya se eliminó",
+}
+
+@dataclass(frozen=True)
+class Migracion:
+    version: int
+    nombre: str
+    ruta: Path
+
+    @property
+    def sql(self) -> str:
+        return self.ruta.read_text(encoding="utf-8")
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.ruta.read_bytes()).hexdigest()
+
+def descubrir_migraciones(directorio: Path = MIGRACIONES_DIR) -> list[Migracion]:
+    """Archivos V###__nombre.sql del directorio, ordenados por versión."""
+    migraciones = []
+    for ruta in directorio.glob("V*.sql"):
+        coincidencia = _PATRON_ARCHIVO.match(ruta.name)
+        if not coincidencia:
+            continue
+        migraciones.append(Migracion(int(coincidencia.group(1)), coincidencia.group(2), ruta))
+
+    versiones = [m.version for m in migraciones]
+    duplicadas = sorted({v for v in versiones if versiones.count(v) > 1})
+    if duplicadas:
+        raise ValueError(f"Versiones de migración duplicadas: {duplicadas}")
+
+    return sorted(migraciones, key=lambda m: m.version)
+
+def dividir_sentencias(sql: str) -> list[str]:
+    """
+    Separa un script en sentencias. Una sentencia termina en la línea que acaba en ';'
+    (los archivos de migración no usan procedimientos ni ';' dentro de literales).
+    Se descartan las líneas de comentario '--'.
+    """
+    sentencias, actual = [], []
+    for linea in sql.splitlines():
+        if linea.lstrip().startswith("--") or (not actual and not linea.strip()):
+            continue
+        actual.append(linea)
+        if linea.rstrip().endswith(";"):
+            sentencias.append("\n".join(actual).rstrip().rstrip(";"))
+            actual = []
+
+    if actual:
+        sentencias.append("\n".join(actual).rstrip())
+    return sentencias
+
+def _crear_tabla_control(cursor) -> None:
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+      version INT NOT NULL PRIMARY KEY,
+      nombre VARCHAR(100) NOT NULL,
+      checksum CHAR(64) NOT NULL,
+      aplicado_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB;
+    """)
+
+def _aplicadas(cursor) -> dict[int, str]:
+    """version → checksum de las migraciones registradas."""
+    _crear_tabla_control(cursor)
+    cursor.execute("SELECT version, checksum FROM schema_migrations ORDER BY version;")
+    return {version: checksum for version, checksum in cursor.fetchall()}
+
+def _registrar(cursor, migracion: Migracion) -> None:
+    cursor.execute(
+        "INSERT INTO schema_migrations (version, nombre, checksum) VALUES (%s, %s, %s);",
+        (migracion.version, migracion.nombre, migracion.checksum),
+    )
+
+def estado_migraciones() -> list[dict]:
+    """
+    Estado de cada migración conocida: "aplicada", "pendiente" o "modificada"
+    (aplicada, pero el archivo cambió desde entonces).
+    """
+    with db_cursor() as (conn, cursor):
+        aplicadas = _aplicadas(cursor)
+        conn.commit()
+
+    estado = []
+    for migracion in descubrir_migraciones():
+        checksum = aplicadas.get(migracion.version)
+        if checksum is None:
+            situacion = "pendiente"
+        elif checksum != migracion.checksum:
+            situacion = "modificada"
+        else:
+            situacion = "aplicada"
+        estado.append({"version": migracion.version, "nombre": migracion.nombre, "estado": situacion})
+    return estado
+
+def aplicar_migraciones(hasta: int = None, on_progress=None) -> list[Migracion]:
+    """
+    Aplica en orden las migraciones pendientes (hasta la versión `hasta`, si se indica).
+
+    El DDL de MySQL hace commit implícito, así que una migración no es atómica: si una
+    sentencia falla se detiene el proceso sin registrar esa versión y se relanza el error.
+    Los errores de ERRORES_YA_EXISTE se ignoran para poder reanudar.
+
+    Parámetros:
+        hasta (int): última versión a aplicar.
+        on_progress (callable): on_progress(migracion, mensaje) por cada aviso o migración aplicada.
+
+    Retorna:
+        list[Migracion]: migraciones aplicadas en esta ejecución.
+    """
+    aplicadas_ahora = []
+    with db_cursor() as (conn, cursor):
+        aplicadas = _aplicadas(cursor)
+        conn.commit()
+
+        for migracion in descubrir_migraciones():
+            if migracion.version in aplicadas or (hasta is not None and migracion.version > hasta):
+                continue
+
+            inicio = time.perf_counter()
+            for sentencia in dividir_sentencias(migracion.sql):
+                try:
+                    cursor.execute(sentencia)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                except mysql.connector.Error as e:
+                    if e.errno not in ERRORES_YA_EXISTE:
+                        conn.rollback()
+                        raise
+                    if on_progress:
+                        on_progress(migracion, f"se omite una sentencia: {ERRORES_YA_EXISTE[e.errno]} ({e.msg})")
+
+            _registrar(cursor, migracion)
+            conn.commit()
+            aplicadas_ahora.append(migracion)
+            if on_progress:
+                on_progress(migracion, f"aplicada en {time.perf_counter() - inicio:.1f}s")
+
+    return aplicadas_ahora
+
+def marcar_baseline(version: int) -> list[Migracion]:
+    """
+    Registra como aplicadas las migraciones hasta `version` sin ejecutarlas
+    (bases existentes cuyo esquema ya coincide con esas versiones).
+    """
+    marcadas = []
+    with db_cursor() as (conn, cursor):
+        aplicadas = _aplicadas(cursor)
+        for migracion in descubrir_migraciones():
+            if migracion.version <= version and migracion.version not in aplicadas:
+                _registrar(cursor, migracion)
+                marcadas.append(migracion)
+        conn.commit()
+    return marcadas
+
+# ==========================================================
+# 🔍 Comprobación de índices con EXPLAIN
+# ==========================================================
+
+@dataclass(frozen=True)
+class ConsultaExplain:
+    """Consulta representativa, alias de la tabla a revisar e índices aceptables."""
+    nombre: str
+    sql: str
+    tabla: str
+    indices: frozenset
+    params: tuple = ()
+
+CONSULTAS_EXPLAIN = (
+    ConsultaExplain(
+        "store_carga_ordenada",
+        LESIONES_BASE_QUERY + " ORDER BY l.fecha_hora_registro DESC LIMIT 100",
+        "l", frozenset({"idx_lesiones_fecha_registro"}),
+    ),
+    ConsultaExplain(
+        "store_delta",
+        LESIONES_BASE_QUERY + " WHERE l.updated_at >= %s",
+        "l", frozenset({"idx_lesiones_updated_at"}),
+        ("2100-01-01",),
+    ),
+    ConsultaExplain(
+        "lesion_por_id",
+        "SELECT * FROM lesiones l WHERE l.id_lesion = %s",
+        "l", frozenset({"idx_lesiones_id_lesion"}),
+        ("X",),
+    ),
+    ConsultaExplain(
+        "historial_jugadora",
+        "SELECT * FROM lesiones l WHERE l.id_jugadora = %s ORDER BY l.fecha_hora_registro DESC",
+        "l", frozenset({"idx_lesiones_jugadora_registro"}),
+        ("X",),
+    ),
+    ConsultaExplain(
+        "lesiones_activas",
+        "SELECT l.id_lesion, l.fecha_lesion FROM lesiones l "
+        "WHERE l.estado_lesion = %s AND l.fecha_lesion >= %s",
+        "l", frozenset({"idx_lesiones_estado_fecha"}),
+        ("ACTIVO", "2100-01-01"),
+    ),
+    ConsultaExplain(
+        "registros_developer",
+        "SELECT * FROM lesiones l WHERE l.usuario = %s AND l.fecha_lesion >= %s",
+        "l", frozenset({"idx_lesiones_usuario_fecha"}),
+        ("developer", "2100-01-01"),
+    ),
+    ConsultaExplain(
+        "rango_fecha_lesion",
+        "SELECT MIN(l.fecha_lesion), MAX(l.fecha_lesion) FROM lesiones l "
+        "WHERE l.fecha_lesion BETWEEN %s AND %s",
+        "l", frozenset({"idx_lesiones_fecha_lesion", "idx_lesiones_estado_fecha", "idx_lesiones_usuario_fecha"}),
+        ("2100-01-01", "2100-12-31"),
+    ),
+    ConsultaExplain(
+        "jugadoras_plantel",
+        "SELECT f.identificacion FROM futbolistas f WHERE f.competicion = %s",
+        "f", frozenset({"idx_futbolistas_competicion"}),
+        ("X",),
+    ),
+    ConsultaExplain(
+        "purga_eliminadas",
+        "SELECT l.id_lesion FROM lesiones l WHERE l.deleted_at IS NOT NULL ORDER BY l.deleted_at LIMIT 500",
+        "l", frozenset({"idx_lesiones_deleted_at"}),
+    ),
+    ConsultaExplain(
+        "evolucion_lesion",
+        "SELECT * FROM lesion_evolucion e WHERE e.id_lesion = %s ORDER BY e.fecha_hora_registro",
+        "e", frozenset({"idx_evolucion_lesion"}),
+        ("X",),
+    ),
+)
+
+def explicar_consultas(consultas=CONSULTAS_EXPLAIN) -> list[dict]:
+    """
+    Ejecuta EXPLAIN de cada consulta y comprueba que la tabla indicada usa uno de sus índices.
+    Con tablas casi vacías MySQL puede preferir un recorrido completo: conviene ejecutarlo
+    sobre una copia con datos reales.
+
+    Retorna:
+        list[dict]: {"nombre", "ok", "key", "possible_keys", "type", "rows"} por consulta.
+    """
+    resultados = []
+    with db_cursor(dictionary=True) as (conn, cursor):
+        for consulta in consultas:
+            cursor.execute("EXPLAIN " + consulta.sql, consulta.params)
+            filas = [f for f in cursor.fetchall() if f.get("table") == consulta.tabla]
+            fila = filas[0] if filas else {}
+
+            # index_merge informa varios índices separados por coma
+            usados = set((fila.get("key") or "").split(",")) - {""}
+            resultados.append({
+                "nombre": consulta.nombre,
+                "ok": bool(usados & consulta.indices),
+                "key": fila.get("key"),
+                "possible_keys": fila.get("possible_keys"),
+                "type": fila.get("type"),
+                "rows": fila.get("rows"),
+            })
+    return resultados
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Migraciones versionadas del esquema MySQL.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("status", help="Versiones aplicadas, pendientes y modificadas.")
+    migrate = sub.add_parser("migrate", help="Aplica las migraciones pendientes.")
+    migrate.add_argument("--hasta", type=int, default=None, help="Última versión a aplicar.")
+    baseline = sub.add_parser("baseline", help="Marca como aplicadas las versiones hasta N sin ejecutarlas.")
+    baseline.add_argument("version", type=int)
+    sub.add_parser("explain", help="Comprueba con EXPLAIN que las consultas principales usan sus índices.")
+    args = parser.parse_args(argv)
+
+    if args.comando == "status":
+        estado = estado_migraciones()
+        for m in estado:
+            print(f"V{m['version']:03d} {m['nombre']:<30} {m['estado']}")
+        return 1 if any(m["estado"] == "modificada" for m in estado) else 0
+
+    if args.comando == "migrate":
+        aplicadas = aplicar_migraciones(
+            args.hasta, on_progress=lambda m, mensaje: print(f"V{m.version:03d} {m.nombre}: {mensaje}")
+        )
+        if not aplicadas:
+            print("El esquema está al día.")
+        return 0
+
+    if args.comando == "baseline":
+        marcadas = marcar_baseline(args.version)
+        print(f"Marcadas {len(marcadas)} migraciones como aplicadas.")
+        return 0
+
+    resultados = explicar_consultas()
+    for r in resultados:
+        marca = "OK " if r["ok"] else "FALLA"
+        print(f"{marca} {r['nombre']:<22} key={r['key']} type={r['type']} rows={r['rows']} "
+              f"possible_keys={r['possible_keys']}")
+    return 0 if all(r["ok"] for r in resultados) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
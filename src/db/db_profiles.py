@@ -0,0 +1,161 @@
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.db.db_cache import count_cache_event
+from src.db.db_records import COLUMNAS_LESIONES, project_lesiones
+from src.db.db_scope import RowScope, current_scope
+from src.db.db_store import get_lesiones_store
+
+DEFAULT_PROFILE_CACHE_SIZE = 64  # perfiles (jugadora + filtro de tipo) que se conservan en memoria
+
+@dataclass(frozen=True)
+class PerfilJugadora:
+    """
+    Lesiones de una jugadora (opcionalmente de un solo tipo) con los agregados que usan
+    los gráficos del análisis individual. Se calcula una vez por versión de sus datos
+    y se comparte entre sesiones: los DataFrames son de solo lectura (copiar antes de modificar).
+    """
+    id_jugadora: str
+    tipo_lesion: str | None
+    version: tuple
+    lesiones: pd.DataFrame        # formato de load_lesiones_db
+    por_zona: pd.DataFrame        # [zona_cuerpo, total], de mayor a menor
+    por_tipo: pd.DataFrame        # [tipo_lesion, total]
+    por_mecanismo: pd.DataFrame   # [mecanismo, total]
+    tipo_mecanismo: pd.DataFrame  # [tipo_lesion, mecanismo, total]
+    tratamientos: pd.DataFrame    # [tratamiento, total], de menor a mayor (barras horizontales)
+    recidivas: pd.DataFrame       # [tipo ("Recidiva" / "Nueva"), total]
+    dias_baja: pd.DataFrame       # [impacto_dias_baja_estimado, dias_baja_estimado] con días informados
+    resumen_dias_baja: dict       # total, media, mediana, p25, p75, max (días de baja)
+
+    @property
+    def total(self) -> int:
+        return len(self.lesiones)
+
+    @property
+    def ratio_recidivas(self) -> float:
+        """Proporción de lesiones recidivantes (0 si no hay lesiones)."""
+        if not self.total:
+            return 0.0
+        recidivas = self.recidivas.loc[self.recidivas["tipo"] == "Recidiva", "total"].sum()
+        return float(recidivas) / self.total
+
+def _conteo(df: pd.DataFrame, columna: str) -> pd.DataFrame:
+    # Las columnas categóricas devuelven también las categorías sin lesiones: se descartan
+    conteo = df[columna].value_counts()
+    conteo = conteo[conteo > 0]
+    return conteo.rename_axis(columna).reset_index(name="total")
+
+def _tratamientos(df: pd.DataFrame) -> pd.DataFrame:
+    tratamientos = Counter()
+    for tr in df["tipo_tratamiento"]:
+        if isinstance(tr, list):
+            tratamientos.update(tr)
+        elif isinstance(tr, str) and tr.strip():
+            tratamientos.update(x.strip() for x in tr.split(","))
+    return (pd.DataFrame(tratamientos.items(), columns=["tratamiento", "total"])
+            .sort_values("total", ascending=True, ignore_index=True))
+
+def build_player_profile(lesiones: pd.DataFrame, id_jugadora: str, tipo_lesion: str = None,
+                         version: tuple = ()) -> PerfilJugadora:
+    """Calcula el perfil a partir de las lesiones de la jugadora (formato de load_lesiones_db)."""
+    lesiones = lesiones.reset_index(drop=True)
+
+    tipo_mecanismo = (
+        lesiones.groupby(["tipo_lesion", "mecanismo"], observed=True).size()
+        .reset_index(name="total")
+    )
+    tipo_mecanismo = tipo_mecanismo[tipo_mecanismo["total"] > 0].reset_index(drop=True)
+
+    recidivas = lesiones["es_recidiva"].map({True: "Recidiva", False: "Nueva"}).value_counts()
+    recidivas = recidivas.rename_axis("tipo").reset_index(name="total")
+
+    dias_baja = lesiones.loc[lesiones["dias_baja_estimado"].notna(),
+                             ["impacto_dias_baja_estimado", "dias_baja_estimado"]].reset_index(drop=True)
+    dias = pd.to_numeric(dias_baja["dias_baja_estimado"], errors="coerce").dropna()
+    resumen_dias_baja = {
+        "total": float(dias.sum()),
+        "media": float(dias.mean()) if not dias.empty else None,
+        "mediana": float(dias.median()) if not dias.empty else None,
+        "p25": float(dias.quantile(0.25)) if not dias.empty else None,
+        "p75": float(dias.quantile(0.75)) if not dias.empty else None,
+        "max": float(dias.max()) if not dias.empty else None,
+    }
+
+    return PerfilJugadora(
+        id_jugadora=id_jugadora,
+        tipo_lesion=tipo_lesion,
+        version=version,
+        lesiones=lesiones,
+        por_zona=_conteo(lesiones, "zona_cuerpo"),
+        por_tipo=_conteo(lesiones, "tipo_lesion"),
+        por_mecanismo=_conteo(lesiones, "mecanismo"),
+        tipo_mecanismo=tipo_mecanismo,
+        tratamientos=_tratamientos(lesiones),
+        recidivas=recidivas,
+        dias_baja=dias_baja,
+        resumen_dias_baja=resumen_dias_baja,
+    )
+
+class ProfileCache:
+    """
+    LRU de perfiles por (alcance, jugadora, tipo de lesión). Cada entrada guarda la versión
+    de la jugadora en el store (LesionesStore.snapshot_with_version): si sus lesiones cambian,
+    la siguiente lectura recalcula solo ese perfil.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_PROFILE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, id_jugadora: str, tipo_lesion: str = None, scope: RowScope = None) -> PerfilJugadora:
+        scope = current_scope() if scope is None else scope
+        store = get_lesiones_store(scope)
+        # Datos y versión de la misma sincronización (ya refleja las últimas escrituras)
+        base, version = store.snapshot_with_version(id_jugadora)
+        clave = (scope.clave, id_jugadora, tipo_lesion)
+
+        count_cache_event("perfil_jugadora", "llamadas")
+        with self._lock:
+            perfil = self._entradas.get(clave)
+            if perfil is not None and perfil.version == version:
+                self._entradas.move_to_end(clave)
+                return perfil
+
+        count_cache_event("perfil_jugadora", "fallos")
+        if base.empty:
+            lesiones = project_lesiones(pd.DataFrame(columns=COLUMNAS_LESIONES))
+        else:
+            filas = base["id_jugadora"] == id_jugadora
+            if tipo_lesion:
+                filas &= base["tipo_lesion"] == tipo_lesion
+            lesiones = project_lesiones(base[filas])
+        perfil = build_player_profile(lesiones, id_jugadora, tipo_lesion, version)
+
+        with self._lock:
+            self._entradas[clave] = perfil
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+                count_cache_event("perfil_jugadora", "expulsiones")
+        return perfil
+
+    def invalidate(self, id_jugadora: str = None) -> None:
+        """Descarta los perfiles de una jugadora (o todos)."""
+        with self._lock:
+            if id_jugadora is None:
+                self._entradas.clear()
+                return
+            for clave in [c for c in self._entradas if c[1] == id_jugadora]:
+                del self._entradas[clave]
+
+# Única instancia del proceso
+profile_cache = ProfileCache()
+
+def get_player_profile(id_jugadora: str, tipo_lesion: str = None) -> PerfilJugadora:
+    """Perfil de lesiones de una jugadora en el alcance de la sesión (ver ProfileCache)."""
+    return profile_cache.get(id_jugadora, tipo_lesion)
@@ -1,13 +1,51 @@
 import pandas as pd
 from src.db.db_connection import get_connection
+from src.db.db_utils import frame_from_cursor, fetch_all
 import streamlit as st
 import json
-from src.util.schema import MAP_POSICIONES
-from src.util.util import generar_id_lesion, contar_sesiones
+from src.util.schema import MAP_POSICIONES, aplicar_schema_lesiones
+from src.util.util import generar_id_lesion
+from src.db.db_cache import cached_loader, invalidate_tables
+from src.db.db_scope import current_scope
+from src.db.db_store import get_lesiones_store, prepare_lesiones, LESIONES_BASE_QUERY
+from src.db.db_summary import TABLAS_RESUMEN, summary_rows, apply_summary_delta
 
 import json
 import streamlit as st
 
+# Columnas (y orden) que exponen los loaders a partir del store de lesiones
+COLUMNAS_LESIONES = [
+    "id", "id_lesion", "id_jugadora", "posicion_lesion", "fecha_lesion", "lugar", "segmento",
+    "zona_cuerpo", "zona_especifica", "lateralidad", "tipo_lesion", "tipo_especifico",
+    "es_recidiva", "tipo_recidiva", "dias_baja_estimado", "impacto_dias_baja_estimado",
+    "mecanismo", "tipo_tratamiento", "personal_reporta", "fecha_alta_diagnostico",
+    "fecha_alta_deportiva", "fecha_alta_medica", "fecha_observacion_activa",
+    "fecha_observacion_inactiva", "estado_lesion", "diagnostico", "descripcion",
+    "fecha_hora_registro", "usuario", "sesiones"
+]
+
+COLUMNAS_LESIONES_JUGADORAS = [
+    "id", "id_lesion", "id_jugadora", "nombre", "apellido", "plantel", "posicion",
+    "fecha_lesion", "estado_lesion", "diagnostico", "dias_baja_estimado",
+    "impacto_dias_baja_estimado", "mecanismo_id", "mecanismo", "tipo_lesion", "tipo_especifico",
+    "lugar_id", "lugar", "segmento_id", "segmento", "zona_cuerpo_id", "zona_cuerpo",
+    "zona_especifica_id", "zona_especifica", "lateralidad", "es_recidiva", "tipo_recidiva",
+    "tipo_tratamiento", "personal_reporta", "fecha_alta_diagnostico", "fecha_alta_medica",
+    "fecha_alta_deportiva", "descripcion", "fecha_hora_registro", "usuario", "sesiones"
+]
+
+# Columnas de 'lesiones' que aceptan save_lesion y la importación masiva (según DDL)
+COLUMNAS_VALIDAS_LESION = frozenset({
+    "id_lesion", "id_jugadora", "posicion", "fecha_lesion", "lugar_id",
+    "segmento_id", "zona_cuerpo_id", "zona_especifica_id", "lateralidad",
+    "tipo_lesion_id", "tipo_especifico_id", "es_recidiva", "tipo_recidiva",
+    "dias_baja_estimado", "impacto_dias_baja_estimado", "mecanismo_id",
+    "tipo_tratamiento", "personal_reporta", "fecha_alta_diagnostico",
+    "fecha_observacion_activa", "fecha_observacion_inactiva", "fecha_alta_medica",
+    "fecha_alta_deportiva", "estado_lesion",
+    "diagnostico", "descripcion", "fecha_hora_registro", "usuario"
+})
+
 def save_lesion(data: dict, modo: str = "nuevo") -> bool:
     """
     Inserta o actualiza una lesión en la base de datos 'lesiones'.
@@ -25,28 +63,21 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
         st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
         return False
 
+    cursor = None
     try:
         cursor = conn.cursor(dictionary=True)
 
         # ============================================================
         # 🔹 Validación de columnas según DDL
         # ============================================================
-        columnas_validas = {
-            "id_lesion", "id_jugadora", "posicion", "fecha_lesion", "lugar_id",
-            "segmento_id", "zona_cuerpo_id", "zona_especifica_id", "lateralidad",
-            "tipo_lesion_id", "tipo_especifico_id", "es_recidiva", "tipo_recidiva",
-            "dias_baja_estimado", "impacto_dias_baja_estimado", "mecanismo_id",
-            "tipo_tratamiento", "personal_reporta", "fecha_alta_diagnostico",
-            "fecha_observacion_activa", "fecha_observacion_inactiva", "fecha_alta_medica", 
-            "fecha_alta_deportiva", "estado_lesion",
-            "diagnostico", "descripcion", "evolucion", "fecha_hora_registro", "usuario"
-        }
+        columnas_validas = COLUMNAS_VALIDAS_LESION
+
+        # --- Sesión de evolución a añadir (solo en modo editar) ---
+        nueva_sesion = data.pop("nueva_sesion", None)
 
         # --- Serializar campos JSON ---
         if isinstance(data.get("tipo_tratamiento"), (list, dict)):
             data["tipo_tratamiento"] = json.dumps(data["tipo_tratamiento"], ensure_ascii=False)
-        if isinstance(data.get("evolucion"), (list, dict)):
-            data["evolucion"] = json.dumps(data["evolucion"], ensure_ascii=False)
 
         # --- Limpiar campos no válidos ---
         data = {k: v for k, v in data.items() if k in columnas_validas or k == "nombre"}
@@ -56,8 +87,8 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
         # ============================================================
         if modo == "nuevo":
             nombre_jugadora = data.get("nombre", "")
-            id_last = get_ultima_lesion_id_por_jugadora(data["id_jugadora"])
-            id_lesion = generar_id_lesion(nombre_jugadora, data["id_jugadora"], id_last)
+            numero = reservar_numero_lesion(cursor, data["id_jugadora"])
+            id_lesion = generar_id_lesion(nombre_jugadora, data["id_jugadora"], numero=numero)
             data["id_lesion"] = id_lesion
             data.pop("nombre", None)
 
@@ -70,12 +101,14 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
             """
 
             cursor.execute(query_insert, data)
+            apply_summary_delta(cursor, sumar=summary_rows(cursor, [id_lesion]))
             conn.commit()
+            invalidate_tables("lesiones", "lesiones_secuencia", *TABLAS_RESUMEN)
             #st.success(f":material/done_all: Lesión **{data['id_lesion']}** insertada correctamente.")
             return True
 
         # ============================================================
-        # 🟡 MODO EDITAR → UPDATE (ya viene con evolución completa)
+        # 🟡 MODO EDITAR → UPDATE (+ INSERT de la nueva sesión, si la hay)
         # ============================================================
         elif modo == "editar":
             id_lesion = data.get("id_lesion")
@@ -84,7 +117,7 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
                 return False
 
             params = {
-                "evolucion": data.get("evolucion"),
+                "incremento_sesiones": 1 if nueva_sesion else 0,
                 "fecha_observacion_activa": data.get("fecha_observacion_activa"),
                 "fecha_observacion_inactiva": data.get("fecha_observacion_inactiva"),
                 "fecha_alta_medica": data.get("fecha_alta_medica"),
@@ -97,7 +130,7 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
             query_update = """
             UPDATE lesiones
             SET
-                evolucion = %(evolucion)s,
+                sesiones = sesiones + %(incremento_sesiones)s,
                 fecha_alta_medica = %(fecha_alta_medica)s,
                 fecha_alta_deportiva = %(fecha_alta_deportiva)s,
                 fecha_observacion_activa = %(fecha_observacion_activa)s,
@@ -115,8 +148,20 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
                 st.code(query_update, language="sql")
                 st.json(params)
 
+            # Estado de la lesión en el resumen antes del UPDATE (de las columnas que cuenta, solo cambia el estado).
+            # La lectura bloquea la fila: otra edición simultánea espera a este commit.
+            antes = summary_rows(cursor, [id_lesion])
             cursor.execute(query_update, params)
+
+            # Una sesión = una fila; misma transacción que el contador
+            if nueva_sesion:
+                insert_evolucion(cursor, id_lesion, nueva_sesion)
+
+            # El estado puede cambiar: delta del resumen en la misma transacción
+            despues = [dict(fila, estado_lesion=params["estado_lesion"]) for fila in antes]
+            apply_summary_delta(cursor, sumar=despues, restar=antes)
             conn.commit()
+            invalidate_tables("lesiones", *TABLAS_RESUMEN, *(["lesion_evolucion"] if nueva_sesion else []))
             #st.success(f":material/done_all: Lesión **{id_lesion}** actualizada correctamente.")
             return True
 
@@ -139,233 +184,283 @@ def save_lesion(data: dict, modo: str = "nuevo") -> bool:
         if conn:
             conn.close()
 
-def load_lesiones_db(as_df=True):
+def insert_evolucion(cursor, id_lesion: str, sesion: dict) -> None:
     """
-    Carga todos los registros de la tabla 'lesiones' sin cache persistente.
-    Incluye joins con catálogos relacionados.
+    Inserta una sesión de seguimiento en 'lesion_evolucion' usando el cursor recibido
+    (el commit queda a cargo de quien llama, junto con el UPDATE del contador).
+    """
+    tratamiento = sesion.get("tratamiento_aplicado")
+    if isinstance(tratamiento, (list, dict)):
+        tratamiento = json.dumps(tratamiento, ensure_ascii=False)
+
+    cursor.execute("""
+    INSERT INTO lesion_evolucion
+        (id_lesion, fecha_control, tratamiento_aplicado, personal_seguimiento,
+         observaciones, fecha_hora_registro, usuario)
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+    """, (
+        id_lesion,
+        sesion.get("fecha_control"),
+        tratamiento,
+        sesion.get("personal_seguimiento"),
+        sesion.get("observaciones"),
+        sesion.get("fecha_hora_registro"),
+        sesion.get("usuario"),
+    ))
+
+def load_evolucion_db(id_lesion: str) -> list[dict]:
+    """
+    Devuelve las sesiones de seguimiento de una lesión (más reciente primero).
+    Solo se consulta al abrir el detalle de una lesión; los listados usan 'sesiones'.
+    El resultado queda en result_cache hasta la próxima escritura en 'lesion_evolucion'.
+    """
+    query = """
+    SELECT fecha_control, tratamiento_aplicado, personal_seguimiento,
+           observaciones, usuario, fecha_hora_registro
+    FROM lesion_evolucion
+    WHERE id_lesion = %s
+    ORDER BY fecha_hora_registro DESC, id DESC;
     """
-    conn = get_connection()
-    if not conn:
-        st.error(":material/warning: No se pudo conectar a la base de datos.")
-        return pd.DataFrame() if as_df else []
 
-    try:
-        query = """
-        SELECT 
-            l.id,
-            l.id_lesion,
-            l.id_jugadora AS id_jugadora,
-            l.posicion,
-            l.fecha_lesion,
-            lu.nombre AS lugar,
-            s.nombre AS segmento,
-            z.nombre AS zona_cuerpo,
-            za.nombre AS zona_especifica,
-            l.lateralidad,
-            t.nombre AS tipo_lesion,
-            te.nombre AS tipo_especifico,
-            l.es_recidiva,
-            l.tipo_recidiva,
-            l.dias_baja_estimado,
-            l.impacto_dias_baja_estimado,
-            m.nombre AS mecanismo,
-            l.tipo_tratamiento,
-            l.personal_reporta,
-            l.fecha_alta_diagnostico,
-            l.fecha_alta_deportiva,
-            l.fecha_alta_medica,
-            l.fecha_observacion_activa,
-            l.fecha_observacion_inactiva,
-            l.estado_lesion,
-            l.diagnostico,
-            l.descripcion,
-            l.evolucion,
-            l.fecha_hora_registro,
-            l.usuario
-        FROM lesiones l
-        LEFT JOIN lugares lu ON l.lugar_id = lu.id
-        LEFT JOIN segmentos_corporales s ON l.segmento_id = s.id
-        LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
-        LEFT JOIN zonas_anatomicas za ON l.zona_especifica_id = za.id
-        LEFT JOIN tipo_lesion t ON l.tipo_lesion_id = t.id
-        LEFT JOIN tipo_especifico_lesion te ON l.tipo_especifico_id = te.id
-        LEFT JOIN mecanismos m ON l.mecanismo_id = m.id
-        ORDER BY l.fecha_hora_registro DESC;
-        """
+    # fetch_all devuelve copias: se pueden decodificar en sitio sin tocar la caché
+    sesiones = fetch_all(query, (id_lesion,), cache=True, readonly=True)
+    if sesiones is None:
+        st.error(":material/warning: Error al cargar la evolución de la lesión.")
+        return []
 
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows)
-        cursor.close()
+    for sesion in sesiones:
+        tratamiento = sesion.get("tratamiento_aplicado")
+        if isinstance(tratamiento, (str, bytes)):
+            try:
+                sesion["tratamiento_aplicado"] = json.loads(tratamiento)
+            except json.JSONDecodeError:
+                pass
+
+    return sesiones
+
+def project_lesiones(base: pd.DataFrame) -> pd.DataFrame:
+    """Proyecta un DataFrame de LESIONES_BASE_QUERY al formato de load_lesiones_db."""
+    return base[COLUMNAS_LESIONES].rename(columns={"posicion_lesion": "posicion"})
 
-        if not rows:
+def load_lesiones_db(as_df=True):
+    """
+    Devuelve todos los registros de la tabla 'lesiones' con los nombres de los catálogos.
+    Los datos salen del store compartido del alcance de la sesión (ver src/db/db_store.py
+    y src/db/db_scope.py), que solo consulta a la base de datos las filas modificadas
+    desde la última sincronización.
+    """
+    try:
+        base = get_lesiones_store(current_scope()).snapshot()
+
+        if base.empty:
             st.info(":material/info: No existen registros de lesiones en la base de datos.")
             st.stop()
-        
-        df["sesiones"] = df["evolucion"].apply(contar_sesiones)
-        df["posicion"] = df["posicion"].map(MAP_POSICIONES).fillna(df["posicion"])
 
-        if st.session_state["auth"]["rol"].lower() == "developer":
-            df = df[df["usuario"]=="developer"]
-        else:
-            df = df[df["usuario"]!="developer"]
+        df = project_lesiones(base)
 
         return df if as_df else df.to_dict(orient="records")
     except Exception as e:
         st.error(f":material/warning: Error al cargar lesiones: {e}")
         return pd.DataFrame() if as_df else []
-    finally:
-        conn.close()
 
-def get_ultima_lesion_id_por_jugadora(id_jugadora: str) -> str | None:
+def reservar_numero_lesion(cursor, id_jugadora: str, cantidad: int = 1) -> int:
     """
-    Devuelve el ID de la última lesión registrada de una jugadora.
-    Si no tiene lesiones, retorna None.
+    Reserva los siguientes `cantidad` números de lesión de una jugadora en 'lesiones_secuencia'
+    y devuelve el último (los reservados son ultimo - cantidad + 1 ... ultimo).
+
+    Se ejecuta con el cursor de la transacción del INSERT: el upsert bloquea la fila
+    de la jugadora hasta el commit, así que dos registros simultáneos nunca obtienen
+    el mismo número. LAST_INSERT_ID(expr) devuelve el valor en el mismo round trip
+    (cursor.lastrowid), sin un SELECT adicional.
     """
+    cursor.execute("""
+    INSERT INTO lesiones_secuencia (id_jugadora, ultimo)
+    VALUES (%s, LAST_INSERT_ID(%s))
+    ON DUPLICATE KEY UPDATE ultimo = LAST_INSERT_ID(ultimo + %s);
+    """, (id_jugadora, cantidad, cantidad))
+    return int(cursor.lastrowid)
+
+def _records_plus_players(base: pd.DataFrame) -> pd.DataFrame:
+    """Proyecta un DataFrame de LESIONES_BASE_QUERY al formato de get_records_plus_players_db."""
+    df = base[COLUMNAS_LESIONES_JUGADORAS].rename(columns={"id": "id_registro"})
+
+    # Crear columna nombre_jugadora
+    df["nombre_jugadora"] = (
+        df["nombre"].fillna("") + " " + df["apellido"].fillna("")
+    ).str.strip()
+
+    # Reordenar columnas
+    columnas = df.columns.tolist()
+    if "id_jugadora" in columnas and "nombre_jugadora" in columnas:
+        idx = columnas.index("id_jugadora") + 1
+        columnas.insert(idx, columnas.pop(columnas.index("nombre_jugadora")))
+    if "posicion" in columnas and "plantel" in columnas:
+        idx = columnas.index("posicion") + 1
+        columnas.insert(idx, columnas.pop(columnas.index("plantel")))
+
+    return df[columnas]
 
-    conn = get_connection()
+def get_records_plus_players_db(plantel: str = None) -> pd.DataFrame:
+    """
+    Devuelve todas las lesiones junto con los datos de las jugadoras.
+    Si no hay registros, devuelve un DataFrame vacío.
+
+    Combina:
+    - lesiones
+    - futbolistas (nombre, apellido, competicion)
+    - informacion_futbolistas (posicion, altura, peso)
+
+    Los datos salen del store compartido de lesiones del alcance de la sesión (ver src/db/db_store.py).
+    """
+    try:
+        base = get_lesiones_store(current_scope()).snapshot()
+
+        if base.empty:
+            st.info(":material/info: No existen registros de lesiones en la base de datos.")
+            st.stop()
+
+        # Filtrar por plantel si se indica
+        if plantel:
+            base = base[base["plantel"] == plantel]
+
+        df = _records_plus_players(base)
+
+        return df
+
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar registros y jugadoras: {e}")
+        return pd.DataFrame()
+
+def build_lesiones_where(plantel: str = None, posicion: str = None, tipo_lesion: str = None,
+                         fecha_inicio=None, fecha_fin=None) -> tuple[str, list]:
+    """
+    Construye la cláusula WHERE (con placeholders) para los filtros de lesiones.
+    Los alias corresponden a LESIONES_BASE_QUERY (l, f, i, t).
+
+    - plantel: código de competición (futbolistas.competicion).
+    - posicion: nombre ("Portera") o código ("POR") de la posición.
+    - tipo_lesion: nombre del tipo de lesión.
+    - fecha_inicio / fecha_fin: rango cerrado sobre fecha_lesion.
+
+    Retorna:
+        (str, list): cláusula "WHERE ..." y lista de parámetros.
+    """
+    # Alcance de filas de la sesión (registros developer, ...), ver src/db/db_scope.py
+    scope = current_scope()
+    condiciones = [f"({c})" for c in scope.condiciones]
+    params = list(scope.params)
+
+    if plantel:
+        condiciones.append("f.competicion = %s")
+        params.append(plantel)
+
+    if posicion:
+        codigos = {v: k for k, v in MAP_POSICIONES.items()}
+        condiciones.append("i.posicion = %s")
+        params.append(codigos.get(posicion, posicion))
+
+    if tipo_lesion:
+        condiciones.append("t.nombre = %s")
+        params.append(tipo_lesion)
+
+    if fecha_inicio:
+        condiciones.append("l.fecha_lesion >= %s")
+        params.append(fecha_inicio)
+
+    if fecha_fin:
+        condiciones.append("l.fecha_lesion <= %s")
+        params.append(fecha_fin)
+
+    # Sin condiciones se devuelve igualmente un WHERE: los llamadores añaden "AND ..."
+    return "WHERE " + (" AND ".join(condiciones) or "1 = 1"), params
+
+def load_lesiones_filtradas_db(plantel: str = None, posicion: str = None, tipo_lesion: str = None,
+                               fecha_inicio=None, fecha_fin=None) -> pd.DataFrame:
+    """
+    Devuelve solo las lesiones que cumplen los filtros (aplicados en SQL),
+    con el mismo formato que get_records_plus_players_db.
+    """
+    conn = get_connection(readonly=True)
     if not conn:
         st.error(":material/warning: No se pudo conectar a la base de datos.")
-        return None
+        return pd.DataFrame()
 
+    cursor = None
     try:
-        query = """
-        SELECT id_lesion
-        FROM lesiones
-        WHERE id_jugadora = %s
-        ORDER BY COALESCE(fecha_hora_registro, fecha_lesion) DESC
-        LIMIT 1;
-        """
+        where, params = build_lesiones_where(plantel, posicion, tipo_lesion, fecha_inicio, fecha_fin)
+        query = f"{LESIONES_BASE_QUERY} {where} ORDER BY l.fecha_hora_registro DESC;"
 
         cursor = conn.cursor()
-        cursor.execute(query, (id_jugadora,))
-        result = cursor.fetchone()
+        cursor.execute(query, tuple(params))
+        df = frame_from_cursor(cursor)
 
-        return result[0] if result else None
+        if df.empty:
+            return df
 
-    except Exception as e:
-        st.error(f":material/warning: Error al obtener el ID de la última lesión: {e}")
-        return None
+        return _records_plus_players(aplicar_schema_lesiones(prepare_lesiones(df)))
 
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar lesiones filtradas: {e}")
+        return pd.DataFrame()
     finally:
-        if conn:
-            conn.close()
+        if cursor:
+            cursor.close()
+        conn.close()
 
-def get_records_plus_players_db(plantel: str = None) -> pd.DataFrame:
+def load_opciones_filtro_lesiones_db(plantel: str = None,
+                                     posicion: str = None) -> tuple[list[str], dict]:
     """
-    Devuelve todas las lesiones junto con los datos de las jugadoras.
-    Si no hay registros, devuelve un DataFrame vacío.
+    Valores para los widgets dependientes del filtro de lesiones, en una sola consulta:
+    - tipos de lesión existentes para plantel + posición.
+    - (fecha mínima, fecha máxima) de fecha_lesion por tipo; la clave None es el rango
+      de todos los tipos (incluidas las lesiones sin tipo).
 
-    Combina:
-    - lesiones
-    - futbolistas (nombre, apellido, competicion)
-    - informacion_futbolistas (posicion, altura, peso)
+    Retorna:
+        (list[str], dict[str | None, (date | None, date | None)])
     """
-
-    conn = get_connection()
+    conn = get_connection(readonly=True)
     if not conn:
         st.error(":material/warning: No se pudo conectar a la base de datos.")
-        return pd.DataFrame()
+        return [], {}
 
-    try:
-        query = """
-        SELECT 
-            l.id AS id_registro,
-            l.id_lesion,
-            l.id_jugadora AS id_jugadora,
-            f.nombre,
-            f.apellido,
-            f.competicion AS plantel,
-            i.posicion,
-            l.fecha_lesion,
-            l.estado_lesion,
-            l.diagnostico,
-            l.dias_baja_estimado,
-            l.impacto_dias_baja_estimado,
-            l.mecanismo_id,
-            m.nombre AS mecanismo,
-            t.nombre AS tipo_lesion,
-            te.nombre AS tipo_especifico,
-            l.lugar_id,
-            lu.nombre AS lugar,
-            l.segmento_id,
-            s.nombre AS segmento,
-            l.zona_cuerpo_id,
-            z.nombre AS zona_cuerpo,
-            l.zona_especifica_id,
-            za.nombre AS zona_especifica,
-            l.lateralidad,
-            l.es_recidiva,
-            l.tipo_recidiva,
-            l.tipo_tratamiento,
-            l.personal_reporta,
-            l.fecha_alta_diagnostico,
-            l.fecha_alta_medica,
-            l.fecha_alta_deportiva,
-            l.descripcion,
-            l.evolucion,
-            l.fecha_hora_registro,
-            l.usuario
-        FROM lesiones l
-        LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
-        LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
-        LEFT JOIN lugares lu ON l.lugar_id = lu.id
-        LEFT JOIN mecanismos m ON l.mecanismo_id = m.id
-        LEFT JOIN tipo_lesion t ON l.tipo_lesion_id = t.id
-        LEFT JOIN tipo_especifico_lesion te ON l.tipo_especifico_id = te.id
-        LEFT JOIN segmentos_corporales s ON l.segmento_id = s.id
-        LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
-        LEFT JOIN zonas_anatomicas za ON l.zona_especifica_id = za.id
-        ORDER BY l.fecha_hora_registro DESC;
-        """
+    joins = """
+    FROM lesiones l
+    LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
+    LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
+    LEFT JOIN tipo_lesion t ON l.tipo_lesion_id = t.id
+    """
 
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows)
-        cursor.close()
+    cursor = None
+    try:
+        cursor = conn.cursor()
 
-        if not rows:
-            st.info(":material/info: No existen registros de lesiones en la base de datos.")
-            st.stop()
+        where, params = build_lesiones_where(plantel, posicion)
+        cursor.execute(
+            f"SELECT t.nombre, MIN(l.fecha_lesion), MAX(l.fecha_lesion) {joins} {where} "
+            "GROUP BY t.nombre ORDER BY t.nombre;",
+            tuple(params)
+        )
+        filas = cursor.fetchall()
 
-        # Crear columna nombre_jugadora
-        df["nombre_jugadora"] = (
-            df["nombre"].fillna("") + " " + df["apellido"].fillna("")
-        ).str.strip()
+        tipos = [nombre for nombre, _, _ in filas if nombre is not None]
+        rangos = {nombre: (min_fecha, max_fecha) for nombre, min_fecha, max_fecha in filas if nombre is not None}
 
-        # Reordenar columnas
-        columnas = df.columns.tolist()
-        if "id_jugadora" in columnas and "nombre_jugadora" in columnas:
-            idx = columnas.index("id_jugadora") + 1
-            columnas.insert(idx, columnas.pop(columnas.index("nombre_jugadora")))
-        if "posicion" in columnas and "plantel" in columnas:
-            idx = columnas.index("posicion") + 1
-            columnas.insert(idx, columnas.pop(columnas.index("plantel")))
-
-        df = df[columnas]
-        df["posicion"] = df["posicion"].map(MAP_POSICIONES).fillna(df["posicion"])
-        df["sesiones"] = df["evolucion"].apply(contar_sesiones)
-        
-        # Filtrar por plantel si se indica
-        if plantel:
-            df = df[df["plantel"] == plantel]
+        # Rango sin filtro de tipo: extremos de todos los grupos
+        minimos = [min_fecha for _, min_fecha, _ in filas if min_fecha is not None]
+        maximos = [max_fecha for _, _, max_fecha in filas if max_fecha is not None]
+        rangos[None] = (min(minimos, default=None), max(maximos, default=None))
 
-        if st.session_state["auth"]["rol"].lower() == "developer":
-            df = df[df["usuario"]=="developer"]
-        else:
-            df = df[df["usuario"]!="developer"]
-        
-        return df
+        return tipos, rangos
 
     except Exception as e:
-        st.error(f":material/warning: Error al cargar registros y jugadoras: {e}")
-        return pd.DataFrame()
+        st.error(f":material/warning: Error al cargar opciones de filtro: {e}")
+        return [], {}
     finally:
+        if cursor:
+            cursor.close()
         conn.close()
 
-@st.cache_data(ttl=3600)  # cachea por 1 hora (ajústalo según tu frecuencia de actualización)
+@cached_loader(["futbolistas", "informacion_futbolistas"], ttl=3600)  # cachea por 1 hora; se invalida al escribir
 def load_jugadoras_db() -> tuple[pd.DataFrame | None, str | None]:
     """
     Carga jugadoras desde la base de datos (futbolistas + informacion_futbolistas).
@@ -373,7 +468,7 @@ def load_jugadoras_db() -> tuple[pd.DataFrame | None, str | None]:
     Devuelve:
         tuple: (DataFrame o None, mensaje de error o None)
     """
-    conn = get_connection()
+    conn = get_connection(readonly=True)
     if not conn:
         print("No se pudo conectar a la base de datos.")
         return None, ":material/warning: No se pudo conectar a la base de datos."
@@ -400,10 +495,9 @@ def load_jugadoras_db() -> tuple[pd.DataFrame | None, str | None]:
         ORDER BY f.nombre ASC;
         """
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute(query)
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows)
+        df = frame_from_cursor(cursor)
         cursor.close()
 
         # Limpiar y preparar los datos
@@ -434,7 +528,7 @@ def load_jugadoras_db() -> tuple[pd.DataFrame | None, str | None]:
         #print("Cerrando conexión a la base de datos.")
         conn.close()
 
-@st.cache_data(ttl=3600)  # cachea por 1 hora
+@cached_loader(["plantel"], ttl=3600)  # cachea por 1 hora; se invalida al escribir
 def load_competiciones_db() -> tuple[pd.DataFrame | None, str | None]:
     """
     Carga competiciones desde la base de datos (tabla 'plantel').
@@ -442,7 +536,7 @@ def load_competiciones_db() -> tuple[pd.DataFrame | None, str | None]:
     Devuelve:
         tuple: (DataFrame o None, mensaje de error o None)
     """
-    conn = get_connection()
+    conn = get_connection(readonly=True)
     if not conn:
         return None, ":material/warning: No se pudo conectar a la base de datos."
 
@@ -456,10 +550,9 @@ def load_competiciones_db() -> tuple[pd.DataFrame | None, str | None]:
         ORDER BY nombre ASC;
         """
 
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         cursor.execute(query)
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows)
+        df = frame_from_cursor(cursor)
         cursor.close()
 
         if df.empty:
@@ -480,35 +573,3 @@ def load_competiciones_db() -> tuple[pd.DataFrame | None, str | None]:
 
     finally:
         conn.close()
-
-def delete_lesiones(ids: list[int]) -> tuple[bool, str]:
-    """
-    Elimina múltiples lesiones desde la base de datos.
-
-    Parámetros:
-        ids (list[int]): lista de IDs de lesiones a eliminar.
-
-    Retorna:
-        (bool, str): (éxito, mensaje)
-    """
-    if not ids:
-        return False, "No se proporcionaron IDs de lesiones."
-    
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Construir la query dinámica con placeholders
-        query = f"DELETE FROM lesiones WHERE id_lesion IN ({','.join(['%s'] * len(ids))})"
-        cursor.execute(query, tuple(ids))
-        conn.commit()
-
-        cursor.close()
-        conn.close()
-
-        return True, f"Se eliminaron {cursor.rowcount} registro(s) correctamente."
-
-    except Exception as e:
-        print(f"Error al eliminar lesiones: {e}")
-        st.error(f":material/warning: Error al eliminar lesiones: {e}")
-        return False, f":material/warning: Error al eliminar lesiones: {e}"
@@ -0,0 +1,94 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+
+import streamlit as st
+
+# Reglas registradas con @scope_rule, en orden de registro
+_RULES = []
+
+_lock = threading.Lock()
+
+@dataclass(frozen=True)
+class RowScope:
+    """
+    Alcance de filas de lesiones que puede ver un usuario: condiciones SQL (unidas con AND)
+    y sus parámetros. Las condiciones usan los alias de LESIONES_BASE_QUERY
+    ('l' = lesiones, 'f' = futbolistas, 'i' = informacion_futbolistas).
+
+    Es inmutable y comparable: dos usuarios con el mismo alcance comparten el store
+    de lesiones (ver get_lesiones_store).
+    """
+    condiciones: tuple[str, ...] = ()
+    params: tuple = ()
+
+    @property
+    def clave(self) -> str:
+        """Identificador estable del alcance (clave del store y de las cachés)."""
+        if not self.condiciones:
+            return "todo"
+        texto = repr((self.condiciones, self.params))
+        return hashlib.sha1(texto.encode()).hexdigest()[:12]
+
+    def sql(self, prefijo: str = "WHERE") -> str:
+        """Cláusula con las condiciones entre paréntesis; cadena vacía si no hay alcance."""
+        if not self.condiciones:
+            return ""
+        return f"{prefijo} " + " AND ".join(f"({c})" for c in self.condiciones)
+
+# Sin restricciones: todas las filas (procesos sin sesión, importación, migraciones)
+SIN_ALCANCE = RowScope()
+
+def scope_rule(func):
+    """
+    Registra una regla de alcance `fn(auth) -> (condición, params) | None`, donde `auth`
+    es st.session_state["auth"]. Devolver None significa que la regla no restringe.
+
+        @scope_rule
+        def _planteles_staff(auth):
+            planteles = auth.get("planteles")
+            if not planteles:
+                return None
+            return f"f.competicion IN ({', '.join(['%s'] * len(planteles))})", list(planteles)
+
+    Las condiciones deben poder usar un índice (ver data/migrations).
+    """
+    with _lock:
+        if func not in _RULES:
+            _RULES.append(func)
+    return func
+
+def build_scope(auth: dict) -> RowScope:
+    """Aplica todas las reglas registradas a los datos de sesión indicados."""
+    condiciones, params = [], []
+    with _lock:
+        rules = list(_RULES)
+
+    for rule in rules:
+        resultado = rule(auth or {})
+        if resultado is None:
+            continue
+        condicion, valores = resultado
+        condiciones.append(condicion)
+        params.extend(valores)
+
+    return RowScope(tuple(condiciones), tuple(params))
+
+def current_scope() -> RowScope:
+    """Alcance de la sesión actual de Streamlit."""
+    return build_scope(st.session_state.get("auth", {}))
+
+@scope_rule
+def _registros_developer(auth: dict):
+    # Los registros de prueba del rol developer solo los ve ese rol.
+    # Solo la condición del developer (l.usuario = %s) puede usar idx_lesiones_usuario_fecha;
+    # la del resto de roles (IS NULL OR <>) no usa índice: descarta pocas filas y se evalúa
+    # como filtro sobre las que seleccionan los demás índices (o sobre un recorrido completo).
+    if (auth.get("rol") or "").lower() == "developer":
+        return "l.usuario = %s", ["developer"]
+    return "l.usuario IS NULL OR l.usuario <> %s", ["developer"]
+
+@scope_rule
+def _sin_eliminadas(auth: dict):
+    # Lesiones con borrado lógico pendientes de purga (ver src/db/db_delete.py)
+    return "l.deleted_at IS NULL", []
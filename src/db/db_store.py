@@ -0,0 +1,299 @@
+import datetime
+import threading
+import time
+import weakref
+
+import pandas as pd
+import streamlit as st
+
+from src.db.db_connection import get_connection
+from src.db.db_cache import on_invalidate
+from src.db.db_scope import RowScope, SIN_ALCANCE
+from src.db.db_utils import frame_from_cursor
+from src.util.schema import MAP_POSICIONES, aplicar_schema_lesiones
+
+# Solapamiento aplicado a la marca de agua para no perder filas confirmadas
+# justo después de leer NOW() en el servidor (la fusión es idempotente).
+SYNC_OVERLAP = datetime.timedelta(seconds=5)
+
+# Tiempo mínimo entre dos sincronizaciones: evita varias consultas en el mismo rerun.
+MIN_SYNC_INTERVAL = 2.0
+
+# Consulta base con la unión de columnas que necesitan load_lesiones_db
+# y get_records_plus_players_db.
+LESIONES_BASE_QUERY = """
+SELECT
+    l.id,
+    l.id_lesion,
+    l.id_jugadora AS id_jugadora,
+    f.nombre,
+    f.apellido,
+    f.competicion AS plantel,
+    i.posicion,
+    l.posicion AS posicion_lesion,
+    l.fecha_lesion,
+    l.lugar_id,
+    lu.nombre AS lugar,
+    l.segmento_id,
+    s.nombre AS segmento,
+    l.zona_cuerpo_id,
+    z.nombre AS zona_cuerpo,
+    l.zona_especifica_id,
+    za.nombre AS zona_especifica,
+    l.lateralidad,
+    t.nombre AS tipo_lesion,
+    te.nombre AS tipo_especifico,
+    l.es_recidiva,
+    l.tipo_recidiva,
+    l.dias_baja_estimado,
+    l.impacto_dias_baja_estimado,
+    l.mecanismo_id,
+    m.nombre AS mecanismo,
+    l.tipo_tratamiento,
+    l.personal_reporta,
+    l.fecha_alta_diagnostico,
+    l.fecha_alta_deportiva,
+    l.fecha_alta_medica,
+    l.fecha_observacion_activa,
+    l.fecha_observacion_inactiva,
+    l.estado_lesion,
+    l.diagnostico,
+    l.descripcion,
+    l.sesiones,
+    l.fecha_hora_registro,
+    l.usuario
+FROM lesiones l
+LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
+LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
+LEFT JOIN lugares lu ON l.lugar_id = lu.id
+LEFT JOIN segmentos_corporales s ON l.segmento_id = s.id
+LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
+LEFT JOIN zonas_anatomicas za ON l.zona_especifica_id = za.id
+LEFT JOIN tipo_lesion t ON l.tipo_lesion_id = t.id
+LEFT JOIN tipo_especifico_lesion te ON l.tipo_especifico_id = te.id
+LEFT JOIN mecanismos m ON l.mecanismo_id = m.id
+"""
+
+def prepare_lesiones(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnas derivadas de LESIONES_BASE_QUERY (solo se calculan para las filas recibidas).
+    Se ejecuta antes de aplicar_schema_lesiones: el mapeo de posiciones trabaja sobre texto.
+    """
+    if df.empty:
+        return df
+
+    df["posicion"] = df["posicion"].map(MAP_POSICIONES).fillna(df["posicion"])
+    df["posicion_lesion"] = df["posicion_lesion"].map(MAP_POSICIONES).fillna(df["posicion_lesion"])
+    return df
+
+class LesionesStore:
+    """
+    Copia en memoria, compartida por todo el proceso, de la tabla 'lesiones' con sus joins,
+    limitada a un alcance de filas (RowScope): hay un store por alcance distinto.
+
+    - La primera sincronización carga todas las filas del alcance.
+    - Las siguientes solo traen las filas cuyo `updated_at` cambió desde la última marca
+      de agua, más las lápidas de 'lesiones_eliminadas' y las filas modificadas que salieron
+      del alcance. Solo `updated_at`: lo pone el servidor (igual que la marca de agua, NOW())
+      en cada INSERT/UPDATE, mientras que `fecha_hora_registro` llega del reloj del cliente.
+    - El DataFrame interno nunca se modifica en sitio: cada sincronización publica uno nuevo,
+      así que los lectores pueden usar el snapshot sin copiarlo.
+    """
+
+    # Instancias vivas, para propagar las invalidaciones a todos los alcances
+    _instancias = weakref.WeakSet()
+
+    def __init__(self, scope: RowScope = SIN_ALCANCE, min_sync_interval: float = MIN_SYNC_INTERVAL):
+        self.scope = scope
+        self.min_sync_interval = min_sync_interval
+        self._lock = threading.Lock()
+        self._df = None
+        self._watermark = None
+        self._last_sync = 0.0
+        self._ultimo_error = None
+        # Versión de los datos por jugadora: (generación de la carga completa, cambios de esa jugadora).
+        # Permite invalidar cachés por jugadora (ver src/db/db_profiles.py).
+        self._generacion = 0
+        self._versiones = {}
+        LesionesStore._instancias.add(self)
+
+    def snapshot(self) -> pd.DataFrame:
+        """
+        Devuelve el DataFrame sincronizado (solo lectura). Si una sincronización falla se
+        sigue sirviendo la última copia válida; si nunca se pudo cargar lanza ConnectionError
+        (una caída de la base de datos no debe parecer una tabla vacía).
+        """
+        self.sync()
+        return self._cargado(self._df)
+
+    def _cargado(self, df: pd.DataFrame | None) -> pd.DataFrame:
+        if df is None:
+            raise ConnectionError(f"No se pudieron cargar las lesiones: {self._ultimo_error}")
+        return df
+
+    def sync(self, force: bool = False) -> bool:
+        """
+        Sincroniza la copia en memoria con la base de datos.
+        Retorna False si no hubo conexión (se conserva la última copia válida).
+        """
+        with self._lock:
+            if (not force and self._df is not None
+                    and time.monotonic() - self._last_sync < self.min_sync_interval):
+                return True
+
+            # Siempre en el primario: con una réplica atrasada, la marca de agua (NOW())
+            # dejaría atrás filas que aún no se habían replicado.
+            conn = get_connection()
+            if not conn:
+                self._ultimo_error = "sin conexión con la base de datos"
+                return False
+
+            cursor = None
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT NOW();")
+                ahora = cursor.fetchone()[0]
+
+                if self._df is None:
+                    cursor.execute(
+                        f"{LESIONES_BASE_QUERY} {self.scope.sql()} ORDER BY l.fecha_hora_registro DESC;",
+                        self.scope.params,
+                    )
+                    df = aplicar_schema_lesiones(prepare_lesiones(frame_from_cursor(cursor)))
+                    self._generacion += 1
+                    self._versiones = {}
+                else:
+                    desde = self._watermark - SYNC_OVERLAP
+                    delta = "l.updated_at >= %s"
+                    where = f"{self.scope.sql()} AND {delta}" if self.scope.condiciones else f"WHERE {delta}"
+                    cursor.execute(f"{LESIONES_BASE_QUERY} {where};", self.scope.params + (desde,))
+                    cambios = prepare_lesiones(frame_from_cursor(cursor))
+
+                    cursor.execute(
+                        "SELECT id_lesion FROM lesiones_eliminadas WHERE fecha_eliminacion >= %s;",
+                        (desde,),
+                    )
+                    eliminadas = [row[0] for row in cursor.fetchall()]
+                    eliminadas += self._fuera_de_alcance(cursor, desde)
+
+                    self._marcar_jugadoras(cambios, eliminadas)
+                    # La concatenación pierde las categorías si difieren: se vuelven a asignar
+                    df = aplicar_schema_lesiones(self._merge(self._df, cambios, eliminadas))
+
+                self._df = df
+                self._watermark = ahora
+                self._last_sync = time.monotonic()
+                self._ultimo_error = None
+                return True
+
+            except Exception as e:
+                print(f"Error al sincronizar lesiones: {e}")
+                self._ultimo_error = e
+                return False
+            finally:
+                if cursor:
+                    cursor.close()
+                conn.close()
+
+    def _fuera_de_alcance(self, cursor, desde) -> list:
+        """
+        id_lesion de las filas modificadas desde `desde` que ya no cumplen el alcance
+        (p. ej. cambió 'usuario'): la consulta delta las filtra, así que hay que retirarlas aparte.
+        """
+        if not self.scope.condiciones:
+            return []
+        condiciones = " AND ".join(f"({c})" for c in self.scope.condiciones)
+        cursor.execute(f"""
+        SELECT l.id_lesion
+        FROM lesiones l
+        LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
+        LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
+        WHERE l.updated_at >= %s AND ({condiciones}) IS NOT TRUE;
+        """, (desde,) + self.scope.params)
+        return [row[0] for row in cursor.fetchall()]
+
+    def _marcar_jugadoras(self, cambios: pd.DataFrame, eliminadas: list) -> None:
+        """Incrementa la versión de las jugadoras con filas modificadas o eliminadas."""
+        jugadoras = set(cambios["id_jugadora"].dropna()) if not cambios.empty else set()
+        if eliminadas and not self._df.empty:
+            jugadoras.update(self._df.loc[self._df["id_lesion"].isin(eliminadas), "id_jugadora"].dropna())
+        for id_jugadora in jugadoras:
+            self._versiones[id_jugadora] = self._versiones.get(id_jugadora, 0) + 1
+
+    def snapshot_with_version(self, id_jugadora) -> tuple[pd.DataFrame, tuple[int, int]]:
+        """
+        snapshot() y player_version(id_jugadora) de la misma sincronización: ambos se leen
+        bajo el lock, así que una sync concurrente no puede emparejar datos viejos con la versión nueva.
+        """
+        self.sync()
+        with self._lock:
+            return self._cargado(self._df), (self._generacion, self._versiones.get(id_jugadora, 0))
+
+    def player_version(self, id_jugadora) -> tuple[int, int]:
+        """
+        Versión de las lesiones de una jugadora en este store: cambia cuando se sincronizan
+        filas suyas (alta, edición, borrado) o hay una carga completa. No sincroniza.
+        """
+        return self._generacion, self._versiones.get(id_jugadora, 0)
+
+    def mark_stale(self) -> None:
+        """Fuerza que la próxima lectura sincronice (sin esperar min_sync_interval)."""
+        self._last_sync = 0.0
+
+    def reset(self) -> None:
+        """Descarta la copia en memoria; la próxima lectura hará una carga completa."""
+        with self._lock:
+            self._df = None
+            self._watermark = None
+            self._last_sync = 0.0
+
+    @staticmethod
+    def _merge(actual: pd.DataFrame, cambios: pd.DataFrame, eliminadas: list) -> pd.DataFrame:
+        """Fusiona las filas modificadas (por 'id') y elimina las lápidas."""
+        if cambios.empty and not eliminadas:
+            return actual
+
+        df = actual
+        if actual.empty:
+            df = cambios
+        elif not cambios.empty:
+            df = pd.concat([df[~df["id"].isin(cambios["id"])], cambios], ignore_index=True)
+        if eliminadas and not df.empty:
+            df = df[~df["id_lesion"].isin(eliminadas)]
+
+        if df.empty:
+            return df
+        return df.sort_values("fecha_hora_registro", ascending=False).reset_index(drop=True)
+
+    @classmethod
+    def instancias(cls) -> list["LesionesStore"]:
+        return list(cls._instancias)
+
+@st.cache_resource
+def _store_por_alcance(clave: str, _scope: RowScope) -> LesionesStore:
+    return LesionesStore(_scope)
+
+def get_lesiones_store(scope: RowScope = SIN_ALCANCE) -> LesionesStore:
+    """
+    Store de lesiones del alcance indicado, compartido por todo el proceso.
+    Las páginas usan get_lesiones_store(current_scope()); sin alcance se cargan todas las filas.
+    """
+    return _store_por_alcance(scope.clave, scope)
+
+def reset_lesiones_stores() -> None:
+    """Descarta la copia en memoria de todos los alcances (carga completa en la próxima lectura)."""
+    for store in LesionesStore.instancias():
+        store.reset()
+
+@on_invalidate(["lesiones"])
+def _on_lesiones_changed(table: str) -> None:
+    # Escritura en lesiones: basta con la sincronización incremental
+    for store in LesionesStore.instancias():
+        store.mark_stale()
+
+@on_invalidate(["futbolistas", "informacion_futbolistas", "lugares", "segmentos_corporales",
+                "zonas_segmento", "zonas_anatomicas", "tipo_lesion", "tipo_especifico_lesion", "mecanismos"])
+def _on_joined_table_changed(table: str) -> None:
+    # Cambian columnas unidas por JOIN en filas no modificadas (o qué filas entran en
+    # un alcance por plantel): recarga completa
+    reset_lesiones_stores()
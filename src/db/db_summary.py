@@ -0,0 +1,369 @@
+import argparse
+import datetime
+import sys
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from src.db.db_cache import cached_loader, cached_resource_loader, invalidate_tables
+from src.db.db_connection import db_cursor
+from src.db.db_scope import RowScope, build_scope
+
+GRANULARIDADES = ("semana", "mes")
+
+# Tablas que escriben apply_summary_delta / rebuild_summary (para invalidate_tables)
+TABLAS_RESUMEN = ("resumen_lesiones", "resumen_lesiones_zonas")
+
+# True en cuanto se comprueba que existen las tablas del resumen (ver _hay_resumen)
+_resumen_disponible = False
+
+COLUMNAS_RESUMEN = ["plantel", "alcance", "granularidad", "periodo", "total", "activas",
+                    "suma_dias_baja", "con_dias_baja", "ultima_fecha"]
+
+# Joins que necesitan las reglas de alcance (l, f, i) y la zona del cuerpo.
+# {alcances}: una columna 0/1 por alcance que indica si la lesión entra en él (ver _leer_filas).
+_RESUMEN_QUERY = """
+SELECT
+    f.competicion AS plantel,
+    l.fecha_lesion,
+    l.estado_lesion,
+    l.dias_baja_estimado,
+    z.nombre AS zona_cuerpo,
+    {alcances}
+FROM lesiones l
+LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
+LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
+LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
+"""
+
+# Deltas: se suman a la fila existente del periodo (o la crean)
+_UPSERT_RESUMEN = f"""
+INSERT INTO resumen_lesiones ({', '.join(COLUMNAS_RESUMEN)})
+VALUES ({', '.join(['%s'] * len(COLUMNAS_RESUMEN))})
+ON DUPLICATE KEY UPDATE
+    total = total + VALUES(total),
+    activas = activas + VALUES(activas),
+    suma_dias_baja = suma_dias_baja + VALUES(suma_dias_baja),
+    con_dias_baja = con_dias_baja + VALUES(con_dias_baja),
+    ultima_fecha = COALESCE(GREATEST(ultima_fecha, VALUES(ultima_fecha)), ultima_fecha, VALUES(ultima_fecha));
+"""
+
+# Tras restar lesiones, la fecha más reciente del periodo se vuelve a leer de las que quedan.
+# {condicion}: reglas del alcance de la fila (mismos alias que _RESUMEN_QUERY).
+_ULTIMA_FECHA = """
+UPDATE resumen_lesiones SET ultima_fecha = (
+    SELECT MAX(l.fecha_lesion)
+    FROM lesiones l
+    LEFT JOIN futbolistas f ON l.id_jugadora = f.identificacion
+    LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.identificacion
+    WHERE f.competicion = %s AND l.fecha_lesion >= %s AND l.fecha_lesion < %s AND {condicion}
+)
+WHERE plantel = %s AND alcance = %s AND granularidad = %s AND periodo = %s;
+"""
+
+_UPSERT_ZONAS = """
+INSERT INTO resumen_lesiones_zonas (plantel, alcance, granularidad, periodo, zona, total)
+VALUES (%s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE total = total + VALUES(total);
+"""
+
+# ==========================================================
+# 📅 Periodos
+# ==========================================================
+
+def _fecha(valor) -> datetime.date | None:
+    if valor is None:
+        return None
+    if isinstance(valor, datetime.datetime):
+        return valor.date()
+    if isinstance(valor, datetime.date):
+        return valor
+    try:
+        return datetime.date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        return None
+
+def inicio_periodo(fecha: datetime.date, granularidad: str) -> datetime.date:
+    """Lunes ISO de la semana o primer día del mes."""
+    if granularidad == "semana":
+        return fecha - datetime.timedelta(days=fecha.weekday())
+    return fecha.replace(day=1)
+
+def fin_periodo(inicio: datetime.date, granularidad: str) -> datetime.date:
+    """Primer día del periodo siguiente (límite exclusivo)."""
+    if granularidad == "semana":
+        return inicio + datetime.timedelta(days=7)
+    return (inicio.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+# ==========================================================
+# 🧮 Cálculo
+# ==========================================================
+
+def _filas_dict(cursor) -> list[dict]:
+    # El cursor de save_lesion es dictionary=True; el de delete_lesiones, de tuplas
+    filas = cursor.fetchall()
+    if filas and not isinstance(filas[0], dict):
+        columnas = cursor.column_names
+        filas = [dict(zip(columnas, fila)) for fila in filas]
+    return filas
+
+def _acumular(resumen: dict, fila: dict, signo: int) -> None:
+    """
+    Suma (signo=1) o resta (signo=-1) una fila de _leer_filas en
+    {(plantel, alcance, granularidad, periodo): delta}, para cada alcance en el que entra.
+    """
+    plantel, fecha = fila["plantel"], _fecha(fila["fecha_lesion"])
+    if not plantel or fecha is None:
+        return
+    for alcance in fila["alcances"]:
+        for granularidad in GRANULARIDADES:
+            clave = (plantel, alcance, granularidad, inicio_periodo(fecha, granularidad))
+            r = resumen.get(clave)
+            if r is None:
+                r = resumen[clave] = {"total": 0, "activas": 0, "suma_dias_baja": 0.0, "con_dias_baja": 0,
+                                      "zonas": Counter(), "ultima_fecha": None}
+            r["total"] += signo
+            r["activas"] += signo * (fila["estado_lesion"] == "ACTIVO")
+            if fila["dias_baja_estimado"] is not None:
+                r["suma_dias_baja"] += signo * float(fila["dias_baja_estimado"])
+                r["con_dias_baja"] += signo
+            if fila["zona_cuerpo"]:
+                r["zonas"][fila["zona_cuerpo"]] += signo
+            # Al restar no se puede saber la fecha anterior: apply_summary_delta la vuelve a leer
+            if signo > 0:
+                r["ultima_fecha"] = fecha if r["ultima_fecha"] is None else max(r["ultima_fecha"], fecha)
+
+def _escribir(cursor, resumen: dict) -> int:
+    """Aplica los deltas de _acumular con un executemany por tabla. Retorna las filas de resumen escritas."""
+    filas, zonas = [], []
+    for (plantel, alcance, granularidad, periodo), r in resumen.items():
+        if r["total"] or r["activas"] or r["con_dias_baja"] or r["suma_dias_baja"]:
+            filas.append((plantel, alcance, granularidad, periodo, r["total"], r["activas"],
+                          r["suma_dias_baja"], r["con_dias_baja"], r["ultima_fecha"]))
+        zonas.extend((plantel, alcance, granularidad, periodo, zona, n)
+                     for zona, n in sorted(r["zonas"].items()) if n)
+    if filas:
+        cursor.executemany(_UPSERT_RESUMEN, filas)
+    if zonas:
+        cursor.executemany(_UPSERT_ZONAS, zonas)
+    return len(filas)
+
+def summary_scopes(cursor) -> dict[str, RowScope]:
+    """
+    Alcances que se mantienen en resumen_lesiones: uno por rol de la tabla 'roles'
+    (las reglas de src/db/db_scope.py dependen del rol). Clave → RowScope.
+    """
+    cursor.execute("SELECT name FROM roles;")
+    roles = [fila["name"] if isinstance(fila, dict) else fila[0] for fila in cursor.fetchall()]
+    alcances = {}
+    for rol in roles or [""]:
+        scope = build_scope({"rol": rol})
+        alcances[scope.clave] = scope
+    return alcances
+
+@cached_resource_loader(["roles"], ttl=3600)  # los roles casi no cambian: sin SELECT por escritura
+def _alcances_cacheados(_cursor) -> dict[str, RowScope]:
+    """summary_scopes con el cursor de la primera escritura; se comparte (solo lectura)."""
+    return summary_scopes(_cursor)
+
+def _leer_filas(cursor, alcances: dict[str, RowScope], where: str = "", params: tuple = (),
+                bloquear: bool = False) -> list[dict]:
+    """
+    Lesiones de _RESUMEN_QUERY con, en cada fila, 'alcances': las claves de los alcances
+    que la ven. Las reglas se evalúan en la misma consulta (CASE WHEN por alcance).
+    bloquear=True lee con FOR UPDATE sobre las filas de 'lesiones' (no las de los joins).
+    """
+    columnas, params_alcance = [], []
+    for n, scope in enumerate(alcances.values()):
+        condicion = " AND ".join(f"({c})" for c in scope.condiciones) or "1 = 1"
+        columnas.append(f"CASE WHEN {condicion} THEN 1 ELSE 0 END AS alcance_{n}")
+        params_alcance.extend(scope.params)
+
+    bloqueo = " FOR UPDATE OF l" if bloquear else ""
+    cursor.execute(f"{_RESUMEN_QUERY.format(alcances=', '.join(columnas))} {where}{bloqueo};",
+                   tuple(params_alcance) + tuple(params))
+    claves = list(alcances)
+    filas = _filas_dict(cursor)
+    for fila in filas:
+        fila["alcances"] = frozenset(clave for n, clave in enumerate(claves) if fila.pop(f"alcance_{n}"))
+    return filas
+
+# ==========================================================
+# 🔁 Mantenimiento (en la transacción de quien escribe)
+# ==========================================================
+
+def _hay_resumen(cursor) -> bool:
+    """
+    True si existen resumen_lesiones y resumen_lesiones_zonas (migraciones V007 y V008).
+    Solo se recuerda el resultado positivo: al migrar con la app en marcha, las escrituras
+    empiezan a mantener el resumen sin reiniciar (antes hay que reconstruirlo con `rebuild`).
+    """
+    global _resumen_disponible
+    if not _resumen_disponible:
+        try:
+            cursor.execute("SELECT 1 FROM resumen_lesiones, resumen_lesiones_zonas WHERE 1 = 0;")
+            cursor.fetchall()
+        except Exception as e:
+            print(f"Resumen de lesiones no disponible, no se actualiza: {e}")
+            return False
+        _resumen_disponible = True
+    return True
+
+def summary_rows(cursor, ids: list[str]) -> list[dict]:
+    """
+    Estado de las lesiones indicadas tal como cuenta en el resumen (plantel, fecha, estado,
+    días, zona y alcances que las ven). Una consulta por clave primaria: se llama después
+    de insertar o antes de modificar/borrar, para pasarla a apply_summary_delta.
+
+    Lee con bloqueo (SELECT ... FOR UPDATE) hasta el commit de quien llama: dos ediciones
+    o borrados simultáneos de la misma lesión se serializan y el segundo parte del estado
+    que dejó el primero, así que el delta no se aplica dos veces.
+
+    Sin las tablas del resumen (base sin migrar) retorna [] y apply_summary_delta no escribe
+    nada: la escritura de la lesión sigue adelante.
+    """
+    if not ids or not _hay_resumen(cursor):
+        return []
+    alcances = _alcances_cacheados(cursor)
+    placeholders = ", ".join(["%s"] * len(ids))
+    return _leer_filas(cursor, alcances, f"WHERE l.id_lesion IN ({placeholders})", tuple(ids), bloquear=True)
+
+def _recalcular_ultima_fecha(cursor, claves: list[tuple]) -> None:
+    """
+    Vuelve a leer ultima_fecha de los periodos (plantel, alcance, granularidad, periodo) indicados
+    a partir de las lesiones que siguen en ellos: el upsert solo puede moverla hacia adelante.
+    Una sentencia por alcance (executemany sobre sus periodos).
+    """
+    alcances = _alcances_cacheados(cursor)
+    por_alcance = defaultdict(list)
+    for plantel, alcance, granularidad, periodo in claves:
+        if alcance in alcances:
+            por_alcance[alcance].append((plantel, granularidad, periodo))
+
+    for alcance, periodos in por_alcance.items():
+        scope = alcances[alcance]
+        condicion = " AND ".join(f"({c})" for c in scope.condiciones) or "1 = 1"
+        cursor.executemany(
+            _ULTIMA_FECHA.format(condicion=condicion),
+            [(plantel, periodo, fin_periodo(periodo, granularidad), *scope.params,
+              plantel, alcance, granularidad, periodo)
+             for plantel, granularidad, periodo in periodos]
+        )
+
+def apply_summary_delta(cursor, sumar: list[dict] = (), restar: list[dict] = ()) -> int:
+    """
+    Suma `sumar` y resta `restar` (filas de summary_rows) en los periodos afectados de
+    resumen_lesiones y resumen_lesiones_zonas con upserts (total = total + delta), sin releer
+    las lesiones del periodo. En los periodos que pierden lesiones (delta de total negativo)
+    se vuelve a leer ultima_fecha. No hace commit ni captura errores: va en la misma
+    transacción que la escritura y, si falla, quien llama hace rollback de todo.
+
+    Retorna:
+        int: filas de resumen escritas.
+    """
+    resumen = {}
+    for fila in sumar:
+        _acumular(resumen, fila, 1)
+    for fila in restar:
+        _acumular(resumen, fila, -1)
+    escritas = _escribir(cursor, resumen)
+
+    # Una edición suma y resta la misma lesión (total 0): su fecha no cambia
+    menos = [clave for clave, r in resumen.items() if r["total"] < 0]
+    if menos:
+        _recalcular_ultima_fecha(cursor, menos)
+    return escritas
+
+def rebuild_summary(cursor) -> int:
+    """
+    Reconstruye resumen_lesiones y resumen_lesiones_zonas completos (todos los alcances)
+    con el cursor recibido. No hace commit.
+
+    Los deltas solo siguen a las escrituras en 'lesiones': el plantel de cada lesión sale de
+    'futbolistas', así que tras cambiar de plantel a una jugadora (o corregir su competición)
+    el resumen queda desactualizado hasta reconstruirlo.
+
+    Retorna:
+        int: filas de resumen escritas.
+    """
+    alcances = summary_scopes(cursor)
+    cursor.execute("DELETE FROM resumen_lesiones_zonas;")
+    cursor.execute("DELETE FROM resumen_lesiones;")
+
+    resumen = {}
+    for fila in _leer_filas(cursor, alcances):
+        _acumular(resumen, fila, 1)
+    return _escribir(cursor, resumen)
+
+def rebuild_summary_db() -> int:
+    """Reconstruye resumen_lesiones en una transacción propia e invalida su caché."""
+    with db_cursor() as (conn, cursor):
+        try:
+            escritas = rebuild_summary(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    invalidate_tables(*TABLAS_RESUMEN)
+    return escritas
+
+# ==========================================================
+# 📊 Lectura
+# ==========================================================
+
+@cached_loader(["lesiones", *TABLAS_RESUMEN], ttl=3600)  # cachea por 1 hora; se invalida al escribir
+def load_resumen_lesiones_db(plantel: str, alcance: str) -> pd.DataFrame | None:
+    """
+    Filas de resumen_lesiones de un plantel y alcance (RowScope.clave), ambas granularidades,
+    ordenadas por periodo. Columnas extra: promedio_dias y zonas como dict {zona: lesiones}.
+    Los periodos que quedaron en 0 tras un borrado no se devuelven.
+
+    Retorna None si la tabla no existe o no tiene filas para ese alcance (p. ej. una regla
+    de alcance que no depende del rol): quien llama debe calcular desde las lesiones.
+    """
+    try:
+        with db_cursor(dictionary=True, readonly=True) as (conn, cursor):
+            cursor.execute(f"""
+            SELECT {', '.join(COLUMNAS_RESUMEN)}
+            FROM resumen_lesiones
+            WHERE plantel = %s AND alcance = %s AND total > 0
+            ORDER BY granularidad, periodo;
+            """, (plantel, alcance))
+            filas = cursor.fetchall()
+
+            cursor.execute("""
+            SELECT granularidad, periodo, zona, total
+            FROM resumen_lesiones_zonas
+            WHERE plantel = %s AND alcance = %s AND total > 0;
+            """, (plantel, alcance))
+            zonas = defaultdict(dict)
+            for fila in cursor.fetchall():
+                zonas[(fila["granularidad"], _fecha(fila["periodo"]))][fila["zona"]] = fila["total"]
+    except Exception as e:
+        print(f"Resumen de lesiones no disponible: {e}")
+        return None
+
+    if not filas:
+        return None
+
+    df = pd.DataFrame(filas, columns=COLUMNAS_RESUMEN)
+    df["zonas"] = [zonas.get((g, _fecha(p)), {}) for g, p in zip(df["granularidad"], df["periodo"])]
+    df["periodo"] = pd.to_datetime(df["periodo"])
+    df["ultima_fecha"] = pd.to_datetime(df["ultima_fecha"])
+    df["suma_dias_baja"] = df["suma_dias_baja"].astype(float)
+    df["promedio_dias"] = (df["suma_dias_baja"] / df["con_dias_baja"].where(df["con_dias_baja"] > 0)).round(2)
+    return df
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Resumen de lesiones por periodo (página de inicio).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("rebuild", help="Reconstruye resumen_lesiones desde la tabla de lesiones "
+                                   "(necesario tras cambiar jugadoras de plantel).")
+    parser.parse_args(argv)
+
+    escritas = rebuild_summary_db()
+    print(f"resumen_lesiones reconstruido: {escritas} filas.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,142 @@
-from src.db.db_connection import get_connection
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
-def fetch_all(query, params=None):
-    """Obtiene múltiples registros."""
-    conn = get_connection()
-    if not conn:
-        return []
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+from src.db.db_connection import db_cursor, get_pool_stats
+from src.db.db_cache import result_cache, tables_read, table_written, invalidate_tables
+from src.util.schema import aplicar_dtypes
+
+MAX_LOADER_WORKERS = 4  # hilos de run_concurrently (compartidos por todas las sesiones)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def fetch_all(query, params=None, cache: bool = False, ttl: float = None, readonly: bool = False):
+    """
+    Obtiene múltiples registros (lista de dicts). Si la consulta falla, lo registra en consola
+    y retorna None: no muestra nada en la interfaz (se usa también desde hilos y CLI), así que
+    el error lo informa quien llama.
+    cache=True guarda el resultado en result_cache (ver src/db/db_cache.py) durante `ttl` segundos
+    (por defecto DEFAULT_RESULT_CACHE_TTL); se invalida al escribir en cualquiera de las tablas leídas.
+    readonly=True lee de la réplica si está configurada.
+    """
+    clave = None
+    if cache:
+        clave = result_cache.key(query, params)
+        filas = result_cache.get(clave)
+        if filas is not None:
+            return filas
+        # Antes de leer: si una escritura invalida estas tablas durante la consulta, no se guarda
+        tablas = tables_read(query)
+        generacion = result_cache.generation(tablas)
 
     try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query, params or ())
-        data = cursor.fetchall()
-        return data
+        with db_cursor(dictionary=True, readonly=readonly) as (conn, cursor):
+            cursor.execute(query, params or ())
+            filas = cursor.fetchall()
     except Exception as e:
         print(f"⚠️ Error en query: {e}")
-        return []
-    finally:
-        if conn.is_connected():
-            cursor.close()
-            conn.close()
+        return None
 
-def execute_query(query, params=None):
-    """Ejecuta INSERT, UPDATE o DELETE."""
-    conn = get_connection()
-    if not conn:
-        return False
+    if clave is not None:
+        result_cache.put(clave, filas, tablas, ttl, generacion)
+    return filas
 
+def execute_query(query, params=None):
+    """Ejecuta INSERT, UPDATE o DELETE e invalida las cachés de la tabla escrita."""
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params or ())
-        conn.commit()
-        return True
+        with db_cursor() as (conn, cursor):
+            try:
+                cursor.execute(query, params or ())
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
     except Exception as e:
         print(f"⚠️ Error en query: {e}")
-        conn.rollback()
         return False
+
+    tabla = table_written(query)
+    if tabla:
+        invalidate_tables(tabla)
+    return True
+
+def frame_from_cursor(cursor, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Construye un DataFrame con el resultado pendiente de un cursor de tuplas
+    (conn.cursor() sin dictionary=True):
+
+    - los nombres de columna salen de cursor.description (una vez, no por fila),
+    - las tuplas se pasan tal cual a pandas, que las transpone a columnas sin crear un dict por fila,
+    - `dtypes` (p. ej. DTYPES_LESIONES) declara los tipos en lugar de inferirlos.
+
+    Si la consulta no devuelve filas, el DataFrame vacío conserva las columnas.
+    """
+    columnas = [d[0] for d in cursor.description] if cursor.description else []
+    rows = cursor.fetchall()
+
+    if rows:
+        df = pd.DataFrame.from_records(rows, columns=columnas)
+    else:
+        df = pd.DataFrame(columns=columnas)
+
+    return aplicar_dtypes(df, dtypes) if dtypes else df
+
+def fetch_dataframe(query, params=None, dtypes: dict = None, readonly: bool = False) -> pd.DataFrame:
+    """
+    Ejecuta un SELECT con un cursor de tuplas y devuelve un DataFrame (ver frame_from_cursor).
+    readonly=True lo envía a la réplica si está configurada.
+    """
+    with db_cursor(readonly=readonly) as (conn, cursor):
+        cursor.execute(query, params or ())
+        return frame_from_cursor(cursor, dtypes)
+
+def _loader_executor() -> ThreadPoolExecutor:
+    """
+    Ejecutor compartido por todas las sesiones para run_concurrently. Cada tarea ocupa una
+    conexión, así que los hilos se limitan al pool más pequeño menos una (la del hilo del script).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            tamanos = [s["size"] for s in (get_pool_stats(), get_pool_stats(readonly=True)) if s]
+            hilos = max(1, min([MAX_LOADER_WORKERS] + [t - 1 for t in tamanos]))
+            _executor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="loader")
+        return _executor
+
+def _con_contexto(ctx, func):
+    # Los hilos del ejecutor se reutilizan entre sesiones: el contexto se asigna por tarea y se retira al terminar
+    hilo = threading.current_thread()
+    if ctx is not None:
+        add_script_run_ctx(hilo, ctx)
+    try:
+        return func()
     finally:
-        if conn.is_connected():
-            cursor.close()
-            conn.close()
+        setattr(hilo, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+def run_concurrently(*funciones) -> list:
+    """
+    Ejecuta en paralelo funciones independientes sin argumentos (loaders) y devuelve
+    sus resultados en el mismo orden:
+
+        (jug_df, jug_error), (comp_df, comp_error) = run_concurrently(load_jugadoras_db, load_competiciones_db)
+
+    Las tareas van a un ThreadPoolExecutor acotado por el tamaño del pool de conexiones
+    (ver _loader_executor) y reciben el ScriptRunContext de la sesión, así que los loaders
+    pueden usar st.cache_data, st.session_state o st.error como en el hilo principal.
+    La latencia es la de la consulta más lenta, no la suma.
+
+    Si alguna función lanza una excepción, se relanza aquí tras esperar al resto.
+    st.stop() dentro de un hilo no detiene el script: los loaders deben devolver el error
+    y dejar que quien llama decida (como load_jugadoras_db).
+    """
+    if len(funciones) < 2:
+        return [func() for func in funciones]
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    futuros = [_loader_executor().submit(_con_contexto, ctx, func) for func in funciones]
+    wait(futuros)
+    return [futuro.result() for futuro in futuros]
@@ -1,36 +1,35 @@
 import streamlit as st
 from src.i18n.i18n import t
 
-def groupal_metrics(df_filtrado):
+def _top(conteo, total_lesiones):
+    """Valor más frecuente de un conteo agregado (valor, total) y su porcentaje."""
+    if conteo is None or conteo.empty or total_lesiones == 0:
+        return "N/A", 0, 0
+    fila = conteo.iloc[0]
+    return fila["valor"], int(fila["total"]), round((fila["total"] / total_lesiones) * 100, 1)
+
+def groupal_metrics(agregados):
+    """
+    Muestra los KPIs del análisis grupal a partir de los agregados calculados en SQL
+    (ver load_agregados_grupales_db).
+    """
 
     # --- PASO 1: CÁLCULOS BASE ---
-    total_lesiones = len(df_filtrado)
-    activas = df_filtrado[df_filtrado["estado_lesion"] == "ACTIVO"].shape[0] if "estado_lesion" in df_filtrado else 0
+    kpis = agregados["kpis"]
+    total_lesiones = kpis["total"]
+    activas = kpis["activas"]
     porcentaje_activas = round((activas / total_lesiones) * 100, 1) if total_lesiones > 0 else 0
-    tiempo_promedio = round(df_filtrado["dias_baja_estimado"].mean(), 1) if "dias_baja_estimado" in df_filtrado else 0
+    tiempo_promedio = round(kpis["promedio_dias"], 1) if kpis["promedio_dias"] is not None else 0
 
     # --- ZONA CORPORAL MÁS AFECTADA ---
-    if "zona_cuerpo" in df_filtrado.columns and not df_filtrado["zona_cuerpo"].dropna().empty:
-        zona_top = df_filtrado["zona_cuerpo"].mode()[0]
-        zona_count = df_filtrado["zona_cuerpo"].value_counts().iloc[0]
-        zona_pct = round((zona_count / total_lesiones) * 100, 1)
-    else:
-        zona_top, zona_count, zona_pct = "N/A", 0, 0
+    zona_top, zona_count, zona_pct = _top(agregados.get("zona_cuerpo"), total_lesiones)
 
     # --- TIPO DE LESIÓN MÁS FRECUENTE ---
-    if "tipo_lesion" in df_filtrado.columns and not df_filtrado["tipo_lesion"].dropna().empty:
-        tipo_top = df_filtrado["tipo_lesion"].mode()[0]
-        tipo_count = df_filtrado["tipo_lesion"].value_counts().iloc[0]
-        tipo_pct = round((tipo_count / total_lesiones) * 100, 1)
-    else:
-        tipo_top, tipo_count, tipo_pct = "N/A", 0, 0
+    tipo_top, tipo_count, tipo_pct = _top(agregados.get("tipo_lesion"), total_lesiones)
 
     # --- PORCENTAJE DE RECAÍDAS ---
-    if "es_recidiva" in df_filtrado.columns:
-        recidivas = df_filtrado[df_filtrado["es_recidiva"] == True].shape[0]
-        pct_recidivas = round((recidivas / total_lesiones) * 100, 1) if total_lesiones > 0 else 0
-    else:
-        recidivas, pct_recidivas = 0, 0
+    recidivas = kpis["recidivas"]
+    pct_recidivas = round((recidivas / total_lesiones) * 100, 1) if total_lesiones > 0 else 0
 
     # ==================== PASO 3: INTERFAZ ====================
     col1, col2, col3, col4 = st.columns(4, border=True)
@@ -5,6 +5,7 @@ import pandas as pd
 from src.i18n.i18n import t
 
 from src.util.util import (get_photo, clean_image_url, calcular_edad)
+from src.db.db_profiles import PerfilJugadora
 
 def player_block_dux(jugadora_seleccionada: dict, unavailable="N/A"):
     """Muestra el bloque visual con la información principal de la jugadora."""
@@ -83,12 +84,12 @@ def player_block_dux(jugadora_seleccionada: dict, unavailable="N/A"):
           
     st.divider()
 
-def grafico_evolucion_lesiones(df: pd.DataFrame):
+def grafico_evolucion_lesiones(perfil: PerfilJugadora):
     """Muestra una línea temporal de lesiones con color por gravedad y tamaño según días de baja."""
-    if df.empty:
+    if perfil is None or perfil.total == 0:
         return None
 
-    df = df.copy()
+    df = perfil.lesiones.copy()
     df["fecha_lesion"] = pd.to_datetime(df["fecha_lesion"], errors="coerce")
 
     # Filtrar solo las columnas que existen
@@ -112,13 +113,13 @@ def grafico_evolucion_lesiones(df: pd.DataFrame):
     )
     return fig
 
-def grafico_zonas_lesionadas(df: pd.DataFrame):
+def grafico_zonas_lesionadas(perfil: PerfilJugadora):
     """Bar chart horizontal de zonas corporales más lesionadas."""
-    if df.empty:
+    if perfil is None or perfil.total == 0:
         return None
 
-    zonas = df["zona_cuerpo"].value_counts().reset_index()
-    zonas.columns = ["Zona corporal", "Frecuencia"]
+    # Conteo precalculado en el perfil (solo zonas con lesiones de esta jugadora)
+    zonas = perfil.por_zona.rename(columns={"zona_cuerpo": "Zona corporal", "total": "Frecuencia"})
 
     fig = px.bar(
         zonas,
@@ -132,14 +133,15 @@ def grafico_zonas_lesionadas(df: pd.DataFrame):
     fig.update_layout(template="simple_white", height=400)
     return fig
 
-def grafico_tipo_mecanismo(df: pd.DataFrame):
+def grafico_tipo_mecanismo(perfil: PerfilJugadora):
     """Comparación entre tipo de lesión y mecanismo."""
-    if df.empty:
+    if perfil is None or perfil.total == 0:
         return None
 
-    fig = px.histogram(
-        df,
+    fig = px.bar(
+        perfil.tipo_mecanismo,
         x="tipo_lesion",
+        y="total",
         color="mecanismo",
         barmode="group",
         title=t("Relación entre tipo de lesión y mecanismo"),
@@ -153,22 +155,12 @@ def grafico_tipo_mecanismo(df: pd.DataFrame):
     )
     return fig
 
-from collections import Counter
-
-def grafico_tratamientos(df: pd.DataFrame):
+def grafico_tratamientos(perfil: PerfilJugadora):
     """Muestra la frecuencia de uso de tratamientos aplicados."""
-    if df.empty or "tipo_tratamiento" not in df.columns:
+    if perfil is None or perfil.tratamientos.empty:
         return None
 
-    tratamientos = []
-    for tr in df["tipo_tratamiento"]:
-        if isinstance(tr, list):
-            tratamientos.extend(tr)
-        elif isinstance(tr, str) and tr.strip():
-            tratamientos.extend([x.strip() for x in tr.split(",")])
-
-    conteo = Counter(tratamientos)
-    df_t = pd.DataFrame(conteo.items(), columns=["Tratamiento", "Frecuencia"]).sort_values("Frecuencia", ascending=True)
+    df_t = perfil.tratamientos.rename(columns={"tratamiento": "Tratamiento", "total": "Frecuencia"})
 
     fig = px.bar(
         df_t,
@@ -182,13 +174,13 @@ def grafico_tratamientos(df: pd.DataFrame):
     fig.update_layout(template="simple_white", height=400)
     return fig
 
-def grafico_dias_baja(df: pd.DataFrame):
+def grafico_dias_baja(perfil: PerfilJugadora):
     """Boxplot que muestra la distribución de días de baja por nivel de impacto o severidad."""
-    if df.empty:
+    if perfil is None or perfil.total == 0:
         return None
 
     fig = px.box(
-        df,
+        perfil.dias_baja,
         x="impacto_dias_baja_estimado",
         y="dias_baja_estimado",
         color="impacto_dias_baja_estimado",
@@ -203,13 +195,12 @@ def grafico_dias_baja(df: pd.DataFrame):
     )
     return fig
 
-def grafico_recidivas(df: pd.DataFrame):
+def grafico_recidivas(perfil: PerfilJugadora):
     """Pie chart de proporción de lesiones recidivantes vs nuevas."""
-    if df.empty or "es_recidiva" not in df.columns:
+    if perfil is None or perfil.recidivas.empty:
         return None
 
-    conteo = df["es_recidiva"].map({True: "Recidiva", False: "Nueva"}).value_counts().reset_index()
-    conteo.columns = ["Tipo", "Frecuencia"]
+    conteo = perfil.recidivas.rename(columns={"tipo": "Tipo", "total": "Frecuencia"})
 
     fig = px.pie(
         conteo,
@@ -221,4 +212,3 @@ def grafico_recidivas(df: pd.DataFrame):
     )
     fig.update_layout(template="simple_white", height=350)
     return fig
-
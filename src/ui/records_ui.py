@@ -7,7 +7,8 @@ from src.i18n.i18n import t
 from src.util.util import (is_valid, parse_fecha, get_gravedad_por_dias, 
                       get_normalized_treatment, to_date, date_to_str)
 
-from src.db.db_catalogs import load_catalog_list_db
+from src.db.db_catalogs import load_catalog_bundle_db, get_catalog_index
+from src.db.db_records import load_evolucion_db
 from src.ui.ui_components import preview_record
 from src.util.key_builder import KeyBuilder
 
@@ -45,38 +46,17 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
     lesion_help =t("Lesiones agrupadas según el tejido afectado y mecanismo (criterios FIFA/UEFA).")
     
     ############## BD DATA ##############
-    segmentos_corporales_df = load_catalog_list_db("segmentos_corporales", as_df=True)
-    map_segmentos_nombre_a_id = dict(zip(segmentos_corporales_df["nombre"], segmentos_corporales_df["id"]))
-    segmentos_corporales_list = segmentos_corporales_df["nombre"].tolist()
+    catalogos = load_catalog_bundle_db()
+    if catalogos is None:
+        st.stop()
 
-    zonas_segmento_df = load_catalog_list_db("zonas_segmento", as_df=True)
-    map_zonas_segmento_nombre_a_id = dict(zip(zonas_segmento_df["nombre"], zonas_segmento_df["id"]))
+    # Cascadas precalculadas por versión del catálogo (búsquedas en diccionario)
+    indice = get_catalog_index(catalogos)
 
-    zonas_anatomicas_df = load_catalog_list_db("zonas_anatomicas", as_df=True)
-    map_zonas_anatomicas_nombre_a_id = dict(zip(zonas_anatomicas_df["nombre"], zonas_anatomicas_df["id"]))
-
-    mecanismos_df = load_catalog_list_db("mecanismos", as_df=True)
-    map_mecanismos_nombre_a_id = dict(zip(mecanismos_df["nombre"], mecanismos_df["id"]))
-    mecanismo_list = mecanismos_df["nombre"].tolist()
-
-    tipos_lesion_df = load_catalog_list_db("tipo_lesion", as_df=True)
-    map_tipos_lesion_nombre_a_id = dict(zip(tipos_lesion_df["nombre"], tipos_lesion_df["id"]))
-    map_tipo_nombre_a_id = dict(zip(tipos_lesion_df["nombre"], tipos_lesion_df["id"]))
-
-    subtipos_df = load_catalog_list_db("tipo_especifico_lesion", as_df=True)
-    map_subtipos_nombre_a_id = dict(zip(subtipos_df["nombre"], subtipos_df["id"]))
-
-    relacion_df = load_catalog_list_db("mecanismo_tipo_lesion", as_df=True)
-    #st.dataframe(relacion_df)
-    #map_relacion_df_nombre_a_id = dict(zip(tipos_lesion_df["nombre"], tipos_lesion_df["id"]))
-
-    tratamientos = load_catalog_list_db("tratamientos", as_df=True)
-    tratamientos_list = tratamientos["nombre"].tolist()
-    #st.text(tratamientos_list)
-
-    lugares_df = load_catalog_list_db("lugares", as_df=True)
-    map_lugares_nombre_a_id = dict(zip(lugares_df["nombre"], lugares_df["id"]))
-    lugares_list = lugares_df["nombre"].tolist()
+    segmentos_corporales_list = indice.nombres("segmentos_corporales")
+    mecanismo_list = indice.nombres("mecanismos")
+    tratamientos_list = indice.nombres("tratamientos")
+    lugares_list = indice.nombres("lugares")
 
     lateralidades = load_catalog_list("lateralidades")
     tipos_recidiva = load_catalog_list("tipos_recidiva")
@@ -202,12 +182,7 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
                              key=f"lugar_{st.session_state['form_version']}")
         
         idx_zonas = 0
-        if segmento:
-            segmento_id = map_segmentos_nombre_a_id.get(segmento)
-            zonas_segmento_filtrados = zonas_segmento_df[zonas_segmento_df["segmento_id"] == segmento_id]
-            zonas_segmento_list = zonas_segmento_filtrados["nombre"].tolist()
-        else:
-            zonas_segmento_list = []
+        zonas_segmento_list = list(indice.zonas(segmento)) if segmento else []
 
         # Si hay subtipos, usarlos; si no, usar el valor por defecto
         opciones_tipo_zona = zonas_segmento_list if zonas_segmento_list else default_list
@@ -226,12 +201,7 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
                                         placeholder=placeholder, key=f"mecanismo_lesion_{st.session_state['form_version']}")
         
         idx_zona_espec = 0
-        if zona_cuerpo:
-            zonas_segmento_id = map_zonas_segmento_nombre_a_id.get(zona_cuerpo)
-            zonas_anatomicas_filtrados = zonas_anatomicas_df[zonas_anatomicas_df["zona_id"] == zonas_segmento_id]
-            zonas_anatomicas_list = zonas_anatomicas_filtrados["nombre"].tolist()
-        else:
-            zonas_anatomicas_list = []
+        zonas_anatomicas_list = list(indice.estructuras(zona_cuerpo)) if zona_cuerpo else []
 
         # Si hay subtipos, usarlos; si no, usar el valor por defecto
         opciones_tipo_zona_especifica = zonas_anatomicas_list if zonas_anatomicas_list else default_list
@@ -250,20 +220,8 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
     with col4:
         
         idx_tipos_lesion = 0
-        if mecanismo_lesion:
-            # Filtrar tipos compatibles
-            mecanismo_id = mecanismos_df.loc[mecanismos_df["nombre"] == mecanismo_lesion, "id"].iloc[0]
-            
-            tipos_filtrados = tipos_lesion_df.merge(
-                relacion_df[relacion_df["mecanismo_id"] == mecanismo_id],
-                left_on="id",
-                right_on="tipo_lesion_id",
-                how="inner"
-            )
-
-            tipos_lesion_list = tipos_filtrados["nombre"].drop_duplicates().tolist()
-        else:
-            tipos_lesion_list = []
+        # Tipos compatibles con el mecanismo seleccionado
+        tipos_lesion_list = list(indice.tipos(mecanismo_lesion)) if mecanismo_lesion else []
 
         # Si hay subtipos, usarlos; si no, usar el valor por defecto
         opciones_tipo_lesion = tipos_lesion_list if tipos_lesion_list else default_list
@@ -291,31 +249,10 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
         # else: 
         # Obtener lista de subtipos válidos según la selección
         if mecanismo_lesion and tipo_lesion:
-            tipo_lesion_id = map_tipo_nombre_a_id.get(tipo_lesion)
-
-            # Filtrar combinaciones válidas
-            relaciones_validas = relacion_df[
-                (relacion_df["mecanismo_id"] == mecanismo_id) &
-                (relacion_df["tipo_lesion_id"] == tipo_lesion_id)
-            ]
-
-            # Obtener los IDs de subtipos (pueden incluir NULL)
-            subtipos_ids = relaciones_validas["tipo_especifico_id"].dropna().astype(int).tolist()
-
-            if subtipos_ids:
-                subtipos_filtrados = subtipos_df[subtipos_df["id"].isin(subtipos_ids)]
-                subtipos_list = subtipos_filtrados["nombre"].tolist()
-                is_disabled = False
-            else:
-                subtipos_list = []
-                is_disabled = True  # no hay subtipos disponibles
-
-
-            #subtipos_filtrados = subtipos_df[subtipos_df["tipo_lesion_id"] == tipo_lesion_id]
-            #subtipos_list = subtipos_filtrados["nombre"].tolist()
+            # Subtipos válidos para la combinación mecanismo + tipo
+            subtipos_list = list(indice.subtipos(mecanismo_lesion, tipo_lesion))
         else:
             subtipos_list = []
-            is_disabled = True
 
         # Si hay subtipos, usarlos; si no, usar el valor por defecto
         opciones_tipo = subtipos_list if subtipos_list else default_list
@@ -568,14 +505,14 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
     # Construimos el diccionario de la lesión
     if modo == "nuevo":
 
-        lugar_id = map_lugares_nombre_a_id.get(lugar)
-        segmento_id = map_segmentos_nombre_a_id.get(segmento)
-        zona_cuerpo_id = map_zonas_segmento_nombre_a_id.get(zona_cuerpo)
-        zona_especifica_id = map_zonas_anatomicas_nombre_a_id.get(zona_especifica)
+        lugar_id = indice.id_de("lugares", lugar)
+        segmento_id = indice.id_de("segmentos_corporales", segmento)
+        zona_cuerpo_id = indice.id_de("zonas_segmento", zona_cuerpo)
+        zona_especifica_id = indice.id_de("zonas_anatomicas", zona_especifica)
 
-        tipo_lesion_id = map_tipo_nombre_a_id.get(tipo_lesion)
-        tipo_especifico_id = map_subtipos_nombre_a_id.get(tipo_especifico)
-        mecanismo_id = map_mecanismos_nombre_a_id.get(mecanismo_lesion)
+        tipo_lesion_id = indice.id_de("tipo_lesion", tipo_lesion)
+        tipo_especifico_id = indice.id_de("tipo_especifico_lesion", tipo_especifico)
+        mecanismo_id = indice.id_de("mecanismos", mecanismo_lesion)
 
         record = {
             "id_lesion": None,
@@ -606,23 +543,19 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
             "estado_lesion": estado_lesion,
             "diagnostico": diagnostico,
             "descripcion": descripcion,
-            "evolucion": [],
             "fecha_hora_registro": datetime.datetime.now().isoformat(),
             "usuario": st.session_state['auth']['username']
         }
     else:  
         # modo editar
-        if "evolucion" not in lesion_data or not isinstance(lesion_data["evolucion"], list):
-            lesion_data["evolucion"] = []
-        
         tiene_datos = any([
             record_evolucion["tratamiento_aplicado"],  # lista con elementos
             record_evolucion["personal_seguimiento"],
             record_evolucion["observaciones"]
         ])
 
-        if tiene_datos:
-            lesion_data["evolucion"].append(record_evolucion)
+        # Solo se guarda la sesión nueva (una fila en lesion_evolucion)
+        lesion_data["nueva_sesion"] = record_evolucion if tiene_datos else None
 
         if alta_medica and fecha_alta_medica:
             lesion_data["fecha_alta_medica"] = fecha_alta_medica.strftime("%Y-%m-%d")
@@ -653,14 +586,17 @@ def view_registro_lesion(modo: str = "nuevo", jugadora_info: str = None, lesion_
 
 def show_evolucion_historial(lesion_data: dict):
     """
-    Muestra el historial de evolución de una lesión a partir del campo JSON 'evolucion' almacenado en la base de datos.
+    Muestra el historial de evolución de una lesión (sesiones de la tabla 'lesion_evolucion').
 
     Args:
         lesion_data (dict): Diccionario con la información de la lesión. 
-                            Debe incluir el campo 'evolucion' (LONGTEXT JSON válido o lista).
+                            Si no incluye el campo 'evolucion' (lista o JSON), se consulta con load_evolucion_db.
     """
     
     evol_raw = lesion_data.get("evolucion")
+    if evol_raw is None and lesion_data.get("id_lesion"):
+        evol_raw = load_evolucion_db(lesion_data["id_lesion"])
+        lesion_data["evolucion"] = evol_raw
 
     # 1. Decodificar según el tipo recibido
     if not evol_raw:
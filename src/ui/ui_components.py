@@ -5,32 +5,75 @@ import pandas as pd
 from src.i18n.i18n import t
 import pandas as pd
 import json
-
-from src.db.db_records import load_jugadoras_db, load_competiciones_db, load_lesiones_db
+from collections import Counter
+
+from src.db.db_records import (load_jugadoras_db, load_competiciones_db, load_lesiones_db,
+                                load_lesiones_filtradas_db, load_opciones_filtro_lesiones_db)
+from src.db.db_utils import run_concurrently
+from src.db.db_scope import current_scope
+from src.db.db_summary import load_resumen_lesiones_db
+from src.db.db_profiles import get_player_profile
 from src.util.schema import MAP_POSICIONES
 
 def load_posiciones_traducidas() -> dict:
     return {key: t(valor_es) for key, valor_es in MAP_POSICIONES.items()}
 
-def selection_header(modo: int = 1):
+def filter_value(valor):
+    """Valor de un selector como filtro: None si está vacío o es 'Todas'."""
+    return None if not valor or valor == t("Todas") else valor
+
+def filter_params(competicion, posicion, tipo_lesion) -> tuple:
+    """
+    (plantel, posición, tipo de lesión) de la selección de data_filters_advanced en el
+    formato de los loaders SQL (load_lesiones_filtradas_db, load_agregados_grupales_db...).
+    """
+    codigo_competicion = competicion["codigo"] if competicion else None
+    return codigo_competicion, filter_value(posicion), filter_value(tipo_lesion)
+
+def _perfil_o_error(id_jugadora: str, tipo_lesion: str = None):
+    # Sin conexión en la primera carga del store: se informa en lugar de mostrar una jugadora sin lesiones
+    try:
+        return get_player_profile(id_jugadora, tipo_lesion)
+    except ConnectionError as e:
+        st.error(f":material/warning: {e}")
+        st.stop()
+
+def selection_header(modo: int = 1, con_perfil: bool = False):
+    """
+    Selectores de plantel, posición y jugadora (y tipo de lesión en los modos 2 y 3).
+
+    - modo 1: retorna (jugadora, posicion).
+    - modos 2 y 3: retorna (jugadora, posicion, lesiones filtradas).
+    - con_perfil=True (modo 2): añade el PerfilJugadora cacheado de la selección
+      (ver src/db/db_profiles.py); las lesiones salen de él sin recorrer todo el histórico.
+    """
     ALL_TEXT = t("Todas")
+    perfil = None
 
-    jug_df, jug_error = load_jugadoras_db()   
+    # Cargas independientes en paralelo: la página espera a la consulta más lenta, no a la suma.
+    # Con perfil, las lesiones de la jugadora salen de get_player_profile: no hace falta el histórico.
+    loaders = [load_jugadoras_db, load_competiciones_db]
+    if modo != 1 and not con_perfil:
+        loaders.append(load_lesiones_db)
+    resultados = run_concurrently(*loaders)
+
+    jug_df, jug_error = resultados[0]
 
     if jug_error:
         st.error(f"{jug_error}")
         st.stop()
 
-    comp_df, comp_error = load_competiciones_db()
+    comp_df, comp_error = resultados[1]
    
     if modo == 1:
         col1, col2, col3 = st.columns([2,1,2])
     else:
-        records = load_lesiones_db() 
+        if not con_perfil:
+            records = resultados[2]
 
-        if records.empty:    
-            st.warning(t("No hay datos de lesiones disponibles."))
-            st.stop()   
+            if records.empty:    
+                st.warning(t("No hay datos de lesiones disponibles."))
+                st.stop()   
         col1, col2, col3, col4 = st.columns([2,1.3,2,1])
 
     with col1:
@@ -81,7 +124,11 @@ def selection_header(modo: int = 1):
         with col4:
             # Filtrado por jugadora seleccionada
             if jugadora_seleccionada:
-                records = records[records["id_jugadora"] == jugadora_seleccionada["identificacion"]]
+                if con_perfil:
+                    perfil = _perfil_o_error(jugadora_seleccionada["identificacion"])
+                    records = perfil.lesiones.copy()  # el perfil es compartido: no se modifica
+                else:
+                    records = records[records["id_jugadora"] == jugadora_seleccionada["identificacion"]]
             else:
                 if modo == 2:
                     records = pd.DataFrame()
@@ -108,8 +155,13 @@ def selection_header(modo: int = 1):
                     disabled=False
                 )
 
-                if selected_tipo and selected_tipo != ALL_TEXT:
-                    records = records[records["tipo_lesion"] == selected_tipo]
+                tipo_filtro = filter_value(selected_tipo)
+                if tipo_filtro:
+                    if perfil is not None:
+                        perfil = _perfil_o_error(jugadora_seleccionada["identificacion"], tipo_filtro)
+                        records = perfil.lesiones.copy()
+                    else:
+                        records = records[records["tipo_lesion"] == tipo_filtro]
 
    
     #st.dataframe(jug_df_filtrado)
@@ -119,35 +171,31 @@ def selection_header(modo: int = 1):
         jugadora_seleccionada = None
         if modo == 1:
             return None, posicion
+        elif con_perfil:
+            return None, posicion, pd.DataFrame(), None
         else:
             return None, posicion, pd.DataFrame()  # Devuelve vacío
 
     if modo == 1:
         return jugadora_seleccionada, posicion
+    elif con_perfil:
+        return jugadora_seleccionada, posicion, records, perfil
     else:
         return jugadora_seleccionada, posicion, records
 
 def data_filters_advanced():
+    """
+    Filtros del análisis grupal. Los filtros se aplican en SQL
+    (load_lesiones_filtradas_db), por lo que solo se transfieren las lesiones que cumplen.
+    """
     ALL_TEXT = t("Todas")
 
-    # --- Cargar datos ---
-    jug_df, jug_error = load_jugadoras_db()
-
-    if jug_df is None or "plantel" not in jug_df.columns:
-        st.error(t("No se pudo cargar la lista de jugadoras o falta la columna 'plantel'."))
-        st.stop()
-    
+    # --- Cargar catálogo de planteles ---
     comp_df, comp_error = load_competiciones_db()
-    records = load_lesiones_db()
-
-    if records.empty:    
-        st.warning(t("No hay datos de lesiones disponibles."))
-        st.stop()   
 
-    # --- Validación básica ---
-    if jug_df is None or jug_df.empty or records is None or records.empty:
-        st.warning(t("No hay datos disponibles para aplicar filtros."))
-        return None, None, None, (None, None)
+    if comp_error:
+        st.error(f"{comp_error}")
+        st.stop()
 
     col1, col2, col3, col4 = st.columns([3, 1.5, 1.5, 2])
 
@@ -161,6 +209,7 @@ def data_filters_advanced():
             placeholder=t("Seleccione un plantel"),
             index=3
         )
+        codigo_competicion = competicion["codigo"] if competicion else None
 
     # --- FILTRO 2: Posición ---
     with col2:
@@ -179,65 +228,25 @@ def data_filters_advanced():
         else:
             clave = MAP_POSICIONES_INVERTIDO.get(posicion_traducida)
             posicion = MAP_POSICIONES.get(clave)
-        
-        #st.text(f"Clave interna: {posicion}")
-    # --- FILTRO 3: Tipo de lesión (dependiente de jugadoras filtradas) ---
-    with col3:
-        # Filtrar jugadoras por competición y posición
-        jugadoras_filtradas = jug_df.copy()
-
-        if competicion:
-            codigo_competicion = competicion["codigo"]
-            jugadoras_filtradas = jugadoras_filtradas[
-                jugadoras_filtradas["plantel"] == codigo_competicion
-            ]
 
-        if posicion and posicion != ALL_TEXT:
-            jugadoras_filtradas = jugadoras_filtradas[
-                jugadoras_filtradas["posicion"] == posicion
-            ]
-
-        # Filtrar registros por jugadoras filtradas
-        if not jugadoras_filtradas.empty and "id_jugadora" in records.columns:
-            records_filtrados = records[
-                records["id_jugadora"].isin(jugadoras_filtradas["identificacion"])
-            ]
-        else:
-            records_filtrados = records.iloc[0:0].copy()
+        posicion_filtro = filter_value(posicion)
+        
+    # Tipos y rangos de fechas por tipo para plantel + posición (una consulta por rerun)
+    tipos, rangos_fecha = load_opciones_filtro_lesiones_db(codigo_competicion, posicion_filtro)
 
-        # Obtener solo los tipos de lesión que existen en el conjunto filtrado
-        tipos = sorted(records_filtrados["tipo_lesion"].dropna().unique().tolist())
+    # --- FILTRO 3: Tipo de lesión (dependiente de plantel y posición) ---
+    with col3:
         tipo_lesion = st.selectbox("Tipo de lesión", [ALL_TEXT] + tipos)
-
-        # Aplicar el filtro de tipo de lesión
-        if tipo_lesion != ALL_TEXT:
-            records_filtrados = records_filtrados[
-                records_filtrados["tipo_lesion"] == tipo_lesion
-            ]
+        tipo_filtro = filter_value(tipo_lesion)
 
     # --- FILTRO 4: Rango de fechas ---
     with col4:
-
-        # Convertir fechas a datetime
-        if "fecha_lesion" in records_filtrados.columns:
-            records_filtrados["fecha_lesion"] = pd.to_datetime(records_filtrados["fecha_lesion"], errors="coerce")
-
-        min_date = records_filtrados["fecha_lesion"].min()
-        max_date = records_filtrados["fecha_lesion"].max()
+        min_date, max_date = rangos_fecha.get(tipo_filtro, (None, None))
 
         if pd.isna(min_date) or pd.isna(max_date):
             today = datetime.date.today()
             min_date = today - datetime.timedelta(days=15)
             max_date = today
-        else:
-            # 🔧 Solo convertir a .date() si son Timestamp
-            if isinstance(min_date, pd.Timestamp):
-                min_date = min_date.date()
-            if isinstance(max_date, pd.Timestamp):
-                max_date = max_date.date()
-
-        # ✅ No aplicar .date() aquí — ya son tipo date
-        default_value = (min_date, max_date)
 
         fecha_inicio, fecha_fin = st.date_input(
             t("Seleccionar rango"),
@@ -247,11 +256,12 @@ def data_filters_advanced():
             format="YYYY-MM-DD"
         )
 
-        if fecha_inicio and fecha_fin:
-            mask = (records_filtrados["fecha_lesion"] >= pd.to_datetime(fecha_inicio)) & (
-                records_filtrados["fecha_lesion"] <= pd.to_datetime(fecha_fin)
-            )
-            records_filtrados = records_filtrados.loc[mask]
+    records_filtrados = load_lesiones_filtradas_db(
+        codigo_competicion, posicion_filtro, tipo_filtro, fecha_inicio, fecha_fin
+    )
+
+    if not records_filtrados.empty:
+        records_filtrados["fecha_lesion"] = pd.to_datetime(records_filtrados["fecha_lesion"], errors="coerce")
 
     # --- Resultado final ---
     return competicion, posicion, tipo_lesion, (fecha_inicio, fecha_fin), records_filtrados
@@ -267,6 +277,93 @@ def preview_record(record: dict) -> None:
     with st.expander(t("Ver registro JSON"), expanded=False):
         st.code(json.dumps(record, ensure_ascii=False, indent=2), language="json")
 
+def _tarjetas_metricas(total_lesiones, activas, promedio_dias_baja, zona_top, zona_count,
+                       chart_total, chart_activas, chart_dias, chart_zonas,
+                       articulo, periodo, help_texts=True):
+    """Las cuatro tarjetas de main_metrics / resumen_metrics con su serie y su variación."""
+    # === Calcular deltas ===
+    def calc_delta(values):
+        if len(values) < 2 or values[-2] == 0:
+            return 0
+        return round(((values[-1] - values[-2]) / values[-2]) * 100, 1)
+
+    delta_total = calc_delta(chart_total)
+    delta_activas = calc_delta(chart_activas)
+    delta_dias = calc_delta(chart_dias)
+    delta_zona = calc_delta(chart_zonas)
+
+    # === Visualización de métricas ===
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            t("Total de lesiones registradas"),
+            total_lesiones,
+            f"{delta_total:+.1f}%",
+            chart_data=chart_total,
+            chart_type="area",
+            border=True,
+            delta_color="normal",
+            help=f"{t('Variación del número total de lesiones comparado con')} {articulo} {periodo.lower()}."
+            if help_texts else None,
+        )
+    with col2:
+        st.metric(
+            t("Lesiones activas"),
+            activas,
+            f"{delta_activas:+.1f}%",
+            chart_data=chart_activas,
+            chart_type="line",
+            border=True,
+            delta_color="inverse",
+            help=f"{t('Variación en las lesiones activas respecto a')} {articulo} {periodo.lower()}."
+            if help_texts else None,
+        )
+    with col3:
+        st.metric(
+            t("Días de recuperación promedio"),
+            promedio_dias_baja,
+            f"{delta_dias:+.1f}%",
+            chart_data=chart_dias,
+            chart_type="area",
+            border=True,
+            delta_color="normal",
+            help=f"{t('Variación del tiempo promedio de recuperación por {periodo.lower()}.')}"
+            if help_texts else None,
+        )
+    with col4:
+        st.metric(
+            f"{t('Zona más afectada:')} {zona_top}",
+            f"{zona_count} casos",
+            f"{delta_zona:+.1f}%",
+            chart_data=chart_zonas,
+            chart_type="bar",
+            border=True,
+            delta_color="inverse",
+            help=f"{t('Frecuencia de lesiones en')} {zona_top} comparado con {articulo} {periodo.lower()}."
+            if help_texts else None,
+        )
+
+def _selector_periodo() -> str:
+    """Radio Semana/Mes de las métricas de inicio. Retorna la clave sin traducir."""
+    default_period = "Semana"
+    OPCIONES_PERIODO = {
+        "Semana": t("Semana"),
+        "Mes": t("Mes")
+    }
+    periodo_traducido = st.radio(t("Periodo:"),
+        list(OPCIONES_PERIODO.values()), horizontal=True,
+        index=list(OPCIONES_PERIODO.keys()).index(default_period))
+
+    return next(k for k, v in OPCIONES_PERIODO.items() if v == periodo_traducido)
+
+# Granularidad de resumen_lesiones y periodos que se dibujan en cada tarjeta
+PERIODOS_RESUMEN = {"Semana": ("semana", 52), "Mes": ("mes", 12)}
+
+def _inicio_periodo(fechas: pd.Series, granularidad: str) -> pd.Series:
+    """Lunes ISO de la semana o día 1 del mes de cada fecha (las claves de resumen_lesiones)."""
+    return fechas.dt.to_period("W-SUN" if granularidad == "semana" else "M").dt.start_time
+
 def main_metrics(records, modo="overview"):
     """
     Muestra métricas principales de lesiones según el modo:
@@ -285,34 +382,24 @@ def main_metrics(records, modo="overview"):
     ultimos = records.copy()
     articulo, periodo = "", ""
 
-    default_period = "Semana"
-    OPCIONES_PERIODO = {
-       # "Hoy": t("Hoy"),
-       # "Último día": t("Último día"),
-        "Semana": t("Semana"),
-        "Mes": t("Mes")
-    }
-
     # --- MODO OVERVIEW ---
     if modo == "overview":
 
-        periodo_traducido = st.radio(t("Periodo:"),
-        list(OPCIONES_PERIODO.values()),horizontal=True,
-        index=list(OPCIONES_PERIODO.keys()).index(default_period))
-
-        periodo = next(k for k, v in OPCIONES_PERIODO.items() if v == periodo_traducido)
+        periodo = _selector_periodo()
 
         #periodo = st.radio(t("Periodo:"), ["Semana", "Mes"], horizontal=True)
         articulo = "la última" if periodo == "Semana" else "el último"
 
+        # Mismas claves que resumen_lesiones (resumen_metrics): semana o mes de cada año
+        granularidad, n_periodos = PERIODOS_RESUMEN[periodo]
+        records["periodo"] = _inicio_periodo(records["fecha_lesion"], granularidad)
+
         if periodo == "Semana":
-            records["periodo"] = records["fecha_lesion"].dt.isocalendar().week
             ultimos = records[
                 records["fecha_lesion"]
                 >= (records["fecha_lesion"].max() - pd.Timedelta(days=7))
             ]
         else:
-            records["periodo"] = records["fecha_lesion"].dt.month
             ultimos = records[
                 records["fecha_lesion"]
                 >= (records["fecha_lesion"].max() - pd.Timedelta(days=30))
@@ -335,22 +422,27 @@ def main_metrics(records, modo="overview"):
     zona_count = records["zona_cuerpo"].value_counts().iloc[0] if not records["zona_cuerpo"].empty else 0
     zona_pct = round((zona_count / total_lesiones) * 100, 1) if total_lesiones else 0
 
-    # === Series por periodo ===
-    trend_total = records.groupby("periodo").size().reset_index(name="cantidad")
+    # === Series por periodo (en overview, los últimos n_periodos con datos, como resumen_metrics) ===
+    tendencia = records
+    if modo == "overview":
+        recientes = sorted(records["periodo"].dropna().unique())[-n_periodos:]
+        tendencia = records[records["periodo"].isin(recientes)]
+
+    trend_total = tendencia.groupby("periodo").size().reset_index(name="cantidad")
     trend_activas = (
-        records[records["estado_lesion"] == "ACTIVO"]
+        tendencia[tendencia["estado_lesion"] == "ACTIVO"]
         .groupby("periodo")
         .size()
         .reset_index(name="count")
     )
     trend_dias = (
-        records.groupby("periodo")["dias_baja_estimado"]
+        tendencia.groupby("periodo")["dias_baja_estimado"]
         .mean()
-        .reset_index(name="avg_days")
         .round(2)
+        .reset_index(name="avg_days")
     )
     trend_zonas = (
-        records[records["zona_cuerpo"] == zona_top]
+        tendencia[tendencia["zona_cuerpo"] == zona_top]
         .groupby("periodo")
         .size()
         .reset_index(name="count")
@@ -361,69 +453,55 @@ def main_metrics(records, modo="overview"):
     chart_dias = trend_dias["avg_days"].tolist()
     chart_zonas = trend_zonas["count"].tolist()
 
-    # === Calcular deltas ===
-    def calc_delta(values):
-        if len(values) < 2 or values[-2] == 0:
-            return 0
-        return round(((values[-1] - values[-2]) / values[-2]) * 100, 1)
+    _tarjetas_metricas(total_lesiones, activas, promedio_dias_baja, zona_top, zona_count,
+                       chart_total, chart_activas, chart_dias, chart_zonas,
+                       articulo, periodo, help_texts=(modo == "overview"))
 
-    delta_total = calc_delta(chart_total)
-    delta_activas = calc_delta(chart_activas)
-    delta_dias = calc_delta(chart_dias)
-    delta_zona = calc_delta(chart_zonas)
+    return ultimos
 
-    # === Visualización de métricas ===
-    col1, col2, col3, col4 = st.columns(4)
+def resumen_metrics(plantel: str):
+    """
+    Métricas de la página de inicio a partir de resumen_lesiones (ver src/db/db_summary.py):
+    lee unas decenas de filas por plantel en lugar de todo el histórico.
 
-    help_texts = (modo == "overview")  # solo mostrar help en modo overview
+    Las series van por periodo real (semana ISO o mes de cada año), las más recientes al final.
 
-    with col1:
-        st.metric(
-            t("Total de lesiones registradas"),
-            total_lesiones,
-            f"{delta_total:+.1f}%",
-            chart_data=chart_total,
-            chart_type="area",
-            border=True,
-            delta_color="normal",
-            help=f"{t('Variación del número total de lesiones comparado con')} {articulo} {periodo.lower()}."
-            if help_texts else None,
-        )
-    with col2:
-        st.metric(
-            t("Lesiones activas"),
-            activas,
-            f"{delta_activas:+.1f}%",
-            chart_data=chart_activas,
-            chart_type="line",
-            border=True,
-            delta_color="inverse",
-            help=f"{t('Variación en las lesiones activas respecto a')} {articulo} {periodo.lower()}."
-            if help_texts else None,
-        )
-    with col3:
-        st.metric(
-            t("Días de recuperación promedio"),
-            promedio_dias_baja,
-            f"{delta_dias:+.1f}%",
-            chart_data=chart_dias,
-            chart_type="area",
-            border=True,
-            delta_color="normal",
-            help=f"{t('Variación del tiempo promedio de recuperación por {periodo.lower()}.')}"
-            if help_texts else None,
-        )
-    with col4:
-        st.metric(
-            f"{t('Zona más afectada:')} {zona_top}",
-            f"{zona_count} casos",
-            f"{delta_zona:+.1f}%",
-            chart_data=chart_zonas,
-            chart_type="bar",
-            border=True,
-            delta_color="inverse",
-            help=f"{t('Frecuencia de lesiones en')} {zona_top} comparado con {articulo} {periodo.lower()}."
-            if help_texts else None,
-        )
-
-    return ultimos
+    Retorna la fecha desde la que listar las últimas lesiones (7 o 30 días antes de la más reciente),
+    o None si no hay resumen para el alcance de la sesión; en ese caso no dibuja nada
+    y hay que usar main_metrics con los registros.
+    """
+    resumen = load_resumen_lesiones_db(plantel, current_scope().clave)
+    if resumen is None:
+        return None
+
+    periodo = _selector_periodo()
+    articulo = "la última" if periodo == "Semana" else "el último"
+    granularidad, n_periodos = PERIODOS_RESUMEN[periodo]
+
+    filas = resumen[resumen["granularidad"] == granularidad].sort_values("periodo")
+
+    # === Métricas base (suma de todos los periodos) ===
+    total_lesiones = int(filas["total"].sum())
+    activas = int(filas["activas"].sum())
+    con_dias = filas["con_dias_baja"].sum()
+    promedio_dias_baja = round(filas["suma_dias_baja"].sum() / con_dias, 1) if con_dias else 0
+
+    zonas = Counter()
+    for conteo in filas["zonas"]:
+        zonas.update(conteo)
+    # Igual que mode(): la más frecuente y, si empatan, la primera alfabéticamente
+    zona_top, zona_count = min(zonas.items(), key=lambda kv: (-kv[1], kv[0])) if zonas else ("-", 0)
+
+    # === Series por periodo (solo los periodos con datos, como en main_metrics) ===
+    tendencia = filas.tail(n_periodos)
+    chart_total = tendencia["total"].tolist()
+    chart_activas = tendencia.loc[tendencia["activas"] > 0, "activas"].tolist()
+    chart_dias = tendencia["promedio_dias"].dropna().tolist()
+    chart_zonas = [conteo[zona_top] for conteo in tendencia["zonas"] if conteo.get(zona_top)]
+
+    _tarjetas_metricas(total_lesiones, activas, promedio_dias_baja, zona_top, zona_count,
+                       chart_total, chart_activas, chart_dias, chart_zonas,
+                       articulo, periodo)
+
+    dias = 7 if periodo == "Semana" else 30
+    return (filas["ultima_fecha"].max() - pd.Timedelta(days=dias)).date()
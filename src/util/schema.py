@@ -1,3 +1,5 @@
+import pandas as pd
+
 
 # Diccionario de equivalencias
 MAP_POSICIONES = {
@@ -23,3 +25,84 @@ def validate_checkin(record: dict) -> tuple[bool, str]:
 
 essential_checkout_fields = ("minutos_sesion", "rpe")
 
+
+COLUMNAS_FECHA_LESIONES = (
+    "fecha_lesion", "fecha_alta_diagnostico", "fecha_alta_medica", "fecha_alta_deportiva",
+    "fecha_observacion_activa", "fecha_observacion_inactiva", "fecha_hora_registro",
+)
+
+# Tipos explícitos de las columnas de lesiones en archivos JSONL (ver iter_lesiones_jsonl).
+# Las columnas no listadas conservan el tipo que infiere pandas.
+DTYPES_LESIONES = {
+    "id": "Int64",
+    "id_lesion": "string",
+    "id_jugadora": "string",
+    "lugar_id": "Int64",
+    "segmento_id": "Int64",
+    "zona_cuerpo_id": "Int64",
+    "zona_especifica_id": "Int64",
+    "tipo_lesion_id": "Int64",
+    "tipo_especifico_id": "Int64",
+    "mecanismo_id": "Int64",
+    "es_recidiva": "Int64",
+    "dias_baja_estimado": "Int64",
+    "sesiones": "Int64",
+    **{col: "datetime64[ns]" for col in COLUMNAS_FECHA_LESIONES},
+}
+
+# Columnas de baja cardinalidad del DataFrame de lesiones (store y loaders): 'category'
+CATEGORICAS_LESIONES = (
+    "lugar", "segmento", "zona_cuerpo", "zona_especifica", "tipo_lesion", "tipo_especifico",
+    "mecanismo", "estado_lesion", "lateralidad", "posicion", "posicion_lesion", "plantel",
+    "impacto_dias_baja_estimado",
+)
+
+# Esquema del DataFrame de lesiones en memoria. dias_baja_estimado y es_recidiva conservan
+# el tipo de la BD (los gráficos y el formulario los usan como números/booleanos simples).
+SCHEMA_LESIONES = {
+    **{col: "Int64" for col in (
+        "id", "lugar_id", "segmento_id", "zona_cuerpo_id", "zona_especifica_id",
+        "tipo_lesion_id", "tipo_especifico_id", "mecanismo_id", "sesiones",
+    )},
+    **{col: "datetime64[ns]" for col in COLUMNAS_FECHA_LESIONES},
+    **{col: "category" for col in CATEGORICAS_LESIONES},
+}
+
+def aplicar_dtypes(df: pd.DataFrame, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Convierte las columnas presentes en `df` a los tipos indicados (por defecto DTYPES_LESIONES).
+    Los valores que no se pueden convertir quedan como nulos (NaT / <NA>).
+    """
+    dtypes = DTYPES_LESIONES if dtypes is None else dtypes
+
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        serie = df[col]
+        # Columnas que ya tienen el tipo: no se copian (las sincronizaciones sin cambios son O(1))
+        if dtype.startswith("datetime64"):
+            if not pd.api.types.is_datetime64_any_dtype(serie):
+                df[col] = pd.to_datetime(serie, errors="coerce")
+        elif dtype == "category":
+            if not isinstance(serie.dtype, pd.CategoricalDtype):
+                df[col] = serie.astype("category")
+        elif serie.dtype == dtype:
+            continue
+        elif dtype in ("Int64", "Float64"):
+            df[col] = pd.to_numeric(serie, errors="coerce").astype(dtype)
+        else:
+            df[col] = serie.astype(dtype)
+    return df
+
+def aplicar_schema_lesiones(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Asigna los tipos de SCHEMA_LESIONES (categorías, enteros nulables y fechas datetime64).
+
+    Notas para quien consume el DataFrame:
+    - value_counts() en una columna categórica incluye categorías con 0 filas: filtrar con `> 0`
+      o usar groupby(..., observed=True).
+    - Asignar un valor que no es una categoría existente (fillna, loc) lanza TypeError:
+      convertir antes con .astype(str) o añadirla con .cat.add_categories.
+    - Las fechas nulas son NaT (que es "verdadero" en un if): usar pd.notna().
+    """
+    return aplicar_dtypes(df, SCHEMA_LESIONES)
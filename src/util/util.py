@@ -15,6 +15,17 @@ import re
 import unicodedata
 import datetime
 from dateutil.relativedelta import relativedelta  # pip install python-dateutil
+from itertools import chain, islice
+
+from src.util.schema import aplicar_dtypes
+
+try:
+    import orjson  # opcional: parser JSON más rápido para archivos grandes
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+JSONL_CHUNK_SIZE = 50_000
 
 def normalize_text(s):
     """Limpia texto eliminando tildes, espacios invisibles y normalizando Unicode."""
@@ -206,9 +217,57 @@ def get_drive_direct_url(url: str) -> str:
     file_id = match.group(1)
     return f"https://drive.google.com/uc?export=view&id={file_id}"
 
+def iter_jsonl_records(path: str | Path, on_error=None):
+    """
+    Lee un archivo JSONL línea a línea y genera (nº de línea, registro).
+
+    Las líneas vacías se ignoran; las que no son un objeto JSON válido se notifican con
+    on_error(nº de línea, mensaje) (por defecto se imprimen) y se omiten.
+    Usa orjson si está instalado.
+    """
+    if on_error is None:
+        on_error = lambda n, mensaje: print(f"{path}:{n}: {mensaje}")
+
+    with open(path, "rb") as f:
+        for n, linea in enumerate(f, start=1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                record = _json_loads(linea)
+            except ValueError as e:  # JSONDecodeError / UnicodeDecodeError
+                on_error(n, f"JSON inválido: {e}")
+                continue
+            if not isinstance(record, dict):
+                on_error(n, "La línea no es un objeto JSON.")
+                continue
+            yield n, record
+
+def iter_lesiones_jsonl(path: str | Path, chunk_size: int = JSONL_CHUNK_SIZE, dtypes: dict = None,
+                        on_error=None):
+    """
+    Genera DataFrames de como máximo `chunk_size` lesiones con tipos explícitos
+    (DTYPES_LESIONES por defecto). La memoria usada depende del tamaño del bloque,
+    no del archivo.
+
+        for chunk in iter_lesiones_jsonl("export.jsonl", chunk_size=20_000):
+            ...
+    """
+    registros = iter_jsonl_records(path, on_error)
+    while True:
+        bloque = [record for _, record in islice(registros, chunk_size)]
+        if not bloque:
+            break
+        yield aplicar_dtypes(pd.DataFrame(bloque), dtypes)
+
 def load_lesiones_jsonl(path: str | Path) -> tuple[pd.DataFrame | None, str | None]:
     """
     Carga un archivo JSONL de lesiones y lo convierte en un DataFrame.
+    Lee el archivo por bloques (ver iter_lesiones_jsonl); las líneas inválidas se
+    informan con su número de línea y se omiten.
+
+    El resultado es el archivo entero en memoria: quien necesite memoria acotada
+    debe recorrer los bloques de iter_lesiones_jsonl en lugar de llamar a esta función.
 
     Parámetros
     ----------
@@ -226,25 +285,19 @@ def load_lesiones_jsonl(path: str | Path) -> tuple[pd.DataFrame | None, str | No
         if not path.exists():
             return None, f"Archivo no encontrado: {path}"
 
-        data = []
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    data.append(json.loads(line.strip()))
-                except json.JSONDecodeError:
-                    continue
+        chunks = iter_lesiones_jsonl(path)
+        primero = next(chunks, None)
 
-        if not data:
+        if primero is None:
             return None, "El archivo no contiene registros válidos."
 
-        df = pd.DataFrame(data)
+        df = pd.concat(chain([primero], chunks), ignore_index=True)
 
-        # Asegurar tipos de datos y ordenar por fecha de diagnóstico
+        # Ordenar por fecha de diagnóstico (ya convertida a datetime por aplicar_dtypes)
         if "fecha_alta_diagnostico" in df.columns:
-            df["fecha_alta_diagnostico"] = pd.to_datetime(df["fecha_alta_diagnostico"], errors="coerce")
-            df = df.sort_values("fecha_alta_diagnostico", ascending=False)
+            df = df.sort_values("fecha_alta_diagnostico", ascending=False, ignore_index=True)
 
-        return df.reset_index(drop=True), None
+        return df, None
 
     except Exception as e:
         return None, f"Error al cargar el archivo de lesiones: {e}"
@@ -351,7 +404,8 @@ def date_to_str(fecha):
     else:
         return None
 
-def generar_id_lesion(nombre: str, id_jugadora: str, ultima_lesion_id: str | None = None, fecha: str | None = None) -> str:
+def generar_id_lesion(nombre: str, id_jugadora: str, ultima_lesion_id: str | None = None, fecha: str | None = None,
+                      numero: int | None = None) -> str:
     """
     Genera un identificador único de lesión para una jugadora.
     Formato: <INICIALES><YYYYMMDD>-<INCREMENTAL>
@@ -360,6 +414,7 @@ def generar_id_lesion(nombre: str, id_jugadora: str, ultima_lesion_id: str | Non
     - id_jugadora: Identificador único de la jugadora
     - ultima_lesion_id: ID de la última lesión registrada (si existe)
     - fecha: Fecha opcional (formato 'YYYYMMDD'). Si no se pasa, usa la actual.
+    - numero: Incremental ya reservado (ver reservar_numero_lesion). Si se indica, se ignora ultima_lesion_id.
     """
 
     # --- Obtener iniciales ---
@@ -371,15 +426,16 @@ def generar_id_lesion(nombre: str, id_jugadora: str, ultima_lesion_id: str | Non
         fecha = datetime.datetime.now().strftime("%Y%m%d")
 
     # --- Determinar número incremental ---
-    if not ultima_lesion_id:  # si no hay lesiones previas
-        numero = 1
-    else:
-        # Extraer número final del ID existente (después del guion)
-        match = re.search(r"-(\d+)$", ultima_lesion_id)
-        if match:
-            numero = int(match.group(1)) + 1
+    if numero is None:
+        if not ultima_lesion_id:  # si no hay lesiones previas
+            numero = 1
         else:
-            numero = 1  # si no tiene formato esperado, reinicia en 1
+            # Extraer número final del ID existente (después del guion)
+            match = re.search(r"-(\d+)$", ultima_lesion_id)
+            if match:
+                numero = int(match.group(1)) + 1
+            else:
+                numero = 1  # si no tiene formato esperado, reinicia en 1
 
     # --- Construir ID ---
     nuevo_id = f"{iniciales}{fecha}-{numero}"
@@ -395,11 +451,19 @@ def sanitize_lesion_data(lesion_data: dict) -> dict:
 
     for k, v in lesion_data.items():
 
+        # --- Nulos de pandas (NaT de columnas datetime64, <NA> de enteros nulables) ---
+        if v is pd.NaT or v is pd.NA:
+            v = None
+
         # --- Campos de fecha pura ---
         if k in ("fecha_lesion", "fecha_alta_diagnostico", "fecha_alta_medica", "fecha_alta_deportiva"):
             parsed_date = parse_fecha(v)
             clean[k] = parsed_date.isoformat() if parsed_date else None
 
+        # --- Fechas de observación: se mantienen como date (el formulario las formatea) ---
+        elif k in ("fecha_observacion_activa", "fecha_observacion_inactiva"):
+            clean[k] = parse_fecha(v)
+
         # --- Campo con fecha y hora ---
         elif k == "fecha_hora_registro":
             if isinstance(v, pd.Timestamp):
@@ -426,23 +490,6 @@ def sanitize_lesion_data(lesion_data: dict) -> dict:
 
     return clean
 
-def contar_sesiones(evol_raw):
-    
-    """Cuenta cuántas sesiones tiene una evolución (campo JSON o lista)."""
-    if not evol_raw:
-        return 0
-    if isinstance(evol_raw, str):
-        try:
-            evol_list = json.loads(evol_raw)
-        except json.JSONDecodeError:
-            return 0
-    elif isinstance(evol_raw, list):
-        evol_list = evol_raw
-    else:
-        return 0
-
-    return len(evol_list) if isinstance(evol_list, list) else 0
-
 def set_background_image_local(image_path: str, fixed: bool = False, overlay: float = 0.0):
     """
     Aplica una imagen de fondo local a toda la app Streamlit usando Base64.